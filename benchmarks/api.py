@@ -0,0 +1,194 @@
+"""
+Measure latency and throughput of the v1 API against the configured database, with
+the full ASGI application run in-process and Google stubbed out. Results can be
+written as JSON and compared against an earlier run to flag regressions, e.g.
+
+    python -m benchmarks.api --requests 2000 --concurrency 20 --output base.json
+    python -m benchmarks.api --requests 2000 --concurrency 20 --baseline base.json
+    DB_POOL_ENABLED=True python -m benchmarks.api --scenario get_user
+
+Exits with status 1 if any scenario regressed by more than --tolerance.
+"""
+
+import argparse
+import asyncio
+import itertools
+import os
+import subprocess
+import sys
+import uuid
+from contextlib import ExitStack
+from datetime import datetime
+from datetime import timezone
+from pathlib import Path
+from typing import Awaitable
+from typing import Callable
+from unittest.mock import patch
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "dda.settings")
+# Every scenario is sent by one user from one address, so the default limits would
+# have most requests measure the 429 path. The limiter still runs on every request.
+os.environ.setdefault("RATE_LIMIT_GOOGLE_LOGIN", "1000000/second")
+os.environ.setdefault("RATE_LIMIT_SESSION", "1000000/second")
+
+import httpx  # noqa: E402
+from asgiref.sync import sync_to_async  # noqa: E402
+from django.conf import settings  # noqa: E402
+from dda.asgi import application  # noqa: E402
+from dda.v1.models.user import SessionToken  # noqa: E402
+from dda.v1.models.user import User  # noqa: E402
+from dda.v1.models.user import UserSource  # noqa: E402
+from dda.v1.schemas.user import UserCreateDto  # noqa: E402
+from dda.v1.services.authn.google import ExternalGoogleService  # noqa: E402
+from dda.v1.services.authn.google import IGoogleService  # noqa: E402
+from benchmarks.harness import ScenarioResult  # noqa: E402
+from benchmarks.harness import find_regressions  # noqa: E402
+from benchmarks.harness import format_result  # noqa: E402
+from benchmarks.harness import read_results  # noqa: E402
+from benchmarks.harness import run_scenario  # noqa: E402
+from benchmarks.harness import write_results  # noqa: E402
+
+
+# Every benchmark login is for the same user, separate from the user the other
+# scenarios are authenticated as, so that logins don't end its session.
+_LOGIN_EMAIL = f"benchmark_login_{uuid.uuid4()}@email.com"
+_LOGIN_BODY = {
+    "authorizationCode": "benchmark-code",
+    "codeVerifier": "benchmark-verifier",
+    "redirectUri": "http://localhost",
+}
+
+
+class StubGoogleService(IGoogleService):
+    """Stands in for Google, so logins measure our own code rather than Google's."""
+
+    @staticmethod
+    async def get_user_profile(gid_token: str) -> UserCreateDto:
+        return UserCreateDto(
+            email=_LOGIN_EMAIL,
+            family_name="Benchmark",
+            given_name="Login",
+            is_email_verified=True,
+        )
+
+    @staticmethod
+    async def exchange_auth_token_for_id_token(
+        authorization_code: str, code_verifier: str, redirect_uri: str
+    ) -> str:
+        return "benchmark-id-token"
+
+
+def _create_user_session() -> SessionToken:
+    user = User.objects.create(
+        email=f"benchmark_{uuid.uuid4()}@email.com",
+        family_name="Benchmark",
+        given_name="User",
+        source=UserSource.GOOGLE,
+    )
+    return SessionToken.objects.create(user=user)
+
+
+def _delete_users(user_id: uuid.UUID) -> None:
+    User.objects.filter(id=user_id).delete()
+    User.objects.filter(email=_LOGIN_EMAIL).delete()
+
+
+def _build_scenarios(
+    client: httpx.AsyncClient, session: SessionToken
+) -> dict[str, Callable[[], Awaitable[httpx.Response]]]:
+    user_path = f"/v1/user/{session.user.id}"
+    authorization = {"Authorization": f"Bearer {session.token}"}
+    # Alternate names, so that every update writes.
+    given_names = itertools.cycle(["Benchmark", "Bench"])
+
+    return {
+        "health": lambda: client.get("/v1/glb/health/full"),
+        "me": lambda: client.get("/v1/glb/auth/me", headers=authorization),
+        "get_user": lambda: client.get(user_path, headers=authorization),
+        "patch_user": lambda: client.patch(
+            user_path, headers=authorization, json={"givenName": next(given_names)}
+        ),
+        "google_login": lambda: client.post("/v1/glb/auth/google", json=_LOGIN_BODY),
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, check=True, text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def _run(
+    scenario_names: list[str], request_count: int, concurrency: int
+) -> list[ScenarioResult]:
+    await application.startup()
+    session = await sync_to_async(_create_user_session)()
+    results = []
+    with ExitStack() as stack:
+        for method in ("get_user_profile", "exchange_auth_token_for_id_token"):
+            stack.enter_context(
+                patch.object(
+                    ExternalGoogleService, method, getattr(StubGoogleService, method)
+                )
+            )
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=application),
+            base_url="http://benchmark",
+        ) as client:
+            scenarios = _build_scenarios(client, session)
+            for name in scenario_names:
+                result = await run_scenario(
+                    name, scenarios[name], request_count, concurrency
+                )
+                print(format_result(result))
+                results.append(result)
+
+    await sync_to_async(_delete_users)(session.user.id)
+    await application.shutdown()
+    return results
+
+
+def main() -> None:
+    scenario_names = ["health", "me", "get_user", "patch_user", "google_login"]
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument(
+        "--scenario", action="append", choices=scenario_names, dest="scenarios"
+    )
+    parser.add_argument("--output", type=Path, help="Write results as JSON.")
+    parser.add_argument("--baseline", type=Path, help="Compare against these results.")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    args = parser.parse_args()
+
+    results = asyncio.run(
+        _run(args.scenarios or scenario_names, args.requests, args.concurrency)
+    )
+    if args.output is not None:
+        write_results(
+            args.output,
+            results,
+            {
+                "commit": _git_commit(),
+                "created_at": datetime.now(tz=timezone.utc).isoformat(),
+                "db_pool_enabled": os.environ.get("DB_POOL_ENABLED") == "True",
+                "rate_limits": settings.RATE_LIMITS,
+            },
+        )
+    if args.baseline is not None:
+        regressions = find_regressions(
+            results, read_results(args.baseline), args.tolerance
+        )
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Shared harness for benchmarks driving the ASGI application in-process: runs a
+request at a fixed concurrency, summarises its latency and throughput, and
+compares results against those of an earlier run.
+"""
+
+import asyncio
+import json
+import statistics
+import time
+from dataclasses import asdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+import httpx
+
+
+@dataclass(frozen=True)
+class ScenarioResult:
+    """
+    Latency and throughput of one scenario, with latencies in milliseconds.
+
+    Attributes:
+        name (str): Name of the scenario.
+        requests (int): Number of requests made.
+        concurrency (int): Number of requests in flight at once.
+        errors (int): Number of requests that got an error response.
+        p50_ms (float): Median latency.
+        p95_ms (float): 95th percentile latency.
+        p99_ms (float): 99th percentile latency.
+        mean_ms (float): Mean latency.
+        rps (float): Requests completed per second.
+    """
+
+    name: str
+    requests: int
+    concurrency: int
+    errors: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    mean_ms: float
+    rps: float
+
+
+# Latencies regress when they go up, throughput when it goes down.
+_LATENCY_FIELDS = ("p50_ms", "p95_ms", "p99_ms")
+_THROUGHPUT_FIELD = "rps"
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * fraction))
+    return sorted_values[index]
+
+
+async def run_scenario(
+    name: str,
+    send_request: Callable[[], Awaitable[httpx.Response]],
+    request_count: int,
+    concurrency: int,
+) -> ScenarioResult:
+    """
+    Send a request a number of times, keeping up to `concurrency` in flight.
+
+    Args:
+        name (str): Name of the scenario.
+        send_request (Callable): Sends one request and returns its response.
+        request_count (int): The number of requests to send.
+        concurrency (int): The number of requests to keep in flight.
+
+    Returns:
+        The latency and throughput of the requests.
+    """
+    latencies_ms: list[float] = []
+    error_count = 0
+    remaining = iter(range(request_count))
+
+    async def _worker() -> None:
+        nonlocal error_count
+        for _ in remaining:
+            start = time.perf_counter()
+            response = await send_request()
+            latencies_ms.append((time.perf_counter() - start) * 1000)
+            if response.is_error:
+                error_count += 1
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(_worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started_at
+
+    latencies_ms.sort()
+    return ScenarioResult(
+        name=name,
+        requests=request_count,
+        concurrency=concurrency,
+        errors=error_count,
+        p50_ms=round(percentile(latencies_ms, 0.50), 3),
+        p95_ms=round(percentile(latencies_ms, 0.95), 3),
+        p99_ms=round(percentile(latencies_ms, 0.99), 3),
+        mean_ms=round(statistics.fmean(latencies_ms), 3),
+        rps=round(request_count / elapsed, 1),
+    )
+
+
+def format_result(result: ScenarioResult) -> str:
+    return (
+        f"{result.name}: requests={result.requests} concurrency={result.concurrency} "
+        f"errors={result.errors} p50={result.p50_ms:.2f}ms p95={result.p95_ms:.2f}ms "
+        f"p99={result.p99_ms:.2f}ms mean={result.mean_ms:.2f}ms rps={result.rps:.0f}"
+    )
+
+
+def write_results(
+    path: Path, results: list[ScenarioResult], metadata: dict[str, Any]
+) -> None:
+    """
+    Write results as JSON, to be compared against by a later run.
+
+    Args:
+        path (Path): The file to write to.
+        results (list[ScenarioResult]): The results of each scenario.
+        metadata (dict[str, Any]): Details of the run, such as the commit it was run on.
+    """
+    document = {**metadata, "results": [asdict(result) for result in results]}
+    path.write_text(json.dumps(document, indent=2) + "\n")
+
+
+def read_results(path: Path) -> list[ScenarioResult]:
+    document = json.loads(path.read_text())
+    return [ScenarioResult(**result) for result in document["results"]]
+
+
+def find_regressions(
+    results: list[ScenarioResult],
+    baseline: list[ScenarioResult],
+    tolerance: float,
+) -> list[str]:
+    """
+    Compare results against a baseline run, for the scenarios both have.
+
+    Args:
+        results (list[ScenarioResult]): The results of this run.
+        baseline (list[ScenarioResult]): The results of the run to compare against.
+        tolerance (float): Fraction by which a result may be worse before it is a regression.
+
+    Returns:
+        A description of each regression found, empty if there are none.
+    """
+    baseline_by_name = {result.name: result for result in baseline}
+    regressions = []
+    for result in results:
+        previous = baseline_by_name.get(result.name)
+        if previous is None:
+            continue
+        for field in _LATENCY_FIELDS:
+            before, after = getattr(previous, field), getattr(result, field)
+            if after > before * (1 + tolerance):
+                regressions.append(
+                    f"{result.name} {field} rose from {before:.2f} to {after:.2f}"
+                )
+        before, after = previous.rps, result.rps
+        if after < before * (1 - tolerance):
+            regressions.append(
+                f"{result.name} {_THROUGHPUT_FIELD} fell from {before:.0f} to {after:.0f}"
+            )
+        if result.errors > previous.errors:
+            regressions.append(
+                f"{result.name} errors rose from {previous.errors} to {result.errors}"
+            )
+    return regressions
@@ -0,0 +1,131 @@
+"""
+Measure the time logging adds to each request on the thread handling it, comparing
+the synchronous stream handler with the request state dumped into every log call,
+against the queueing handler with the request state held in a log context, e.g.
+
+    python -m benchmarks.log_overhead --requests 5000 --idle-ms 1
+"""
+
+import argparse
+import logging
+import os
+import time
+import uuid
+from contextvars import copy_context
+from typing import Callable
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "dda.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from pythonjsonlogger.json import JsonFormatter  # noqa: E402
+from dda.log import LogContextFilter  # noqa: E402
+from dda.log import QueueingStreamHandler  # noqa: E402
+from dda.log import bind_log_user  # noqa: E402
+from dda.log import start_log_context  # noqa: E402
+from dda.v1.models.user import User  # noqa: E402
+
+
+# The number of log calls made by a typical authenticated request.
+_LOGS_PER_REQUEST = 4
+
+
+def _build_logger(handler: logging.Handler) -> logging.Logger:
+    handler.setFormatter(
+        JsonFormatter(
+            "{asctime} {levelname} {tid} {user_id} {message}",
+            style="{",
+            defaults={"tid": None, "user_id": None},
+        )
+    )
+    handler.addFilter(LogContextFilter())
+    logger = logging.getLogger(f"benchmark.{uuid.uuid4()}")
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    return logger
+
+
+def _dump_state(tid: uuid.UUID, user: User | None) -> dict[str, str | None]:
+    return {
+        "tid": str(tid),
+        "user_id": str(user.id) if user is not None else None,
+    }
+
+
+def _log_with_state_dumps(logger: logging.Logger, user: User) -> None:
+    tid = uuid.uuid4()
+    logger.info("REQUEST START", extra=_dump_state(tid, None))
+    for _ in range(_LOGS_PER_REQUEST - 2):
+        logger.info("User profile was retrieved.", extra=_dump_state(tid, user))
+    logger.info("REQUEST END", extra=_dump_state(tid, user))
+
+
+def _log_with_context(logger: logging.Logger, user: User) -> None:
+    start_log_context(uuid.uuid4())
+    logger.info("REQUEST START")
+    bind_log_user(user.id)
+    for _ in range(_LOGS_PER_REQUEST - 2):
+        logger.info("User profile was retrieved.")
+    logger.info("REQUEST END")
+
+
+def _measure(
+    name: str,
+    handler: logging.Handler,
+    log_request: Callable[[logging.Logger, User], None],
+    request_count: int,
+    idle_seconds: float,
+) -> None:
+    logger = _build_logger(handler)
+    user = User(id=uuid.uuid4())
+    latencies_us: list[float] = []
+    for _ in range(request_count):
+        context = copy_context()
+        started_at = time.perf_counter()
+        context.run(log_request, logger, user)
+        latencies_us.append((time.perf_counter() - started_at) * 1_000_000)
+        # Leave some idle time, as a server would have between requests,
+        # which is when queued records get written.
+        time.sleep(idle_seconds)
+    handler.close()
+    latencies_us.sort()
+    p50 = latencies_us[len(latencies_us) // 2]
+    p99 = latencies_us[int(len(latencies_us) * 0.99)]
+    print(f"{name}: p50={p50:.1f}us p99={p99:.1f}us per request")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--idle-ms", type=float, default=1.0)
+    args = parser.parse_args()
+
+    with open(os.devnull, "w") as devnull:
+        _measure(
+            "sync handler, state dumped per call",
+            logging.StreamHandler(devnull),
+            _log_with_state_dumps,
+            args.requests,
+            args.idle_ms / 1000,
+        )
+        _measure(
+            "sync handler, log context",
+            logging.StreamHandler(devnull),
+            _log_with_context,
+            args.requests,
+            args.idle_ms / 1000,
+        )
+        _measure(
+            "queueing handler, log context",
+            QueueingStreamHandler(devnull),
+            _log_with_context,
+            args.requests,
+            args.idle_ms / 1000,
+        )
+
+
+if __name__ == "__main__":
+    main()
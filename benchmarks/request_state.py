@@ -0,0 +1,109 @@
+"""
+Measure what building the per-request state costs, comparing the slotted request
+state with the log context against the schema it replaced, which was dumped for
+every log call, in time per request and memory allocated per request, e.g.
+
+    python -m benchmarks.request_state --requests 20000
+"""
+
+import argparse
+import os
+import time
+import tracemalloc
+import uuid
+from functools import partial
+from typing import Any
+from typing import Callable
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "dda.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from ninja import Field  # noqa: E402
+from ninja import Schema  # noqa: E402
+from pydantic import ConfigDict  # noqa: E402
+from dda.log import bind_log_user  # noqa: E402
+from dda.log import start_log_context  # noqa: E402
+from dda.v1.models.user import User  # noqa: E402
+from dda.v1.routes.http import APIRequestState  # noqa: E402
+from dda.v1.services.identity_map import IdentityMap  # noqa: E402
+
+
+# The number of log calls made by a typical authenticated request.
+_LOGS_PER_REQUEST = 4
+
+
+class SchemaRequestState(Schema):
+    """The request state as it was, a schema dumped for every log call."""
+
+    tid: uuid.UUID | None = None
+    user: User | None = Field(default=None, exclude=True)
+    identity_map: IdentityMap = Field(default_factory=IdentityMap, exclude=True)
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+
+def _schema_request(user: User) -> Any:
+    state = SchemaRequestState(tid=uuid.uuid4())
+    state.model_dump()
+    state.user = user
+    for _ in range(_LOGS_PER_REQUEST - 1):
+        state.model_dump()
+    return state
+
+
+async def _load_user(user: User) -> User:
+    return user
+
+
+def _slotted_request(user: User) -> Any:
+    # Log calls read the request's state from the log context, bound once.
+    state = APIRequestState(tid=uuid.uuid4())
+    start_log_context(state.tid)
+    state.defer_user(partial(_load_user, user))
+    bind_log_user(user.id)
+    return state
+
+
+def _measure(
+    name: str, build_request: Callable[[User], Any], request_count: int
+) -> None:
+    user = User(id=uuid.uuid4())
+    started_at = time.perf_counter()
+    for _ in range(request_count):
+        build_request(user)
+    elapsed_us = (time.perf_counter() - started_at) * 1_000_000
+
+    # Allocations are counted separately, as tracing them slows everything down.
+    tracemalloc.start()
+    for _ in range(request_count):
+        build_request(user)
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    states = [build_request(user) for _ in range(request_count)]
+    retained_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del states
+
+    print(
+        f"{name}: {elapsed_us / request_count:.2f}us per request, "
+        f"{retained_bytes / request_count:.0f}B retained per request, "
+        f"{peak_bytes}B peak while building"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    _measure("schema state", _schema_request, args.requests)
+    _measure("slotted state", _slotted_request, args.requests)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,4 +4,30 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "dda.settings")
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Django must be set up before anything importing models is imported.
+from dda.lifespan import LifespanApplication  # noqa: E402
+from dda.probes import ProbeApplication  # noqa: E402
+from dda.v1 import lifespan  # noqa: E402
+from dda.v1.routes.glb import health  # noqa: E402
+from dda.v1.services.tracing import configure_tracing  # noqa: E402
+
+configure_tracing()
+
+probe_application = ProbeApplication(django_application)
+probe_application.add_probe("/v1/glb/health/live", health.get_liveness)
+probe_application.add_probe("/v1/glb/health/ready", health.get_readiness)
+
+application = LifespanApplication(probe_application)
+application.on_startup(lifespan.check_session_revocation_cache)
+application.on_startup(lifespan.check_rate_limit_cache)
+application.on_startup(lifespan.warm_database_connections)
+application.on_startup(lifespan.compile_api)
+application.on_startup(lifespan.prefetch_google_certificates)
+application.on_startup(lifespan.start_session_reaper)
+application.on_shutdown(lifespan.flush_traces)
+application.on_shutdown(lifespan.release_metrics)
+application.on_shutdown(lifespan.close_database_connections)
+application.on_shutdown(lifespan.close_http_client)
+application.on_shutdown(lifespan.stop_session_reaper)
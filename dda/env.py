@@ -26,6 +26,95 @@ class Env(Enum):
         return Env(env_string)
 
 
+class SessionTokenMode(Enum):
+    """
+    Enum dictating how session tokens are issued and validated. DATABASE
+    tokens are opaque and looked up in the SessionToken table, while SIGNED
+    tokens carry the user and expiry, signed with the SECRET_KEY.
+    """
+
+    DATABASE = "DATABASE"
+    SIGNED = "SIGNED"
+
+    @staticmethod
+    def get_mode() -> "SessionTokenMode":
+        """
+        Extract a SessionTokenMode out of the current run environment,
+        defaulting to DATABASE backed tokens.
+
+        Returns:
+            The SessionTokenMode that sessions should be issued with.
+        """
+        return SessionTokenMode(os.environ.get("SESSION_TOKEN_MODE", "DATABASE"))
+
+
+class LogMode(Enum):
+    """
+    Enum dictating how log records are written. QUEUE records are formatted and
+    written to the stream on a background thread, while SYNC records are written
+    immediately on the thread that logged them.
+    """
+
+    QUEUE = "QUEUE"
+    SYNC = "SYNC"
+
+    @staticmethod
+    def get_mode() -> "LogMode":
+        """
+        Extract a LogMode out of the current run environment,
+        defaulting to queued logging.
+
+        Returns:
+            The LogMode that log records should be written with.
+        """
+        return LogMode(os.environ.get("LOG_MODE", "QUEUE"))
+
+
+class TracingMode(Enum):
+    """
+    Enum dictating where trace spans are exported. NONE records no spans, OTLP
+    exports them to an OpenTelemetry collector (configured with the standard
+    OTEL_EXPORTER_OTLP_* variables), and CONSOLE writes them to stdout.
+    """
+
+    NONE = "NONE"
+    OTLP = "OTLP"
+    CONSOLE = "CONSOLE"
+
+    @staticmethod
+    def get_mode() -> "TracingMode":
+        """
+        Extract a TracingMode out of the current run environment,
+        defaulting to not tracing.
+
+        Returns:
+            The TracingMode that spans should be exported with.
+        """
+        return TracingMode(os.environ.get("TRACING_MODE", "NONE"))
+
+
+class RateLimitMode(Enum):
+    """
+    Enum dictating where rate limit buckets are kept. MEMORY buckets are kept
+    per worker process, while CACHE buckets are kept in a Django cache (e.g. Redis)
+    shared by every replica.
+    """
+
+    MEMORY = "MEMORY"
+    CACHE = "CACHE"
+
+    @staticmethod
+    def get_mode() -> "RateLimitMode":
+        """
+        Extract a RateLimitMode out of the current run environment,
+        defaulting to in-memory buckets.
+
+        Returns:
+            The RateLimitMode that rate limit buckets should be kept with.
+        """
+        return RateLimitMode(os.environ.get("RATE_LIMIT_MODE", "MEMORY"))
+
+
 def set_database_url() -> None:
     """
     Sets the DATABASE_URL environment variable to the construction
@@ -40,4 +129,61 @@ def set_database_url() -> None:
     db_user = os.environ.get("DB_USER", "")
     db_password = os.environ.get("DB_PASSWORD", "")
     db_name = os.environ.get("DB_NAME", "")
-    os.environ["DATABASE_URL"] = f"postgres://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
+    os.environ["DATABASE_URL"] = (
+        f"postgres://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
+    )
+
+
+def get_replica_database_url() -> str | None:
+    """
+    Get a connection string for the read replica, if one is configured. The
+    replica shares the primary's credentials and database name, so only its host
+    (DB_REPLICA_HOST) and optionally port (DB_REPLICA_PORT) need to be provided,
+    unless a full DATABASE_REPLICA_URL is given instead.
+
+    Returns:
+        The replica's connection string, or None if there is no replica.
+    """
+    if os.environ.get("DATABASE_REPLICA_URL"):
+        return os.environ["DATABASE_REPLICA_URL"]
+
+    replica_host = os.environ.get("DB_REPLICA_HOST", "")
+    if not replica_host:
+        return None
+    replica_port = os.environ.get("DB_REPLICA_PORT", os.environ.get("DB_PORT", ""))
+    db_user = os.environ.get("DB_USER", "")
+    db_password = os.environ.get("DB_PASSWORD", "")
+    db_name = os.environ.get("DB_NAME", "")
+    return f"postgres://{db_user}:{db_password}@{replica_host}:{replica_port}/{db_name}"
+
+
+def get_database_pool_options() -> dict[str, int] | None:
+    """
+    Build the options for Django's built in psycopg connection pool out of
+    the DB_POOL_* environment variables, if pooling is enabled.
+
+    Returns:
+        The options to set as OPTIONS["pool"] on the database, or None if
+        DB_POOL_ENABLED is not "True" and connections should not be pooled.
+    """
+    if os.environ.get("DB_POOL_ENABLED", None) != "True":
+        return None
+    return {
+        "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", 2)),
+        "max_size": int(os.environ.get("DB_POOL_MAX_SIZE", 10)),
+        "timeout": int(os.environ.get("DB_POOL_TIMEOUT_SECONDS", 10)),
+    }
+
+
+def get_session_reaper_batch_size() -> int:
+    """
+    Get the maximum number of expired sessions the reaper deletes per statement,
+    from SESSION_REAPER_BATCH_SIZE.
+
+    Returns:
+        The batch size, defaulting to 1000.
+    """
+    batch_size = int(os.environ.get("SESSION_REAPER_BATCH_SIZE", 1000))
+    if batch_size < 1:
+        raise ValueError("SESSION_REAPER_BATCH_SIZE must be at least 1.")
+    return batch_size
@@ -0,0 +1,94 @@
+import logging
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import MutableMapping
+from typing import TypeAlias
+
+
+logger = logging.getLogger("dda")
+
+
+Scope: TypeAlias = MutableMapping[str, Any]
+Message: TypeAlias = MutableMapping[str, Any]
+Receive: TypeAlias = Callable[[], Awaitable[Message]]
+Send: TypeAlias = Callable[[Message], Awaitable[None]]
+# Left loose, as ASGI servers and frameworks each type these slightly differently.
+ASGIApplication: TypeAlias = Callable[..., Awaitable[None]]
+LifespanHook: TypeAlias = Callable[[], Awaitable[None]]
+
+
+class LifespanApplication:
+    """
+    ASGI wrapper that handles lifespan events, which Django's own ASGI handler
+    does not support, and passes everything else through to the wrapped app.
+    Startup hooks run in the order they were registered before the server starts
+    accepting requests, and shutdown hooks run in reverse order once it stops.
+
+    Attributes:
+        app (ASGIApplication): The wrapped application.
+    """
+
+    def __init__(self, app: ASGIApplication):
+        self.app = app
+        self._startup_hooks: list[LifespanHook] = []
+        self._shutdown_hooks: list[LifespanHook] = []
+
+    def on_startup(self, hook: LifespanHook) -> LifespanHook:
+        """
+        Register a hook to run on startup. If it raises, startup fails
+        and the server will exit rather than serve requests.
+
+        Args:
+            hook (LifespanHook): An async callable taking no arguments.
+
+        Returns:
+            The hook, so this can be used as a decorator.
+        """
+        self._startup_hooks.append(hook)
+        return hook
+
+    def on_shutdown(self, hook: LifespanHook) -> LifespanHook:
+        """
+        Register a hook to run on shutdown. Failing hooks are logged
+        and don't stop the remaining hooks from running.
+
+        Args:
+            hook (LifespanHook): An async callable taking no arguments.
+
+        Returns:
+            The hook, so this can be used as a decorator.
+        """
+        self._shutdown_hooks.append(hook)
+        return hook
+
+    async def startup(self) -> None:
+        for hook in self._startup_hooks:
+            await hook()
+
+    async def shutdown(self) -> None:
+        for hook in reversed(self._shutdown_hooks):
+            try:
+                await hook()
+            except Exception as e:
+                logger.error(f"Shutdown hook {hook.__name__} failed: {e}")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "lifespan":
+            await self.app(scope, receive, send)
+            return
+
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    await self.startup()
+                except Exception as e:
+                    logger.exception("Application startup failed.")
+                    await send({"type": "lifespan.startup.failed", "message": str(e)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
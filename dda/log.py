@@ -0,0 +1,123 @@
+import copy
+import logging
+import queue
+from contextvars import ContextVar
+from dataclasses import dataclass
+from dataclasses import replace
+from logging.handlers import QueueListener
+from typing import IO
+from typing import Any
+
+
+@dataclass(frozen=True)
+class LogContext:
+    """
+    Request state attached to every log record, held as the strings that
+    will be logged so that nothing is converted per log call.
+
+    Attributes:
+        tid (str): The transaction ID of the current request.
+        user_id (str): The ID of the authenticated user, if there is one.
+    """
+
+    tid: str | None = None
+    user_id: str | None = None
+
+
+_EMPTY_LOG_CONTEXT = LogContext()
+_log_context: ContextVar[LogContext] = ContextVar(
+    "log_context", default=_EMPTY_LOG_CONTEXT
+)
+
+
+def start_log_context(tid: Any) -> None:
+    """
+    Start a new log context for the current request (or task).
+
+    Args:
+        tid (Any): The transaction ID of the current request.
+    """
+    _log_context.set(LogContext(tid=str(tid)))
+
+
+def bind_log_user(user_id: Any) -> None:
+    """
+    Add the authenticated user to the current log context.
+
+    Args:
+        user_id (Any): The ID of the authenticated user.
+    """
+    _log_context.set(replace(_log_context.get(), user_id=str(user_id)))
+
+
+def get_log_context() -> LogContext:
+    return _log_context.get()
+
+
+class LogContextFilter(logging.Filter):
+    """
+    Adds the current log context's tid and user_id to each record, unless they
+    were already given through `extra`. This must run on the thread the record
+    was logged from, as that is the only place the context is available.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = _log_context.get()
+        if not hasattr(record, "tid"):
+            record.tid = context.tid
+        if not hasattr(record, "user_id"):
+            record.user_id = context.user_id
+        return True
+
+
+class QueueingStreamHandler(logging.Handler):
+    """
+    A handler that only queues records on the logging thread, and leaves formatting
+    and writing them to a stream to a background thread. Formatters and levels
+    configured on this handler are applied on the background thread, so it can be
+    used in place of a StreamHandler in the logging config.
+
+    This isn't a QueueHandler subclass, as logging.config.dictConfig configures
+    those itself from Python 3.12 on, expecting a queue and handlers to be given.
+
+    Attributes:
+        queue (SimpleQueue): Records waiting to be written.
+        stream_handler (StreamHandler): The handler records are written out with.
+        queue_listener (QueueListener): The background thread handing records to the stream handler.
+    """
+
+    def __init__(self, stream: IO[str] | None = None):
+        super().__init__()
+        self.queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+        self.stream_handler = logging.StreamHandler(stream)
+        self.queue_listener = QueueListener(self.queue, self.stream_handler)
+        self.queue_listener.start()
+        self._is_listening = True
+
+    def setFormatter(self, fmt: logging.Formatter | None) -> None:
+        self.stream_handler.setFormatter(fmt)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Only merge the arguments into the message, which must happen before the
+        # arguments can change. Unlike QueueHandler, formatting is left to the
+        # stream handler, and exception info is kept for it to format.
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        return record
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(self.prepare(record))
+        except Exception:
+            self.handleError(record)
+
+    def close(self) -> None:
+        # Drains every queued record before closing. Handlers are closed again
+        # when the interpreter exits, so this must be safe to call twice.
+        if self._is_listening:
+            self._is_listening = False
+            self.queue_listener.stop()
+        self.stream_handler.close()
+        super().close()
@@ -0,0 +1,72 @@
+import json
+from http import HTTPStatus
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import TypeAlias
+from dda.lifespan import ASGIApplication
+from dda.lifespan import Receive
+from dda.lifespan import Scope
+from dda.lifespan import Send
+
+
+# A probe returns the status code and JSON body to respond with.
+Probe: TypeAlias = Callable[[], Awaitable[tuple[HTTPStatus, dict[str, Any]]]]
+
+
+_PROBE_METHODS = frozenset({"GET", "HEAD"})
+
+
+class ProbeApplication:
+    """
+    ASGI wrapper that answers health probes itself, so that they skip Django's
+    request handling and middleware entirely, including its logging and
+    authentication. Every other request is passed through to the wrapped app.
+
+    Attributes:
+        app (ASGIApplication): The wrapped application.
+    """
+
+    def __init__(self, app: ASGIApplication):
+        self.app = app
+        self._probes: dict[str, Probe] = {}
+
+    def add_probe(self, path: str, probe: Probe) -> None:
+        """
+        Answer GET and HEAD requests for a path with a probe.
+
+        Args:
+            path (str): The exact path to answer, e.g. /v1/glb/health/live.
+            probe (Probe): An async callable returning the status code and JSON body.
+        """
+        self._probes[path] = probe
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        probe = (
+            self._probes.get(scope["path"])
+            if scope["type"] == "http" and scope["method"] in _PROBE_METHODS
+            else None
+        )
+        if probe is None:
+            await self.app(scope, receive, send)
+            return
+
+        status, body = await probe()
+        content = json.dumps(body).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(content)).encode()),
+                    (b"cache-control", b"no-store"),
+                ],
+            }
+        )
+        await send(
+            {
+                "type": "http.response.body",
+                "body": content if scope["method"] == "GET" else b"",
+            }
+        )
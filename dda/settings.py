@@ -1,6 +1,13 @@
 import os
 import dj_database_url
 from dda.env import Env
+from dda.env import LogMode
+from dda.env import RateLimitMode
+from dda.env import SessionTokenMode
+from dda.env import TracingMode
+from dda.env import get_database_pool_options
+from dda.env import get_replica_database_url
+from dda.env import get_session_reaper_batch_size
 from dda.env import set_database_url
 
 
@@ -13,7 +20,69 @@ ROOT_URLCONF = "dda.urls"
 
 GOOGLE_CLIENT_ID = os.environ.get("GOOGLE_CLIENT_ID", None)
 GOOGLE_CLIENT_SECRET = os.environ.get("GOOGLE_CLIENT_SECRET", None)
+GOOGLE_TOKEN_EXCHANGE_URL = os.environ.get(
+    "GOOGLE_TOKEN_EXCHANGE_URL", "https://oauth2.googleapis.com/token"
+)
+GOOGLE_CERTS_URL = os.environ.get(
+    "GOOGLE_CERTS_URL", "https://www.googleapis.com/oauth2/v1/certs"
+)
+GOOGLE_CERTS_REFRESH_MARGIN_SECONDS = int(
+    os.environ.get("GOOGLE_CERTS_REFRESH_MARGIN_SECONDS", 300)
+)
+GOOGLE_CERTS_MIN_REFRESH_INTERVAL_SECONDS = int(
+    os.environ.get("GOOGLE_CERTS_MIN_REFRESH_INTERVAL_SECONDS", 30)
+)
+GOOGLE_CERTS_DEFAULT_MAX_AGE_SECONDS = int(
+    os.environ.get("GOOGLE_CERTS_DEFAULT_MAX_AGE_SECONDS", 3600)
+)
+
+# Shared, pooled client for outgoing HTTP calls to external services.
+HTTP_CLIENT_TIMEOUT_SECONDS = float(os.environ.get("HTTP_CLIENT_TIMEOUT_SECONDS", 5))
+HTTP_CLIENT_MAX_CONNECTIONS = int(os.environ.get("HTTP_CLIENT_MAX_CONNECTIONS", 20))
+HTTP_CLIENT_MAX_RETRIES = int(os.environ.get("HTTP_CLIENT_MAX_RETRIES", 2))
+HTTP_CLIENT_BACKOFF_SECONDS = float(os.environ.get("HTTP_CLIENT_BACKOFF_SECONDS", 0.1))
+
+
+# How long the result of a readiness check is reused for.
+HEALTH_CHECK_CACHE_SECONDS = float(os.environ.get("HEALTH_CHECK_CACHE_SECONDS", 5))
+
+# Token bucket limits by scope, as "<requests>/<second|minute|hour>", with buckets kept
+# per authenticated user, or per client IP for unauthenticated requests. CACHE mode
+# keeps buckets in RATE_LIMIT_CACHE, so that limits are shared across replicas.
+RATE_LIMIT_MODE = RateLimitMode.get_mode()
+RATE_LIMIT_CACHE = os.environ.get("RATE_LIMIT_CACHE", "default")
+RATE_LIMIT_MAX_KEYS = int(os.environ.get("RATE_LIMIT_MAX_KEYS", 100000))
+# Number of proxies in front of the server that append to X-Forwarded-For. With none,
+# the client is the connection's peer, so a load balancer in front of the server must
+# preserve the client's address (e.g. externalTrafficPolicy: Local in deploy/), or
+# every client shares the limit of the balancer's address.
+RATE_LIMIT_NUM_PROXIES = int(os.environ.get("RATE_LIMIT_NUM_PROXIES", 0))
+RATE_LIMITS = {
+    "google_login": os.environ.get("RATE_LIMIT_GOOGLE_LOGIN", "10/minute"),
+    "session": os.environ.get("RATE_LIMIT_SESSION", "120/minute"),
+}
 
+# Successful responses of at least COMPRESSION_MIN_BYTES are compressed with brotli or
+# gzip, as negotiated from Accept-Encoding. Bodies and streamed chunks of at least
+# COMPRESSION_THREAD_MIN_BYTES are compressed on a worker thread, off the event loop.
+COMPRESSION_ENABLED = os.environ.get("COMPRESSION_ENABLED", "True") == "True"
+COMPRESSION_MIN_BYTES = int(os.environ.get("COMPRESSION_MIN_BYTES", 1024))
+COMPRESSION_THREAD_MIN_BYTES = int(
+    os.environ.get("COMPRESSION_THREAD_MIN_BYTES", 64 * 1024)
+)
+COMPRESSION_GZIP_LEVEL = int(os.environ.get("COMPRESSION_GZIP_LEVEL", 6))
+# Brotli's default of 11 is too slow for responses compressed per request.
+COMPRESSION_BROTLI_QUALITY = int(os.environ.get("COMPRESSION_BROTLI_QUALITY", 4))
+
+# Token required to scrape /v1/glb/metrics, which is disabled if this is not set.
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", None)
+# Reports the queries made by each request in its headers and logs, and warns when
+# a statement is repeated at least DB_QUERY_REPEAT_THRESHOLD times in one request.
+DB_QUERY_PROFILING_ENABLED = os.environ.get("DB_QUERY_PROFILING_ENABLED") == "True"
+DB_QUERY_REPEAT_THRESHOLD = int(os.environ.get("DB_QUERY_REPEAT_THRESHOLD", 3))
+# Spans are exported in batches from a background thread.
+TRACING_MODE = TracingMode.get_mode()
+TRACING_SERVICE_NAME = os.environ.get("OTEL_SERVICE_NAME", "dda-server")
 
 ENVIRONMENT = Env.get_env()
 
@@ -25,23 +94,42 @@ def get_log_level() -> str:
 
 
 SESSION_LENGTH_MINUTES = int(os.environ.get("SESSION_LENGTH_MINUTES", 15))
+# Per-worker cache of session token -> user, set max size to 0 to disable.
+SESSION_CACHE_MAX_SIZE = int(os.environ.get("SESSION_CACHE_MAX_SIZE", 10000))
+SESSION_CACHE_TTL_SECONDS = int(os.environ.get("SESSION_CACHE_TTL_SECONDS", 60))
+SESSION_TOKEN_MODE = SessionTokenMode.get_mode()
+# Expired sessions are removed by a periodic in-process task when the interval is
+# positive, or by the reap_expired_sessions management command.
+SESSION_REAPER_INTERVAL_SECONDS = int(
+    os.environ.get("SESSION_REAPER_INTERVAL_SECONDS", 0)
+)
+SESSION_REAPER_BATCH_SIZE = get_session_reaper_batch_size()
+# Cache alias holding revocations for signed session tokens. This must be a shared
+# backend (e.g. Redis) for logouts to be honored across replicas.
+SESSION_REVOCATION_CACHE = os.environ.get("SESSION_REVOCATION_CACHE", "default")
 
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": True,
     "formatters": {
         "json": {
-            '()': 'pythonjsonlogger.jsonlogger.JsonFormatter',
+            "()": "pythonjsonlogger.jsonlogger.JsonFormatter",
             "format": "{asctime} {levelname} {tid} {user_id} {message}",
             "style": "{",
-            "defaults": {"user_id": None}
+            "defaults": {"tid": None, "user_id": None},
         }
     },
+    "filters": {
+        "log_context": {"()": "dda.log.LogContextFilter"},
+    },
     "handlers": {
         "console": {
             "level": get_log_level(),
-            "class": "logging.StreamHandler",
+            "class": "dda.log.QueueingStreamHandler"
+            if LogMode.get_mode() == LogMode.QUEUE
+            else "logging.StreamHandler",
             "formatter": "json",
+            "filters": ["log_context"],
         }
     },
     "loggers": {
@@ -56,8 +144,20 @@ LOGGING = {
 
 # This order is specific
 MIDDLEWARE = [
+    "dda.v1.routes.middleware.tracing.tracing_middleware",
+    "dda.v1.routes.middleware.metrics.metrics_middleware",
+    *(
+        ["dda.v1.routes.middleware.compression.compression_middleware"]
+        if COMPRESSION_ENABLED
+        else []
+    ),
     "django.middleware.security.SecurityMiddleware",
     "dda.v1.routes.middleware.transaction.transaction_middleware",
+    *(
+        ["dda.v1.routes.middleware.query_profiling.query_profiling_middleware"]
+        if DB_QUERY_PROFILING_ENABLED
+        else []
+    ),
     "dda.v1.routes.middleware.authentication.authentication_middleware",
 ]
 
@@ -74,9 +174,49 @@ TEMPLATES = [
 ]
 
 set_database_url()
+DATABASE_POOL_OPTIONS = get_database_pool_options()
 DATABASES = {
-    "default": dj_database_url.config(conn_max_age=600, conn_health_checks=True)
+    "default": dj_database_url.config(
+        # Pooled connections are returned to the pool at the end of each
+        # request, which Django requires in place of persistent connections.
+        conn_max_age=0 if DATABASE_POOL_OPTIONS is not None else 600,
+        conn_health_checks=True,
+    )
+}
+
+DATABASE_REPLICA_URL = get_replica_database_url()
+if DATABASE_REPLICA_URL is not None:
+    DATABASES["replica"] = dj_database_url.parse(
+        DATABASE_REPLICA_URL,
+        conn_max_age=DATABASES["default"]["CONN_MAX_AGE"],
+        conn_health_checks=True,
+    )
+    # Tests run against the primary's test database, rather than creating another.
+    DATABASES["replica"]["TEST"] = {"MIRROR": "default"}
+
+# How far the replica may lag behind the primary. A user updated within this long is
+# read from the primary, so that the update is seen before it has been replicated.
+DB_REPLICA_MAX_LAG_SECONDS = float(os.environ.get("DB_REPLICA_MAX_LAG_SECONDS", 5))
+
+if DATABASE_POOL_OPTIONS is not None:
+    for database in DATABASES.values():
+        database["OPTIONS"] = {"pool": dict(DATABASE_POOL_OPTIONS)}
+DATABASE_ROUTERS = ["dda.v1.db_router.ReplicaRouter"]
+
+# Number of pooled database connections opened on startup, before serving requests.
+# Only used when connection pooling is enabled.
+DB_WARMUP_CONNECTIONS = int(os.environ.get("DB_WARMUP_CONNECTIONS", 2))
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
 }
+if os.environ.get("REDIS_URL"):
+    CACHES["default"] = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.environ["REDIS_URL"],
+    }
 
 
 INSTALLED_APPS = ["django.contrib.contenttypes", "dda.v1"]
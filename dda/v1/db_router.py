@@ -0,0 +1,55 @@
+from contextvars import ContextVar
+from typing import Any
+from django.conf import settings
+from django.db import models
+
+
+PRIMARY_DATABASE = "default"
+REPLICA_DATABASE = "replica"
+
+
+_pinned_to_primary: ContextVar[bool] = ContextVar("pinned_to_primary", default=False)
+
+
+def is_replica_configured() -> bool:
+    """True if a read replica has been configured alongside the primary."""
+    return REPLICA_DATABASE in settings.DATABASES
+
+
+def pin_to_primary() -> None:
+    """
+    Send every read for the rest of the current request (or task) to the primary,
+    so that it can read its own writes without waiting on replication.
+    """
+    _pinned_to_primary.set(True)
+
+
+def is_pinned_to_primary() -> bool:
+    return _pinned_to_primary.get()
+
+
+class ReplicaRouter:
+    """
+    Database router that sends reads to the read replica, if one is configured,
+    and everything else to the primary. Reads made after `pin_to_primary` has
+    been called in the current context go to the primary as well.
+    """
+
+    def db_for_read(self, model: type[models.Model], **hints: Any) -> str:
+        if is_pinned_to_primary() or not is_replica_configured():
+            return PRIMARY_DATABASE
+        return REPLICA_DATABASE
+
+    def db_for_write(self, model: type[models.Model], **hints: Any) -> str:
+        return PRIMARY_DATABASE
+
+    def allow_relation(
+        self, obj1: models.Model, obj2: models.Model, **hints: Any
+    ) -> bool:
+        # The replica holds the same data as the primary.
+        return True
+
+    def allow_migrate(
+        self, db: str, app_label: str, model_name: str | None = None, **hints: Any
+    ) -> bool:
+        return db == PRIMARY_DATABASE
@@ -6,6 +6,7 @@ from http import HTTPStatus
 _UNAUTHORIZED_ERROR_CODE = "UserUnauthorized"
 _NOT_FOUND_ERROR_CODE = "ResourceNotFound"
 _CONFLICT_ERROR_CODE = "ResourceHasConflict"
+_PRECONDITION_FAILED_ERROR_CODE = "ResourcePreconditionFailed"
 
 
 class ResourceException(Exception, ABC):
@@ -36,6 +37,19 @@ class UnauthenticatedError(Exception):
     """
 
 
+class RateLimitedError(Exception):
+    """
+    Wrapper exception to be thrown when a client has made too many requests,
+    resulting in a 429 status code.
+
+    Attributes:
+        retry_after_seconds (float): How long until the client may make another request.
+    """
+
+    def __init__(self, retry_after_seconds: float):
+        self.retry_after_seconds = retry_after_seconds
+
+
 class UnauthorizedError(ResourceException):
     """
     Wrapper exception to be thrown when a user attempts
@@ -74,3 +88,16 @@ class ConflictError(ResourceException):
 
     def __str__(self) -> str:
         return f'Operation on resource "{self.resource_name}" identified by "{self.resource_id}" would result in a conflict.'
+
+
+class PreconditionFailedError(ResourceException):
+    """
+    Wrapper exception denoting when a user tries to act on a resource that has
+    changed since they last read it, as identified by an If-Match header.
+    """
+
+    error_code = _PRECONDITION_FAILED_ERROR_CODE
+    http_status = HTTPStatus.PRECONDITION_FAILED
+
+    def __str__(self) -> str:
+        return f'Resource "{self.resource_name}" identified by "{self.resource_id}" has changed since it was last read.'
@@ -0,0 +1,154 @@
+import asyncio
+import logging
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections
+from django.urls import get_resolver
+from dda.env import Env
+from dda.env import RateLimitMode
+from dda.env import SessionTokenMode
+from dda.v1.routes.api import dda_api
+from dda.v1.services.authn.google_certs import google_certificate_store
+from dda.v1.services.http_client import http_client
+from dda.v1.services.metrics import mark_process_dead
+from dda.v1.services.rate_limit import CacheRateLimitBackend
+from dda.v1.services.session_reaper import session_reaper
+from dda.v1.services.signed_session import SignedSessionService
+from dda.v1.services.tracing import shutdown_tracing
+
+
+logger = logging.getLogger("dda")
+
+
+def _report_misconfiguration(message: str) -> None:
+    # Running locally, a single process is usually all there is.
+    if settings.ENVIRONMENT == Env.LOCAL:
+        logger.error(message)
+        return
+    raise ImproperlyConfigured(message)
+
+
+async def check_session_revocation_cache() -> None:
+    """
+    Refuse to start with signed session tokens when their revocations would only
+    be kept in this process, as other workers and replicas would then keep
+    accepting tokens after a logout. Running locally, this is only logged.
+    """
+    if settings.SESSION_TOKEN_MODE != SessionTokenMode.SIGNED:
+        return
+    if SignedSessionService.is_revocation_cache_shared():
+        return
+    _report_misconfiguration(
+        f"Cache {settings.SESSION_REVOCATION_CACHE} holding signed session "
+        "revocations is local to this process, so logouts won't be honored by "
+        "other workers. Set REDIS_URL, or SESSION_REVOCATION_CACHE to a shared cache."
+    )
+
+
+async def check_rate_limit_cache() -> None:
+    """
+    Refuse to start with rate limit buckets shared through a cache that is local
+    to this process, as each worker and replica would then enforce its own limits.
+    Running locally, this is only logged.
+    """
+    if settings.RATE_LIMIT_MODE != RateLimitMode.CACHE:
+        return
+    if CacheRateLimitBackend(settings.RATE_LIMIT_CACHE).is_cache_shared():
+        return
+    _report_misconfiguration(
+        f"Cache {settings.RATE_LIMIT_CACHE} holding rate limit buckets is local to "
+        "this process, so limits aren't shared by other workers. Set REDIS_URL, or "
+        "RATE_LIMIT_CACHE to a shared cache."
+    )
+
+
+async def warm_database_connections() -> None:
+    """
+    Fill the connection pool with settings.DB_WARMUP_CONNECTIONS connections,
+    opened concurrently, so that connection setup is paid before the first
+    request rather than by it. Closing them afterwards returns them to the pool.
+    This only runs when connection pooling is enabled, as otherwise each request
+    opens its own connection on its own thread, and a connection opened here would
+    never be used. Failing to is not fatal.
+    """
+
+    def _warm_connection() -> None:
+        try:
+            with connections["default"].cursor() as cursor:
+                cursor.execute("SELECT 1")
+        finally:
+            connections.close_all()
+
+    connection_count = settings.DB_WARMUP_CONNECTIONS
+    if settings.DATABASE_POOL_OPTIONS is None or connection_count <= 0:
+        return
+    try:
+        # Connections are per-thread, so each must be opened on its own thread.
+        await asyncio.gather(
+            *(
+                sync_to_async(_warm_connection, thread_sensitive=False)()
+                for _ in range(connection_count)
+            )
+        )
+    except Exception as e:
+        # An unreachable database is left for the readiness check to report,
+        # rather than crashing the server before it can.
+        logger.warning(f"Failed to warm database connections: {e}")
+        return
+    logger.info(f"Warmed {connection_count} database connections.")
+
+
+async def compile_api() -> None:
+    """
+    Build the URL resolver and every route's pydantic schemas ahead of time,
+    both of which are otherwise built lazily by the first request.
+    """
+    get_resolver().url_patterns
+    dda_api.get_openapi_schema()
+
+
+async def prefetch_google_certificates() -> None:
+    """
+    Load Google's signing certificates so that the first login doesn't fetch them.
+    Failing to is not fatal, they'll be fetched again when first needed.
+    """
+    try:
+        await google_certificate_store.refresh()
+    except Exception as e:
+        logger.warning(f"Failed to prefetch Google certificates: {e}")
+
+
+async def start_session_reaper() -> None:
+    """Start the expired session reaper, if it's enabled."""
+    session_reaper.ensure_started()
+
+
+async def stop_session_reaper() -> None:
+    await session_reaper.stop()
+
+
+async def close_http_client() -> None:
+    await http_client.aclose()
+
+
+async def close_database_connections() -> None:
+    def _close_database_connections() -> None:
+        connections.close_all()
+        for connection in connections.all():
+            # Only backends supporting connection pooling have a pool to close.
+            close_pool = getattr(connection, "close_pool", None)
+            if close_pool is not None:
+                close_pool()
+
+    await sync_to_async(_close_database_connections)()
+
+
+async def release_metrics() -> None:
+    """Drop this worker's in-flight gauge, so it isn't counted once the worker exits."""
+    mark_process_dead()
+
+
+async def flush_traces() -> None:
+    """Export any spans still queued before the worker exits."""
+    await sync_to_async(shutdown_tracing, thread_sensitive=False)()
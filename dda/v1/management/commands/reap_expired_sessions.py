@@ -0,0 +1,32 @@
+from argparse import ArgumentTypeError
+from typing import Any
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandParser
+from dda.v1.services.user import UserService
+
+
+def _batch_size(value: str) -> int:
+    batch_size = int(value)
+    if batch_size < 1:
+        raise ArgumentTypeError("must be at least 1")
+    return batch_size
+
+
+class Command(BaseCommand):
+    help = "Bulk delete expired user sessions, in batches."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=_batch_size,
+            default=settings.SESSION_REAPER_BATCH_SIZE,
+            help="Maximum number of sessions to delete per statement.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        deleted = async_to_sync(UserService.delete_expired_sessions)(
+            options["batch_size"]
+        )
+        self.stdout.write(f"Deleted {deleted} expired sessions.")
@@ -0,0 +1,20 @@
+# Generated by Django 5.1.15 on 2026-10-17 21:16
+
+import dda.v1.models.user
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("v1", "0003_user_is_phone_verified"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="sessiontoken",
+            name="expires_at",
+            field=models.DateTimeField(
+                db_index=True, default=dda.v1.models.user._get_expiry_date
+            ),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.15 on 2026-10-17 22:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("v1", "0004_sessiontoken_expires_at_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="version",
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
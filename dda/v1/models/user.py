@@ -33,6 +33,7 @@ class User(AbstractDatedModel):
         phone_number (str): The user's phone number in E.164 format.
         profile_picture (str): A link to the user's profile photo, if present.
         source (str): Where the original user signup came from.
+        version (int): Incremented on every update to the user's profile, to tag its ETag.
     """
 
     email = models.CharField(null=False, unique=True)
@@ -46,6 +47,7 @@ class User(AbstractDatedModel):
     source = models.CharField(
         choices=[(entry.name, entry.value) for entry in UserSource], null=False
     )
+    version = models.PositiveIntegerField(default=1)
 
     objects: ClassVar[models.Manager["User"]]
 
@@ -88,7 +90,9 @@ class SessionToken(models.Model):
     token = models.CharField(
         default=_generate_session_token, null=False, primary_key=True
     )
-    expires_at = models.DateTimeField(default=_get_expiry_date, null=False)
+    expires_at = models.DateTimeField(
+        db_index=True, default=_get_expiry_date, null=False
+    )
     user = models.OneToOneField(
         User, null=True, on_delete=models.CASCADE, related_name="session"
     )
@@ -5,6 +5,8 @@ from ninja.errors import ValidationError
 from dda.env import Env
 from dda.v1.exceptions import ConflictError
 from dda.v1.exceptions import NotFoundError
+from dda.v1.exceptions import PreconditionFailedError
+from dda.v1.exceptions import RateLimitedError
 from dda.v1.exceptions import UnauthenticatedError
 from dda.v1.exceptions import UnauthorizedError
 from dda.v1.routes.glb import glb_router
@@ -12,9 +14,12 @@ from dda.v1.routes.user import user_router
 from dda.v1.routes.exception_handlers import handle_general_exceptions
 from dda.v1.routes.exception_handlers import handle_google_code_exchange_errors
 from dda.v1.routes.exception_handlers import handle_google_token_validation_errors
+from dda.v1.routes.exception_handlers import handle_rate_limited_error
 from dda.v1.routes.exception_handlers import handle_resource_error
 from dda.v1.routes.exception_handlers import handle_validation_errors
 from dda.v1.routes.exception_handlers import handle_unauthenticated_error
+from dda.v1.routes.renderers import ORJSONParser
+from dda.v1.routes.renderers import ORJSONRenderer
 from dda.v1.services.authn.google import ExternalGoogleService
 
 IS_PRODUCTION = Env.get_env() == Env.PRODUCTION
@@ -24,6 +29,8 @@ dda_api = NinjaAPI(
     docs_url=None if IS_PRODUCTION else "/docs",  # Disable docs in production
     openapi_url=None if IS_PRODUCTION else "/openapi.json",
     title="DDA-API",
+    renderer=ORJSONRenderer(),
+    parser=ORJSONParser(),
 )
 dda_api.add_router("glb", glb_router)
 dda_api.add_router("user", user_router)
@@ -56,6 +63,12 @@ dda_api.add_exception_handler(
 dda_api.add_exception_handler(
     ConflictError, partial(handle_resource_error, api=dda_api)
 )
+dda_api.add_exception_handler(
+    PreconditionFailedError, partial(handle_resource_error, api=dda_api)
+)
+dda_api.add_exception_handler(
+    RateLimitedError, partial(handle_rate_limited_error, api=dda_api)
+)
 
 
 urlpatterns = [path("", dda_api.urls)]
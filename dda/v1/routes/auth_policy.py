@@ -0,0 +1,109 @@
+import re
+from enum import Enum
+from typing import Any
+
+
+# OpenAPI extension key routes declare their policy under, which also documents it.
+_AUTH_POLICY_KEY = "x-auth-policy"
+_PATH_PARAMETER_REGEX = re.compile(r"\{[^/]+?\}")
+
+
+class AuthPolicy(Enum):
+    """
+    Enum declaring what a route needs of the Authorization header. REQUIRED routes
+    need an authenticated user, OPTIONAL routes may use one if a session token is
+    given, and NONE routes never look at the user, so authentication is skipped.
+    """
+
+    REQUIRED = "REQUIRED"
+    OPTIONAL = "OPTIONAL"
+    NONE = "NONE"
+
+
+def auth_policy(policy: AuthPolicy) -> dict[str, Any]:
+    """
+    Declare a route's auth policy, to be passed as the route's `openapi_extra`.
+
+    Args:
+        policy (AuthPolicy): What the route needs of the Authorization header.
+
+    Returns:
+        The OpenAPI extension declaring the policy.
+    """
+    return {_AUTH_POLICY_KEY: policy.value}
+
+
+class RouteAuthPolicies:
+    """
+    A table of the auth policy of every route, built once from the API's OpenAPI
+    schema, so that middleware can find a request's policy before the request
+    is routed. Routes without a path parameter are found with a single lookup.
+
+    Attributes:
+        default_policy (AuthPolicy): Policy for routes that don't declare one.
+    """
+
+    def __init__(self, default_policy: AuthPolicy):
+        self.default_policy = default_policy
+        self._static_routes: dict[tuple[str, str], AuthPolicy] = {}
+        self._parameterized_routes: list[tuple[str, re.Pattern[str], AuthPolicy]] = []
+
+    @staticmethod
+    def from_openapi_schema(
+        schema: dict[str, Any], default_policy: AuthPolicy
+    ) -> "RouteAuthPolicies":
+        """
+        Build the table from the policies declared in an OpenAPI schema.
+
+        Args:
+            schema (dict[str, Any]): The API's OpenAPI schema.
+            default_policy (AuthPolicy): Policy for routes that don't declare one.
+
+        Returns:
+            The table of route auth policies.
+        """
+        policies = RouteAuthPolicies(default_policy)
+        for path, operations in schema.get("paths", {}).items():
+            for method, operation in operations.items():
+                policy = operation.get(_AUTH_POLICY_KEY)
+                if policy is not None:
+                    policies.add(method.upper(), path, AuthPolicy(policy))
+        return policies
+
+    def add(self, method: str, path: str, policy: AuthPolicy) -> None:
+        """
+        Set the policy of a route.
+
+        Args:
+            method (str): The HTTP method of the route.
+            path (str): The route's path, with parameters in OpenAPI form, e.g. /v1/user/{user_id}.
+            policy (AuthPolicy): The route's policy.
+        """
+        if _PATH_PARAMETER_REGEX.search(path) is None:
+            self._static_routes[(method, path)] = policy
+            return
+        path_regex = "[^/]+".join(
+            re.escape(part) for part in _PATH_PARAMETER_REGEX.split(path)
+        )
+        self._parameterized_routes.append(
+            (method, re.compile(f"^{path_regex}$"), policy)
+        )
+
+    def get(self, method: str, path: str) -> AuthPolicy:
+        """
+        Get the policy of the route a request would be routed to.
+
+        Args:
+            method (str): The HTTP method of the request.
+            path (str): The path of the request.
+
+        Returns:
+            The route's policy, or the default policy if it doesn't declare one.
+        """
+        policy = self._static_routes.get((method, path))
+        if policy is not None:
+            return policy
+        for route_method, path_regex, route_policy in self._parameterized_routes:
+            if route_method == method and path_regex.match(path):
+                return route_policy
+        return self.default_policy
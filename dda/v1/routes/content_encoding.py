@@ -0,0 +1,39 @@
+BROTLI = "br"
+GZIP = "gzip"
+# Preferred first, when the client accepts both equally.
+SUPPORTED_ENCODINGS = (BROTLI, GZIP)
+
+
+def get_encoded_etag(etag: str, encoding: str) -> str:
+    """
+    Get the ETag of a response once it's compressed. A compressed response isn't
+    byte for byte the same as the original, so a strong ETag is kept strong but
+    made specific to the encoding, e.g. "<etag>-br". Weak ETags are kept as they are.
+
+    Args:
+        etag (str): The ETag of the uncompressed response.
+        encoding (str): The encoding the response was compressed with.
+
+    Returns:
+        The ETag of the compressed response.
+    """
+    if etag.startswith("W/") or not etag.endswith('"'):
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def strip_etag_encoding(etag: str) -> str:
+    """
+    Get the ETag a response had before it was compressed, from its compressed ETag.
+
+    Args:
+        etag (str): An ETag, which may be one of a compressed response.
+
+    Returns:
+        The ETag without the encoding added by get_encoded_etag, if it had one.
+    """
+    for encoding in SUPPORTED_ENCODINGS:
+        suffix = f'-{encoding}"'
+        if etag.endswith(suffix):
+            return f'{etag.removesuffix(suffix)}"'
+    return etag
@@ -0,0 +1,105 @@
+from http import HTTPStatus
+from django.http import HttpResponse
+from django.utils.http import parse_etags
+from django.utils.http import quote_etag
+from dda.v1.exceptions import PreconditionFailedError
+from dda.v1.models.user import User
+from dda.v1.models.user import UserId
+from dda.v1.routes.content_encoding import strip_etag_encoding
+from dda.v1.routes.http import APIRequest
+
+
+def _strip_weak_indicator(etag: str) -> str:
+    return etag.removeprefix("W/")
+
+
+def _get_comparable_etag(etag: str) -> str:
+    # Every encoding of a profile has the same content, so they all match.
+    return strip_etag_encoding(_strip_weak_indicator(etag))
+
+
+def get_user_etag(user: User) -> str:
+    """
+    Get the ETag of a user's profile, which changes whenever the profile does.
+    The user's ID is part of it, so profiles of different users served from the
+    same path (e.g. /me) never share an ETag.
+
+    The ETag tags the user it's given, so it always matches the body served with it.
+    A user from the session cache may be up to SESSION_CACHE_TTL_SECONDS behind an
+    update made by another worker, and so may its ETag. If-Match is checked against
+    the database, so a stale ETag is refused rather than overwriting a newer profile.
+
+    Args:
+        user (User): The user.
+
+    Returns:
+        The quoted ETag of the user's profile.
+    """
+    return quote_etag(f"{user.id}.{user.version}")
+
+
+def is_not_modified(request: APIRequest, etag: str) -> bool:
+    """
+    Check whether the client already has the current representation of a resource,
+    by weak comparison against the If-None-Match header.
+
+    Args:
+        request (APIRequest): The request.
+        etag (str): The resource's current ETag.
+
+    Returns:
+        True if the resource can be answered with a 304.
+    """
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match is None:
+        return False
+    etags = parse_etags(if_none_match)
+    return "*" in etags or _get_comparable_etag(etag) in {
+        _get_comparable_etag(client_etag) for client_etag in etags
+    }
+
+
+def not_modified(etag: str) -> HttpResponse:
+    """
+    Build a 304 response, which has no body.
+
+    Args:
+        etag (str): The resource's current ETag.
+
+    Returns:
+        The 304 response.
+    """
+    response = HttpResponse(status=HTTPStatus.NOT_MODIFIED)
+    response["ETag"] = etag
+    return response
+
+
+def get_if_match_version(request: APIRequest, user_id: UserId) -> int | None:
+    """
+    Get the version of a user's profile that the client expects to update,
+    from the If-Match header.
+
+    Args:
+        request (APIRequest): The request.
+        user_id (UserId): The user being updated.
+
+    Returns:
+        The expected version, or None if any version may be updated.
+
+    Raises:
+        PreconditionFailedError: If no ETag in the header is one of the user's.
+    """
+    if_match = request.headers.get("If-Match")
+    if if_match is None:
+        return None
+    etags = parse_etags(if_match)
+    if "*" in etags:
+        return None
+    for etag in etags:
+        # If-Match only matches strong ETags.
+        if etag.startswith("W/"):
+            continue
+        etag_user_id, _, version = strip_etag_encoding(etag).strip('"').partition(".")
+        if etag_user_id == str(user_id) and version.isdigit():
+            return int(version)
+    raise PreconditionFailedError(resource_name="User", resource_id=str(user_id))
@@ -1,9 +1,11 @@
 import logging
+import math
 from http import HTTPStatus
 
 from django.http import HttpResponse
 from ninja import NinjaAPI
 from ninja.errors import ValidationError
+from dda.v1.exceptions import RateLimitedError
 from dda.v1.exceptions import ResourceException
 from dda.v1.exceptions import UnauthenticatedError
 from dda.v1.routes.http import APIRequest
@@ -13,6 +15,35 @@ from dda.v1.services.authn.google import ExternalGoogleService
 logger = logging.getLogger("dda")
 
 
+def _render_error(error_code: str, error_message: str) -> bytes:
+    return (
+        APIResponse(error_code=error_code, error_message=error_message)
+        .model_dump_json(by_alias=True)
+        .encode()
+    )
+
+
+# Bodies of errors that never change, rendered once rather than on every failure,
+# as bad tokens and credentials can make these the most frequent responses.
+_UNKNOWN_ERROR_BODY = _render_error("UnknownError", "An unknown error has occurred")
+_INVALID_TOKEN_BODY = _render_error(
+    "InvalidToken", "Input token could not be validated"
+)
+_TOKEN_EXCHANGE_FAILED_BODY = _render_error(
+    "TokenExchangeFailed", "Could not exchange authorization code for ID token"
+)
+_USER_UNAUTHENTICATED_BODY = _render_error(
+    "UserUnauthenticated", "Unauthenticated users cannot make this request."
+)
+_TOO_MANY_REQUESTS_BODY = _render_error(
+    "TooManyRequests", "Too many requests were made, try again later."
+)
+
+
+def _static_error_response(api: NinjaAPI, body: bytes, status: int) -> HttpResponse:
+    return HttpResponse(body, status=status, content_type=api.get_content_type())
+
+
 def handle_general_exceptions(
     request: APIRequest, exc: Exception, api: NinjaAPI
 ) -> HttpResponse:
@@ -28,17 +59,10 @@ def handle_general_exceptions(
     Returns:
         An HttpResponse containing the error information.
     """
-    logger.error(
-        f"Request failed with outgoing exception: ${str(exc)}",
-        extra=request.state.dict(),
-    )
+    logger.error(f"Request failed with outgoing exception: ${str(exc)}")
 
-    return api.create_response(
-        request,
-        APIResponse(
-            error_code="UnknownError", error_message="An unknown error has occurred"
-        ).model_dump(by_alias=True),
-        status=HTTPStatus.INTERNAL_SERVER_ERROR,
+    return _static_error_response(
+        api, _UNKNOWN_ERROR_BODY, HTTPStatus.INTERNAL_SERVER_ERROR
     )
 
 
@@ -67,8 +91,7 @@ def handle_validation_errors(
             error_location = location
 
     logger.error(
-        f"Request failed with a validation error at location {error_location[-1]}",
-        extra=request.state.dict(),
+        f"Request failed with a validation error at location {error_location[-1]}"
     )
 
     return api.create_response(
@@ -76,7 +99,7 @@ def handle_validation_errors(
         APIResponse(
             error_code="ValidationError",
             error_message=f"Validation failed at field ${error_location[-1]}",
-        ).model_dump(by_alias=True),
+        ),
         status=HTTPStatus.BAD_REQUEST,
     )
 
@@ -97,18 +120,8 @@ def handle_google_token_validation_errors(
     Returns:
         An HttpResponse containing the error information.
     """
-    logger.error(
-        "Failed to validate Google ID Token, cannot create session.",
-        extra=request.state.dict(),
-    )
-    return api.create_response(
-        request,
-        APIResponse(
-            error_code="InvalidToken",
-            error_message="Input token could not be validated",
-        ).model_dump(by_alias=True),
-        status=HTTPStatus.BAD_REQUEST,
-    )
+    logger.error("Failed to validate Google ID Token, cannot create session.")
+    return _static_error_response(api, _INVALID_TOKEN_BODY, HTTPStatus.BAD_REQUEST)
 
 
 def handle_google_code_exchange_errors(
@@ -128,16 +141,10 @@ def handle_google_code_exchange_errors(
         An HttpResponse containing the error information.
     """
     logger.error(
-        "Failed to exchange authorization code for ID token, cannot request Google profile.",
-        extra=request.state.dict(),
+        "Failed to exchange authorization code for ID token, cannot request Google profile."
     )
-    return api.create_response(
-        request,
-        APIResponse(
-            error_code="TokenExchangeFailed",
-            error_message="Could not exchange authorization code for ID token",
-        ).model_dump(by_alias=True),
-        status=HTTPStatus.BAD_REQUEST,
+    return _static_error_response(
+        api, _TOKEN_EXCHANGE_FAILED_BODY, HTTPStatus.BAD_REQUEST
     )
 
 
@@ -156,17 +163,9 @@ def handle_unauthenticated_error(
     Returns:
         An HttpResponse containing the error information.
     """
-    logger.error(
-        f"User requested {request.path} but was unauthenticated",
-        extra=request.state.dict(),
-    )
-    return api.create_response(
-        request,
-        APIResponse(
-            error_code="UserUnauthenticated",
-            error_message="Unauthenticated users cannot make this request.",
-        ).model_dump(by_alias=True),
-        status=HTTPStatus.UNAUTHORIZED,
+    logger.error(f"User requested {request.path} but was unauthenticated")
+    return _static_error_response(
+        api, _USER_UNAUTHENTICATED_BODY, HTTPStatus.UNAUTHORIZED
     )
 
 
@@ -184,15 +183,34 @@ def handle_resource_error(
     Returns:
         An HttpResponse containing the error information.
     """
-    logger.error(
-        str(_exc),
-        extra=request.state.dict(),
-    )
+    logger.error(str(_exc))
     return api.create_response(
         request,
         APIResponse(
             error_code=_exc.error_code,
             error_message=str(_exc),
-        ).model_dump(by_alias=True),
+        ),
         status=_exc.http_status,
     )
+
+
+def handle_rate_limited_error(
+    request: APIRequest, exc: RateLimitedError, api: NinjaAPI
+) -> HttpResponse:
+    """
+    Exception handler to catch a client having made too many requests.
+
+    Args:
+        request (APIRequest): The originating request.
+        exc (Exception): The source exception.
+        api (NinjaAPI): The root API object serving this request.
+
+    Returns:
+        An HttpResponse containing the error information, and when to retry.
+    """
+    logger.warning(f"Request to {request.path} was rate limited.")
+    response = _static_error_response(
+        api, _TOO_MANY_REQUESTS_BODY, HTTPStatus.TOO_MANY_REQUESTS
+    )
+    response["Retry-After"] = str(math.ceil(exc.retry_after_seconds))
+    return response
@@ -1,11 +1,19 @@
 import logging
 from http import HTTPStatus
 
+from django.http import HttpResponse
 from ninja import Router
 from dda.v1.exceptions import UnauthenticatedError
+from dda.v1.routes.auth_policy import AuthPolicy
+from dda.v1.routes.auth_policy import auth_policy
+from dda.v1.routes.etag import get_user_etag
+from dda.v1.routes.etag import is_not_modified
+from dda.v1.routes.etag import not_modified
 from dda.v1.routes.http import APIResponse
 from dda.v1.routes.http import APIRequest
 from dda.v1.routes.http import EmptyAPIResponse
+from dda.v1.routes.rate_limit import rate_limited
+from dda.v1.routes.renderers import render_response
 from dda.v1.schemas.authn import GoogleTokenExchangeDto
 from dda.v1.schemas.user import UserDto
 from dda.v1.schemas.user import UserSessionDto
@@ -26,32 +34,39 @@ TOKEN_VALIDATION_FAILED_ERROR_CODE = "TokenValidationFailed"
     path="/google",
     response={201: APIResponse[UserSessionDto]},
     summary="From a Google OAuth ID Token, create or refresh a user session.",
+    openapi_extra=auth_policy(AuthPolicy.NONE),
 )
+@rate_limited("google_login")
 async def login_with_google(
     request: APIRequest, code_input: GoogleTokenExchangeDto
 ) -> tuple[int, APIResponse[UserSessionDto]]:
     session_token = await AuthNService.login_with_google(code_input)
-    logger.info(
-        f"Created session for userId=${session_token.user.id}",
-        extra=request.state.dict(),
-    )
+    logger.info(f"Created session for userId=${session_token.user.id}")
     return HTTPStatus.CREATED, APIResponse(data=UserSessionDto.from_orm(session_token))
 
 
 @authn_router.get(
     by_alias=True,
     path="/me",
-    response=APIResponse[UserDto],
+    response={200: APIResponse[UserDto], 304: None},
     summary="Get the currently authenticated user.",
+    openapi_extra=auth_policy(AuthPolicy.REQUIRED),
 )
-async def get_currently_authenticated_user(request: APIRequest) -> APIResponse[UserDto]:
-    if request.state.user is None:
+@rate_limited("session")
+async def get_currently_authenticated_user(
+    request: APIRequest, response: HttpResponse
+) -> HttpResponse:
+    user = await request.state.auser()
+    if user is None:
         raise UnauthenticatedError()
-    logger.info(
-        "User requested /me, their profile is being returned.",
-        extra=request.state.dict(),
-    )
-    return APIResponse(data=UserDto.from_orm(request.state.user))
+    # The user usually comes from the session cache, so this needs no query, though
+    # the profile and its ETag may then lag behind an update made by another worker.
+    etag = get_user_etag(user)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    logger.info("User requested /me, their profile is being returned.")
+    response["ETag"] = etag
+    return render_response(request, response, APIResponse(data=UserDto.from_orm(user)))
 
 
 @authn_router.delete(
@@ -59,13 +74,16 @@ async def get_currently_authenticated_user(request: APIRequest) -> APIResponse[U
     path="/logout",
     response={202: EmptyAPIResponse},
     summary="Deactivate the currently active user session.",
+    openapi_extra=auth_policy(AuthPolicy.REQUIRED),
 )
+@rate_limited("session")
 async def delete_session(request: APIRequest) -> tuple[int, EmptyAPIResponse]:
-    if request.state.user is None:
+    user = await request.state.auser()
+    if user is None:
         raise UnauthenticatedError()
 
-    deleted_session = await UserService.destroy_current_session(request.state.user)
-    if deleted_session is None:
+    session_was_destroyed = await UserService.destroy_current_session(user)
+    if not session_was_destroyed:
         # This shouldn't happen, considering if we've made it here we've authenticated
         # against a valid session.
         logger.warning("Call indicated to remove a session that does not exist.")
@@ -1,8 +1,13 @@
 import logging
+from http import HTTPStatus
+from typing import Any
 from ninja import Router
+from dda.v1.routes.auth_policy import AuthPolicy
+from dda.v1.routes.auth_policy import auth_policy
 from dda.v1.routes.http import APIResponse
 from dda.v1.routes.http import APIRequest
 from dda.v1.schemas.base import BaseSchema
+from dda.v1.services.readiness import readiness_checker
 
 
 logger = logging.getLogger("dda")
@@ -22,13 +27,53 @@ class HealthDto(BaseSchema):
     status: str
 
 
+class ReadinessDto(HealthDto):
+    """
+    Response for the /health/ready probe
+
+    Attributes:
+        status (str): Is the server ready to serve requests?
+        checks (dict[str, str]): Whether each dependency is up or down.
+    """
+
+    checks: dict[str, str]
+
+
 @health_router.get(
     by_alias=True,
     path="/full",
     response=APIResponse[HealthDto],
     summary="Retrieves an indicator of system health.",
+    openapi_extra=auth_policy(AuthPolicy.NONE),
 )
 async def get_app_health(request: APIRequest) -> APIResponse[HealthDto]:
     """A simple health check to ensure the server is alive"""
-    logger.info("Reporting status UP for health check.", extra=request.state.dict())
+    logger.info("Reporting status UP for health check.")
     return APIResponse(data=HealthDto(status="up"))
+
+
+# The probes below are answered by dda.probes.ProbeApplication, ahead of Django, so
+# that orchestrators can poll them often without each poll going through every
+# middleware or being logged.
+
+
+async def get_liveness() -> tuple[HTTPStatus, dict[str, Any]]:
+    """Liveness probe, up as long as the server can respond at all."""
+    return HTTPStatus.OK, APIResponse(data=HealthDto(status="up")).model_dump(
+        by_alias=True
+    )
+
+
+async def get_readiness() -> tuple[HTTPStatus, dict[str, Any]]:
+    """Readiness probe, up once the database and Google's certificates are available."""
+    report = await readiness_checker.check()
+    checks = {name: "up" if ok else "down" for name, ok in report.checks.items()}
+    if report.is_ready:
+        return HTTPStatus.OK, APIResponse(
+            data=ReadinessDto(status="up", checks=checks)
+        ).model_dump(by_alias=True)
+    failing_checks = ", ".join(name for name, ok in report.checks.items() if not ok)
+    return HTTPStatus.SERVICE_UNAVAILABLE, APIResponse(
+        error_code="ServiceNotReady",
+        error_message=f"Dependencies are unavailable: {failing_checks}",
+    ).model_dump(by_alias=True)
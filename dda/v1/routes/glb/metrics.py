@@ -0,0 +1,26 @@
+import hmac
+from django.conf import settings
+from django.http import HttpResponse
+from ninja import Router
+from dda.v1.exceptions import NotFoundError
+from dda.v1.routes.http import APIRequest
+from dda.v1.services.metrics import render_metrics
+
+
+metrics_router = Router(tags=["metrics"])
+
+
+@metrics_router.get(path="", include_in_schema=False)
+async def get_metrics(request: APIRequest) -> HttpResponse:
+    """
+    Metrics in the Prometheus text format, for scraping from inside the cluster.
+    Only served when METRICS_TOKEN is set, and to callers presenting it in the
+    X-DDA-Metrics-Token header, looking like any other unknown route otherwise.
+    """
+    presented_token = request.headers.get("X-DDA-Metrics-Token", "")
+    if not settings.METRICS_TOKEN or not hmac.compare_digest(
+        presented_token, settings.METRICS_TOKEN
+    ):
+        raise NotFoundError(resource_name="Route", resource_id=request.path)
+    content, content_type = render_metrics()
+    return HttpResponse(content, content_type=content_type)
@@ -1,15 +1,13 @@
 import uuid
+from typing import Awaitable
+from typing import Callable
 from typing import Generic
 from typing import TypeAlias
 from typing import TypeVar
 from django.http import HttpRequest
-from ninja import Field
-from ninja import Schema
-from pydantic import computed_field
-from pydantic import ConfigDict
 from dda.v1.models.user import User
-from dda.v1.models.user import UserId
 from dda.v1.schemas.base import BaseSchema
+from dda.v1.services.identity_map import IdentityMap
 
 
 T = TypeVar("T")
@@ -60,29 +58,53 @@ class EmptyAPIResponse(APIResponse[object]):
 
 
 TransactionId: TypeAlias = uuid.UUID
+UserLoader: TypeAlias = Callable[[], Awaitable[User | None]]
 
 
-class APIRequestState(Schema):
+class APIRequestState:
     """
     A class that represents additional state to be tagged onto
-    a request before the actual handler has completed.
+    a request before the actual handler has completed. It is a plain
+    slotted class rather than a schema, as one is built for every request.
+
+    The authenticated user is only available through `auser`, which loads it.
 
     Attributes:
         tid (TransactionId): A unique UUID for the request.
-        user (User): The user currently authenticated, if there is one.
+        identity_map (IdentityMap): Model instances already loaded during the request.
     """
 
-    tid: TransactionId | None = None
-    user: User | None = Field(default=None, exclude=True)
-
-    @property
-    @computed_field
-    def user_id(self) -> UserId | None:
-        if self.user is not None:
-            return self.user.id
-        return None
-
-    model_config = ConfigDict(arbitrary_types_allowed=True)
+    __slots__ = ("tid", "identity_map", "_user", "_load_user", "_is_user_loaded")
+
+    def __init__(self, tid: TransactionId | None = None):
+        self.tid = tid
+        self.identity_map = IdentityMap()
+        self._user: User | None = None
+        self._load_user: UserLoader | None = None
+        self._is_user_loaded = False
+
+    def defer_user(self, load_user: UserLoader) -> None:
+        """
+        Set how to load the authenticated user, which is put off until `auser`
+        is first called, so requests that never need the user never load it.
+
+        Args:
+            load_user (UserLoader): Loads the authenticated user, or None if there isn't one.
+        """
+        self._load_user = load_user
+
+    async def auser(self) -> User | None:
+        """
+        Get the authenticated user, loading it the first time it's needed.
+
+        Returns:
+            The authenticated user, or None if the request is unauthenticated.
+        """
+        if not self._is_user_loaded:
+            self._is_user_loaded = True
+            if self._load_user is not None:
+                self._user = await self._load_user()
+        return self._user
 
 
 class APIRequest(HttpRequest):
@@ -1,9 +1,15 @@
 import logging
-from asgiref.sync import sync_to_async
+from functools import partial
 from django.http import HttpRequest
 from django.http import HttpResponse
 from django.utils.decorators import sync_and_async_middleware
+from dda.log import bind_log_user
+from dda.v1.models.user import User
+from dda.v1.routes.auth_policy import AuthPolicy
+from dda.v1.routes.auth_policy import RouteAuthPolicies
 from dda.v1.routes.http import APIRequest
+from dda.v1.routes.http import APIRequestState
+from dda.v1.routes.middleware.tracing import traced_middleware
 from dda.v1.routes.middleware.types import ResponseProcessor
 from dda.v1.services.user import UserService
 
@@ -11,29 +17,63 @@ from dda.v1.services.user import UserService
 logger = logging.getLogger("dda")
 
 
+# Routes that don't declare a policy may use a user, but don't need one.
+_DEFAULT_AUTH_POLICY = AuthPolicy.OPTIONAL
+
+
+def _get_route_auth_policies() -> RouteAuthPolicies:
+    # Imported here, as the API imports every route, which must not be
+    # imported before Django is set up.
+    from dda.v1.routes.api import dda_api
+
+    return RouteAuthPolicies.from_openapi_schema(
+        dda_api.get_openapi_schema(), _DEFAULT_AUTH_POLICY
+    )
+
+
+def _get_bearer_token(authorization_header: str) -> str | None:
+    bearer_values = authorization_header.split()
+    if len(bearer_values) == 2 and bearer_values[0] == "Bearer":
+        return bearer_values[-1]
+    return None
+
+
+async def _load_session_user(state: APIRequestState, token: str) -> User | None:
+    session = await UserService.get_current_session_user(token)
+    if session is None:
+        logger.warning(
+            "No valid session was found for token, Treating request as unauthenticated."
+        )
+        return None
+    user: User = session.user
+    state.identity_map.add(user)
+    bind_log_user(user.id)
+    return user
+
+
 @sync_and_async_middleware
+@traced_middleware
 def authentication_middleware(
     get_response: ResponseProcessor[HttpRequest],
 ) -> ResponseProcessor[APIRequest]:
-    """Middleware to intercept authentication information and inform the request if none can be found"""
+    """
+    Middleware to read the session token from the Authorization header, for routes
+    that use the authenticated user. The session is only looked up once the route
+    asks for the user with `request.state.auser()`.
+    """
+    route_auth_policies = _get_route_auth_policies()
 
     async def middleware(request: APIRequest) -> HttpResponse:
-        authorization_header = request.headers.get("Authorization", "")
-        bearer_values = authorization_header.split()
-        if len(bearer_values) == 2 and bearer_values[0] == "Bearer":
-            token = bearer_values[-1]
-            session = await UserService.get_current_session_user(token)
-            if session is not None:
-                request.state.user = await sync_to_async(lambda: session.user)()
-            else:
-                logger.warning(
-                    "No valid session was found for token, Treating request as unauthenticated.",
-                    extra=request.state.dict(),
-                )
-        else:
+        policy = route_auth_policies.get(str(request.method), request.path_info)
+        if policy == AuthPolicy.NONE:
+            return await get_response(request)
+
+        token = _get_bearer_token(request.headers.get("Authorization", ""))
+        if token is not None:
+            request.state.defer_user(partial(_load_session_user, request.state, token))
+        elif policy == AuthPolicy.REQUIRED:
             logger.warning(
-                "Authorization header was invalid or mis-formatted. Treating request as unauthenticated.",
-                extra=request.state.dict(),
+                "Authorization header was invalid or mis-formatted. Treating request as unauthenticated."
             )
         return await get_response(request)
 
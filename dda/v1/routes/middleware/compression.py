@@ -0,0 +1,180 @@
+import gzip
+import zlib
+from http import HTTPStatus
+from typing import AsyncIterator
+from typing import Callable
+from typing import Iterator
+import brotli
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpRequest
+from django.http import HttpResponse
+from django.http import StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.decorators import sync_and_async_middleware
+from dda.v1.routes.content_encoding import BROTLI
+from dda.v1.routes.content_encoding import SUPPORTED_ENCODINGS
+from dda.v1.routes.content_encoding import get_encoded_etag
+from dda.v1.routes.middleware.tracing import traced_middleware
+from dda.v1.routes.middleware.types import ResponseProcessor
+
+
+def negotiate_encoding(accept_encoding: str) -> str | None:
+    """
+    Pick the encoding to compress a response with, from the Accept-Encoding header.
+
+    Args:
+        accept_encoding (str): The request's Accept-Encoding header.
+
+    Returns:
+        The supported encoding the client prefers, or None if it accepts neither.
+    """
+    qualities: dict[str, float] = {}
+    for entry in accept_encoding.split(","):
+        coding, *parameters = (part.strip() for part in entry.split(";"))
+        quality = 1.0
+        for parameter in parameters:
+            name, _, value = parameter.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding:
+            qualities[coding.lower()] = quality
+
+    wildcard_quality = qualities.get("*", 0.0)
+    best_encoding, best_quality = None, 0.0
+    for encoding in SUPPORTED_ENCODINGS:
+        quality = qualities.get(encoding, wildcard_quality)
+        if quality > best_quality:
+            best_encoding, best_quality = encoding, quality
+    return best_encoding
+
+
+class _StreamCompressor:
+    """
+    Compresses a stream chunk by chunk, flushing after each chunk so that the client
+    receives each one as soon as it's produced, rather than once enough has built up.
+    """
+
+    def __init__(self, encoding: str):
+        self._encoding = encoding
+        if encoding == BROTLI:
+            self._brotli = brotli.Compressor(
+                quality=settings.COMPRESSION_BROTLI_QUALITY
+            )
+        else:
+            self._gzip = zlib.compressobj(
+                settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+            )
+
+    def compress(self, chunk: bytes) -> bytes:
+        if self._encoding == BROTLI:
+            return bytes(self._brotli.process(chunk) + self._brotli.flush())
+        return self._gzip.compress(chunk) + self._gzip.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self._encoding == BROTLI:
+            return bytes(self._brotli.finish())
+        return self._gzip.flush()
+
+
+def _compress(encoding: str, content: bytes) -> bytes:
+    if encoding == BROTLI:
+        return bytes(
+            brotli.compress(content, quality=settings.COMPRESSION_BROTLI_QUALITY)
+        )
+    return gzip.compress(
+        content, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0
+    )
+
+
+async def _run_off_loop(compress: Callable[[bytes], bytes], content: bytes) -> bytes:
+    # zlib and brotli release the GIL, so large bodies are compressed on a worker
+    # thread while the event loop keeps serving other requests.
+    if len(content) >= settings.COMPRESSION_THREAD_MIN_BYTES:
+        return await sync_to_async(compress, thread_sensitive=False)(content)
+    return compress(content)
+
+
+async def _compress_async_stream(
+    chunks: AsyncIterator[bytes], compressor: _StreamCompressor
+) -> AsyncIterator[bytes]:
+    async for chunk in chunks:
+        compressed_chunk = await _run_off_loop(compressor.compress, chunk)
+        if compressed_chunk:
+            yield compressed_chunk
+    yield compressor.finish()
+
+
+def _compress_stream(
+    chunks: Iterator[bytes], compressor: _StreamCompressor
+) -> Iterator[bytes]:
+    for chunk in chunks:
+        compressed_chunk = compressor.compress(chunk)
+        if compressed_chunk:
+            yield compressed_chunk
+    yield compressor.finish()
+
+
+def _is_compressible(response: HttpResponse | StreamingHttpResponse) -> bool:
+    if response.has_header("Content-Encoding"):
+        return False
+    # Errors are small, and empty responses have nothing to compress.
+    status = response.status_code
+    if status >= HTTPStatus.MULTIPLE_CHOICES or status == HTTPStatus.NO_CONTENT:
+        return False
+    if response.streaming:
+        return True
+    return len(response.content) >= settings.COMPRESSION_MIN_BYTES
+
+
+@sync_and_async_middleware
+@traced_middleware
+def compression_middleware(
+    get_response: ResponseProcessor[HttpRequest],
+) -> ResponseProcessor[HttpRequest]:
+    """
+    Middleware to compress successful responses of at least COMPRESSION_MIN_BYTES,
+    with brotli or gzip as negotiated from the Accept-Encoding header. Streaming
+    responses are compressed chunk by chunk as they are streamed.
+    """
+
+    async def middleware(request: HttpRequest) -> HttpResponse:
+        response = await get_response(request)
+        if not _is_compressible(response):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = negotiate_encoding(request.headers.get("Accept-Encoding", ""))
+        if encoding is None:
+            return response
+
+        if isinstance(response, StreamingHttpResponse):
+            compressor = _StreamCompressor(encoding)
+            if response.is_async:
+                response.streaming_content = _compress_async_stream(
+                    response.streaming_content, compressor
+                )
+            else:
+                response.streaming_content = _compress_stream(
+                    response.streaming_content, compressor
+                )
+            del response.headers["Content-Length"]
+        else:
+            compressed_content = await _run_off_loop(
+                lambda content: _compress(encoding, content), response.content
+            )
+            if len(compressed_content) >= len(response.content):
+                return response
+            response.content = compressed_content
+            response.headers["Content-Length"] = str(len(compressed_content))
+
+        etag = response.get("ETag")
+        if etag:
+            response.headers["ETag"] = get_encoded_etag(etag, encoding)
+        response.headers["Content-Encoding"] = encoding
+        return response
+
+    return middleware
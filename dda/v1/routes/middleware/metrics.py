@@ -0,0 +1,44 @@
+import time
+from django.http import HttpRequest
+from django.http import HttpResponse
+from django.utils.decorators import sync_and_async_middleware
+from dda.v1.routes.middleware.tracing import traced_middleware
+from dda.v1.routes.middleware.types import ResponseProcessor
+from dda.v1.services.metrics import DB_QUERIES_PER_REQUEST
+from dda.v1.services.metrics import REQUEST_LATENCY_SECONDS
+from dda.v1.services.metrics import REQUESTS_IN_FLIGHT
+from dda.v1.services.metrics import RESPONSES_TOTAL
+from dda.v1.services.query_stats import start_request_query_stats
+
+
+# Label for requests that didn't match a route, to keep the label set bounded.
+_UNMATCHED_ROUTE = "unmatched"
+
+
+@sync_and_async_middleware
+@traced_middleware
+def metrics_middleware(
+    get_response: ResponseProcessor[HttpRequest],
+) -> ResponseProcessor[HttpRequest]:
+    """Middleware to record request latency, status codes and query counts per route."""
+
+    async def middleware(request: HttpRequest) -> HttpResponse:
+        query_stats = start_request_query_stats()
+        REQUESTS_IN_FLIGHT.inc()
+        start_time_ns = time.perf_counter_ns()
+        try:
+            response = await get_response(request)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+        elapsed_seconds = (time.perf_counter_ns() - start_time_ns) / 1e9
+
+        # Labelled by route pattern rather than path, so that IDs in the
+        # path don't create a new series per resource.
+        resolver_match = request.resolver_match
+        route = resolver_match.route if resolver_match is not None else _UNMATCHED_ROUTE
+        REQUEST_LATENCY_SECONDS.labels(request.method, route).observe(elapsed_seconds)
+        RESPONSES_TOTAL.labels(request.method, route, response.status_code).inc()
+        DB_QUERIES_PER_REQUEST.labels(request.method, route).observe(query_stats.count)
+        return response
+
+    return middleware
@@ -0,0 +1,45 @@
+import logging
+from django.conf import settings
+from django.http import HttpRequest
+from django.http import HttpResponse
+from django.utils.decorators import sync_and_async_middleware
+from dda.v1.routes.middleware.tracing import traced_middleware
+from dda.v1.routes.middleware.types import ResponseProcessor
+from dda.v1.services.query_stats import profile_request_queries
+
+
+logger = logging.getLogger("dda")
+
+
+@sync_and_async_middleware
+@traced_middleware
+def query_profiling_middleware(
+    get_response: ResponseProcessor[HttpRequest],
+) -> ResponseProcessor[HttpRequest]:
+    """
+    Middleware to report the queries each request made and the time spent on them,
+    and to warn when the same statement is repeated, which usually means an N+1 query.
+    """
+
+    async def middleware(request: HttpRequest) -> HttpResponse:
+        query_stats = profile_request_queries()
+        response = await get_response(request)
+
+        db_ms = round(query_stats.duration_ms, 2)
+        logger.info(
+            f"Executed {query_stats.count} queries in {db_ms}ms",
+            extra={"db_queries": query_stats.count, "db_ms": db_ms},
+        )
+        for sql, executions in query_stats.repeated_statements(
+            settings.DB_QUERY_REPEAT_THRESHOLD
+        ):
+            logger.warning(
+                f"Possible N+1 query, statement executed {executions} times",
+                extra={"sql": sql, "executions": executions},
+            )
+
+        response.headers["X-DDA-DB-Queries"] = str(query_stats.count)
+        response.headers["X-DDA-DB-Ms"] = str(db_ms)
+        return response
+
+    return middleware
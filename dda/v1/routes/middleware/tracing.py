@@ -0,0 +1,78 @@
+import functools
+from typing import Callable
+from django.http import HttpRequest
+from django.http import HttpResponse
+from django.utils.decorators import sync_and_async_middleware
+from opentelemetry import propagate
+from opentelemetry import trace
+from dda.v1.routes.middleware.types import ChildRequestType
+from dda.v1.routes.middleware.types import ResponseProcessor
+from dda.v1.services.tracing import tracer
+
+
+MiddlewareFactory = Callable[
+    [ResponseProcessor[HttpRequest]], ResponseProcessor[ChildRequestType]
+]
+
+
+def traced_middleware(
+    factory: MiddlewareFactory[ChildRequestType],
+) -> MiddlewareFactory[ChildRequestType]:
+    """
+    Decorate a middleware to record a span, named after it, around each request
+    it handles, which includes the time spent in every middleware after it.
+
+    Args:
+        factory (MiddlewareFactory): The middleware to trace.
+
+    Returns:
+        The traced middleware.
+    """
+    span_name = factory.__name__
+
+    @functools.wraps(factory)
+    def traced_factory(
+        get_response: ResponseProcessor[HttpRequest],
+    ) -> ResponseProcessor[ChildRequestType]:
+        middleware = factory(get_response)
+
+        async def traced(request: ChildRequestType) -> HttpResponse:
+            with tracer.start_as_current_span(span_name):
+                return await middleware(request)
+
+        return traced
+
+    return traced_factory
+
+
+@sync_and_async_middleware
+def tracing_middleware(
+    get_response: ResponseProcessor[HttpRequest],
+) -> ResponseProcessor[HttpRequest]:
+    """
+    Middleware to record a span for each request, continuing the trace given
+    in the request's traceparent header, if there is one.
+    """
+
+    async def middleware(request: HttpRequest) -> HttpResponse:
+        with tracer.start_as_current_span(
+            str(request.method),
+            context=propagate.extract(request.headers),
+            kind=trace.SpanKind.SERVER,
+            attributes={
+                "http.request.method": str(request.method),
+                "url.path": request.path,
+            },
+        ) as span:
+            response = await get_response(request)
+            # Named by route pattern rather than path, as with metrics.
+            resolver_match = request.resolver_match
+            if resolver_match is not None:
+                span.update_name(f"{request.method} {resolver_match.route}")
+                span.set_attribute("http.route", resolver_match.route)
+            span.set_attribute("http.response.status_code", response.status_code)
+            if response.status_code >= 500:
+                span.set_status(trace.StatusCode.ERROR)
+            return response
+
+    return middleware
@@ -4,31 +4,37 @@ import uuid
 from django.http import HttpRequest
 from django.http import HttpResponse
 from django.utils.decorators import sync_and_async_middleware
+from dda.log import start_log_context
 from dda.v1.routes.http import APIRequest
 from dda.v1.routes.http import APIRequestState
+from dda.v1.routes.middleware.tracing import traced_middleware
 from dda.v1.routes.middleware.types import ResponseProcessor
+from dda.v1.services.tracing import get_current_trace_id
 
 
 logger = logging.getLogger("dda")
 
 
 @sync_and_async_middleware
+@traced_middleware
 def transaction_middleware(
     get_response: ResponseProcessor[HttpRequest],
 ) -> ResponseProcessor[APIRequest]:
     """Middleware to initialize a transaction and time a request."""
 
     async def middleware(request: APIRequest) -> HttpResponse:
-        request.state = APIRequestState(tid=uuid.uuid4())
-        logger.info("REQUEST START", extra=request.state.dict())
+        # Logs share the ID of the request's trace, which may have been continued
+        # from a traceparent header, so that they can be matched to its spans.
+        request.state = APIRequestState(tid=get_current_trace_id() or uuid.uuid4())
+        start_log_context(request.state.tid)
+        logger.info("REQUEST START")
 
-        start_time = time.time()
+        start_time_ns = time.perf_counter_ns()
         response = await get_response(request)
-        end_time = time.time()
+        total_time_ms = round((time.perf_counter_ns() - start_time_ns) / 1e6)
 
-        total_time_ms = round((end_time - start_time) * 1000)
-        logger.info("REQUEST END", extra=request.state.dict())
-        logger.info(f"Total request time {total_time_ms}ms", extra=request.state.dict())
+        logger.info("REQUEST END")
+        logger.info(f"Total request time {total_time_ms}ms")
         response.headers["X-DDA-TID"] = str(request.state.tid)
         return response
 
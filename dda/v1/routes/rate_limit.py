@@ -0,0 +1,67 @@
+import functools
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import TypeVar
+from typing import cast
+from django.conf import settings
+from dda.v1.routes.http import APIRequest
+from dda.v1.services.rate_limit import rate_limiter
+
+
+Handler = TypeVar("Handler", bound=Callable[..., Awaitable[Any]])
+
+
+def get_client_ip(request: APIRequest) -> str:
+    """
+    Get the address of the client that made a request, trusting only the entries
+    of X-Forwarded-For appended by the RATE_LIMIT_NUM_PROXIES proxies in front of
+    the server, as any before them could have been sent by the client.
+
+    Args:
+        request (APIRequest): The request.
+
+    Returns:
+        The client's IP address.
+    """
+    num_proxies = settings.RATE_LIMIT_NUM_PROXIES
+    forwarded_for = request.headers.get("X-Forwarded-For")
+    if num_proxies > 0 and forwarded_for:
+        addresses = [address.strip() for address in forwarded_for.split(",")]
+        return addresses[-min(num_proxies, len(addresses))]
+    return str(request.META.get("REMOTE_ADDR", ""))
+
+
+def rate_limited(scope: str) -> Callable[[Handler], Handler]:
+    """
+    Limit how often each client may call a route, by the scope's limit in RATE_LIMITS.
+    Authenticated users are limited by their user ID, and anyone else by their
+    IP address. This must be applied below the route's decorator.
+
+    Args:
+        scope (str): The scope in RATE_LIMITS that the route is limited by.
+
+    Returns:
+        A decorator for the route's handler, which raises a RateLimitedError
+        once the client has used up its limit.
+    """
+    if scope not in rate_limiter.limits:
+        raise ValueError(f"No rate limit is configured for {scope}.")
+
+    def decorator(handler: Handler) -> Handler:
+        @functools.wraps(handler)
+        async def rate_limited_handler(
+            request: APIRequest, *args: Any, **kwargs: Any
+        ) -> Any:
+            user = await request.state.auser()
+            client = (
+                f"user:{user.id}"
+                if user is not None
+                else f"ip:{get_client_ip(request)}"
+            )
+            await rate_limiter.check(scope, client)
+            return await handler(request, *args, **kwargs)
+
+        return cast(Handler, rate_limited_handler)
+
+    return decorator
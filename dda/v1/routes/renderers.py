@@ -0,0 +1,72 @@
+from typing import Any
+from typing import cast
+import orjson
+from django.http import HttpRequest
+from django.http import HttpResponse
+from ninja.parser import Parser
+from ninja.renderers import BaseRenderer
+from ninja.responses import NinjaJSONEncoder
+from ninja.types import DictStrAny
+from pydantic import BaseModel
+
+
+# Dates are left to Django's encoder, so they're formatted as they always have been
+# (e.g. 2025-01-01T00:00:00.000Z) rather than in orjson's format.
+_ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME
+_fallback_encoder = NinjaJSONEncoder()
+
+
+def _default(o: Any) -> Any:
+    if isinstance(o, BaseModel):
+        return o.model_dump(mode="json", by_alias=True)
+    return _fallback_encoder.default(o)
+
+
+class ORJSONRenderer(BaseRenderer):
+    """
+    Renders responses straight to bytes. Schemas, such as the `APIResponse`s built by
+    exception handlers or passed to `render_response`, are serialized by pydantic's
+    compiled serializer with their camelCase aliases, and anything else, such as the
+    data ninja has already dumped from a route's response schema, is serialized by orjson.
+    """
+
+    media_type = "application/json"
+
+    def render(self, request: HttpRequest, data: Any, *, response_status: int) -> Any:
+        if isinstance(data, BaseModel):
+            return data.__pydantic_serializer__.to_json(data, by_alias=True)
+        return orjson.dumps(data, default=_default, option=_ORJSON_OPTIONS)
+
+
+_renderer = ORJSONRenderer()
+
+
+def render_response(
+    request: HttpRequest, response: HttpResponse, data: BaseModel
+) -> HttpResponse:
+    """
+    Render a route's result into the response ninja passed it, as the API's
+    create_response does for exception handlers. Ninja returns the response as it is,
+    so the result is serialized once, rather than first being validated against the
+    route's response schema and dumped to a dict. Used by the most requested routes,
+    whose results are already instances of their response schema.
+
+    Args:
+        request (HttpRequest): The request.
+        response (HttpResponse): The response ninja passed the route, with its headers.
+        data (BaseModel): The route's result.
+
+    Returns:
+        The response, holding the rendered result.
+    """
+    response.content = _renderer.render(
+        request, data, response_status=response.status_code
+    )
+    return response
+
+
+class ORJSONParser(Parser):
+    """Parses JSON request bodies with orjson."""
+
+    def parse_body(self, request: HttpRequest) -> DictStrAny:
+        return cast(DictStrAny, orjson.loads(request.body))
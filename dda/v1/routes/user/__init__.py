@@ -1,15 +1,23 @@
 import logging
-from typing import cast
+from django.http import HttpResponse
 from ninja import Router
 
 from dda.v1.exceptions import ConflictError
 from dda.v1.exceptions import NotFoundError
+from dda.v1.exceptions import PreconditionFailedError
 from dda.v1.exceptions import UnauthorizedError
 from dda.v1.exceptions import UnauthenticatedError
 from dda.v1.models.user import User
 from dda.v1.models.user import UserId
+from dda.v1.routes.auth_policy import AuthPolicy
+from dda.v1.routes.auth_policy import auth_policy
+from dda.v1.routes.etag import get_if_match_version
+from dda.v1.routes.etag import get_user_etag
+from dda.v1.routes.etag import is_not_modified
+from dda.v1.routes.etag import not_modified
 from dda.v1.routes.http import APIRequest
 from dda.v1.routes.http import APIResponse
+from dda.v1.routes.renderers import render_response
 from dda.v1.schemas.user import UserDto
 from dda.v1.schemas.user import UserUpdateDto
 from dda.v1.services.user import UserService
@@ -30,25 +38,26 @@ def authorize_user_is_me(target_user_id: UserId, request_user: User | None) -> N
 @user_router.get(
     by_alias=True,
     path="/{user_id}",
-    response=APIResponse[UserDto],
+    response={200: APIResponse[UserDto], 304: None},
     summary="Get the a user's profile.",
+    openapi_extra=auth_policy(AuthPolicy.REQUIRED),
 )
 async def get_user_profile(
-    request: APIRequest, user_id: UserId
-) -> APIResponse[UserDto]:
-    authorize_user_is_me(user_id, request.state.user)
-    user = await UserService.get_user_by_id(user_id)
+    request: APIRequest, response: HttpResponse, user_id: UserId
+) -> HttpResponse:
+    authorize_user_is_me(user_id, await request.state.auser())
+    user = await UserService.get_user_by_id(user_id, request.state.identity_map)
     # Meaningless check currently. When users are able to get profiles
     # of other users in their campaigns, then this will be of use.
     if user is None:
-        logger.error(
-            f"User was not found with id {user_id}", extra=request.state.dict()
-        )
+        logger.error(f"User was not found with id {user_id}")
         raise NotFoundError(resource_name="User", resource_id=str(user_id))
-    logger.info(
-        f"User profile for {user_id} was retrieved.", extra=request.state.dict()
-    )
-    return APIResponse(data=UserDto.from_orm(user))
+    etag = get_user_etag(user)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    logger.info(f"User profile for {user_id} was retrieved.")
+    response["ETag"] = etag
+    return render_response(request, response, APIResponse(data=UserDto.from_orm(user)))
 
 
 @user_router.patch(
@@ -56,37 +65,30 @@ async def get_user_profile(
     path="/{user_id}",
     response=APIResponse[UserDto],
     summary="Update a user's profile.",
+    openapi_extra=auth_policy(AuthPolicy.REQUIRED),
 )
 async def update_user_profile(
-    request: APIRequest, user_id: UserId, update_user_dto: UserUpdateDto
-) -> APIResponse[UserDto]:
-    authorize_user_is_me(user_id, request.state.user)
-    user = await UserService.get_user_by_id(user_id)
-    # No need to check if None, we know it is since the only user
-    # that can update a profile is the owner of the profile.
-
-    if update_user_dto.email is not None:
-        existing_user_with_email = await UserService.get_user_by_email(
-            update_user_dto.email
+    request: APIRequest,
+    response: HttpResponse,
+    user_id: UserId,
+    update_user_dto: UserUpdateDto,
+) -> HttpResponse:
+    authorize_user_is_me(user_id, await request.state.auser())
+    expected_version = get_if_match_version(request, user_id)
+    try:
+        updated_user = await UserService.update_user_profile(
+            update_user_dto, user_id, expected_version
         )
-        if existing_user_with_email is not None:
-            logger.error(
-                "Cannot update user due to duplicate email.", extra=request.state.dict()
-            )
-            raise ConflictError(resource_name="User", resource_id=str(user_id))
-
-    if update_user_dto.phone_number is not None:
-        existing_user_with_phone = await UserService.get_user_by_phone(
-            update_user_dto.phone_number
-        )
-        if existing_user_with_phone is not None:
-            logger.error(
-                "Cannot update user due to duplicate phone.", extra=request.state.dict()
-            )
-            raise ConflictError(resource_name="User", resource_id=str(user_id))
-
-    updated_user = await UserService.update_user_profile(
-        update_user_dto, cast(User, user)
+    except ConflictError:
+        logger.error("Cannot update user due to duplicate email or phone.")
+        raise
+    except PreconditionFailedError:
+        logger.error("Cannot update user as it has changed since it was last read.")
+        raise
+    # Later reads in this request see the user as written, not as first loaded.
+    request.state.identity_map.add(updated_user)
+    logger.info("User profile was updated.")
+    response["ETag"] = get_user_etag(updated_user)
+    return render_response(
+        request, response, APIResponse(data=UserDto.from_orm(updated_user))
     )
-    logger.info("User profile was updated.", extra=request.state.dict())
-    return APIResponse(data=UserDto.from_orm(updated_user))
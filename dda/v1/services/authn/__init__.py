@@ -3,6 +3,7 @@ from dda.v1.models.user import SessionToken
 from dda.v1.schemas.authn import GoogleTokenExchangeDto
 from dda.v1.services.authn.google import ExternalGoogleService
 from dda.v1.services.authn.google import IGoogleService
+from dda.v1.services.tracing import traced
 from dda.v1.services.user import UserService
 
 
@@ -14,6 +15,7 @@ class AuthNService:
     """
 
     @staticmethod
+    @traced
     async def login_with_google(
         token_exchange_dto: GoogleTokenExchangeDto,
         fetch_service: IGoogleService = ExternalGoogleService,
@@ -30,9 +32,9 @@ class AuthNService:
         Returns:
             A refreshed user session, if it can be refreshed.
         """
-        # Because the user gets upserted if the token is found to be valid, then
-        # we can get away with not using a transaction if for whatever reason the token
-        # can't be refreshed. This helps to simplify the django async vs sync craziness.
+        # The user and session are each upserted in a single statement. Because the user
+        # is left as-is if it already exists, we can get away with not using a transaction
+        # if for whatever reason the session can't be refreshed.
         id_token = await fetch_service.exchange_auth_token_for_id_token(
             authorization_code=token_exchange_dto.authorization_code,
             code_verifier=token_exchange_dto.code_verifier,
@@ -0,0 +1,129 @@
+import asyncio
+import logging
+import re
+import time
+from typing import cast
+from django.conf import settings
+from dda.v1.services.http_client import http_client
+
+
+logger = logging.getLogger("dda")
+
+
+_MAX_AGE_REGEX = re.compile(r"max-age=(\d+)")
+
+
+class GoogleCertificateStore:
+    """
+    An in-process cache of Google's ID token signing certificates, keyed by
+    key ID (kid). Certificates are held for the max-age Google sends in its
+    Cache-Control header, and refreshed in the background shortly before they
+    expire, so that verifying an ID token doesn't need to make a network call.
+
+    Attributes:
+        certs_url (str): URL returning a mapping of key ID to PEM certificate.
+        refresh_margin_seconds (int): How long before expiry a background refresh starts.
+        min_refresh_interval_seconds (int): Minimum time between refreshes triggered by
+                                            an unknown key ID, to avoid refetching the
+                                            certificates for every bad token.
+        default_max_age_seconds (int): How long to hold the certificates for if the
+                                       response doesn't specify a max-age.
+    """
+
+    def __init__(
+        self,
+        certs_url: str,
+        refresh_margin_seconds: int,
+        min_refresh_interval_seconds: int,
+        default_max_age_seconds: int,
+    ):
+        self.certs_url = certs_url
+        self.refresh_margin_seconds = refresh_margin_seconds
+        self.min_refresh_interval_seconds = min_refresh_interval_seconds
+        self.default_max_age_seconds = default_max_age_seconds
+        self._certs: dict[str, str] = {}
+        self._expires_at = 0.0
+        self._last_refreshed_at: float | None = None
+        self._refresh_task: asyncio.Task[None] | None = None
+
+    @property
+    def is_fresh(self) -> bool:
+        """True if certificates are loaded and have not yet expired."""
+        return bool(self._certs) and time.monotonic() < self._expires_at
+
+    async def get_certs(self, key_id: str | None) -> dict[str, str]:
+        """
+        Get the current signing certificates, making sure the given key ID is
+        present if it can be. Only fetches the certificates if they have expired or
+        the key ID is unknown, otherwise a background refresh is started if
+        they are about to expire.
+
+        Args:
+            key_id (str): The key ID from the header of the token to be verified.
+
+        Returns:
+            A mapping of key ID to PEM certificate.
+        """
+        current_time = time.monotonic()
+        if not self.is_fresh:
+            await self.refresh()
+        elif key_id is not None and key_id not in self._certs:
+            # Google may have rotated its keys before our copy expired.
+            if (
+                self._last_refreshed_at is None
+                or current_time - self._last_refreshed_at
+                >= self.min_refresh_interval_seconds
+            ):
+                await self.refresh()
+        elif current_time >= self._expires_at - self.refresh_margin_seconds:
+            self._refresh_in_background()
+        return self._certs
+
+    async def refresh(self) -> None:
+        """
+        Fetch the certificates, sharing one fetch between concurrent callers.
+        """
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.get_running_loop().create_task(self._fetch())
+        await asyncio.shield(self._refresh_task)
+
+    def clear(self) -> None:
+        """Drop all cached certificates."""
+        self._certs = {}
+        self._expires_at = 0.0
+        self._last_refreshed_at = None
+
+    def _refresh_in_background(self) -> None:
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        self._refresh_task = asyncio.get_running_loop().create_task(self._fetch())
+        self._refresh_task.add_done_callback(_log_background_refresh_failure)
+
+    async def _fetch(self) -> None:
+        response = await http_client.request("GET", self.certs_url)
+        response.raise_for_status()
+        max_age_match = _MAX_AGE_REGEX.search(response.headers.get("Cache-Control", ""))
+        max_age = (
+            int(max_age_match.group(1))
+            if max_age_match is not None
+            else self.default_max_age_seconds
+        )
+        self._certs = cast(dict[str, str], response.json())
+        self._last_refreshed_at = time.monotonic()
+        self._expires_at = self._last_refreshed_at + max_age
+        logger.debug(
+            f"Refreshed {len(self._certs)} Google certificates for {max_age}s."
+        )
+
+
+def _log_background_refresh_failure(task: asyncio.Task[None]) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(f"Failed to refresh Google certificates: {task.exception()}")
+
+
+google_certificate_store = GoogleCertificateStore(
+    certs_url=settings.GOOGLE_CERTS_URL,
+    refresh_margin_seconds=settings.GOOGLE_CERTS_REFRESH_MARGIN_SECONDS,
+    min_refresh_interval_seconds=settings.GOOGLE_CERTS_MIN_REFRESH_INTERVAL_SECONDS,
+    default_max_age_seconds=settings.GOOGLE_CERTS_DEFAULT_MAX_AGE_SECONDS,
+)
@@ -0,0 +1,143 @@
+import asyncio
+import logging
+from typing import Any
+import httpx
+from django.conf import settings
+from opentelemetry import trace
+from dda.v1.services.tracing import tracer
+
+
+logger = logging.getLogger("dda")
+
+
+_RETRYABLE_STATUS_CODES = frozenset({500, 502, 503, 504})
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+# Errors raised before the request was sent, which are safe to retry for any method.
+_UNSENT_REQUEST_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class PooledHTTPClient:
+    """
+    A keep-alive, connection pooled async HTTP client shared across requests
+    for calls to external services, with timeouts and retries with exponential
+    backoff. Idempotent requests are retried on transport errors and transient
+    server errors. Other requests, e.g. a POST of a single-use authorization code,
+    are only retried when they failed before being sent, as the server may have
+    acted on them even if the response was lost.
+
+    The underlying client is created lazily, and is bound to the event loop it was
+    created on. It should be closed with `aclose` when the application shuts down.
+
+    Attributes:
+        timeout_seconds (float): Timeout applied to connecting, reading and writing.
+        max_connections (int): Maximum number of pooled connections.
+        max_retries (int): How many times a failed request is retried.
+        backoff_seconds (float): Delay before the first retry, doubled for each retry after.
+    """
+
+    def __init__(
+        self,
+        timeout_seconds: float,
+        max_connections: int,
+        max_retries: int,
+        backoff_seconds: float,
+    ):
+        self.timeout_seconds = timeout_seconds
+        self.max_connections = max_connections
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self._client: httpx.AsyncClient | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def get_client(self) -> httpx.AsyncClient:
+        """
+        Get the pooled client for the running event loop, creating it if needed.
+
+        Returns:
+            The shared httpx.AsyncClient.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            # Connections can't be shared across event loops, so a client left
+            # over from another loop is dropped rather than reused.
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout_seconds),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+            self._loop = loop
+        return self._client
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """
+        Make a request through the pooled client, retrying failures that are safe
+        to retry for the method with exponential backoff.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The URL to request.
+            **kwargs: Any additional arguments accepted by httpx.AsyncClient.request.
+
+        Returns:
+            The response of the last attempt.
+
+        Raises:
+            httpx.TransportError: If the last attempt failed to get a response.
+        """
+        # One span covers every attempt, so retries show up as the time they add.
+        with tracer.start_as_current_span(
+            f"HTTP {method}",
+            kind=trace.SpanKind.CLIENT,
+            attributes={
+                "http.request.method": method,
+                "server.address": httpx.URL(url).host,
+            },
+        ) as span:
+            response = await self._request_with_retries(method, url, **kwargs)
+            span.set_attribute("http.response.status_code", response.status_code)
+            return response
+
+    async def _request_with_retries(
+        self, method: str, url: str, **kwargs: Any
+    ) -> httpx.Response:
+        client = self.get_client()
+        is_idempotent = method.upper() in _IDEMPOTENT_METHODS
+        retryable_errors = (
+            httpx.TransportError if is_idempotent else _UNSENT_REQUEST_ERRORS
+        )
+        for attempt in range(self.max_retries + 1):
+            is_last_attempt = attempt == self.max_retries
+            try:
+                response = await client.request(method, url, **kwargs)
+                if (
+                    not is_idempotent
+                    or response.status_code not in _RETRYABLE_STATUS_CODES
+                    or is_last_attempt
+                ):
+                    return response
+                logger.debug(
+                    f"Request to {url} failed with status {response.status_code}, retrying."
+                )
+            except retryable_errors as e:
+                if is_last_attempt:
+                    raise
+                logger.debug(f"Request to {url} failed with {e!r}, retrying.")
+            await asyncio.sleep(self.backoff_seconds * (2**attempt))
+        raise AssertionError("Unreachable, the last attempt always returns or raises.")
+
+    async def aclose(self) -> None:
+        """Close the pooled client and all of its connections, if it was created."""
+        if self._client is not None:
+            await self._client.aclose()
+        self._client = None
+        self._loop = None
+
+
+http_client = PooledHTTPClient(
+    timeout_seconds=settings.HTTP_CLIENT_TIMEOUT_SECONDS,
+    max_connections=settings.HTTP_CLIENT_MAX_CONNECTIONS,
+    max_retries=settings.HTTP_CLIENT_MAX_RETRIES,
+    backoff_seconds=settings.HTTP_CLIENT_BACKOFF_SECONDS,
+)
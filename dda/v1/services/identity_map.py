@@ -0,0 +1,54 @@
+from typing import Any
+from typing import TypeVar
+from django.db import models
+
+
+ModelType = TypeVar("ModelType", bound=models.Model)
+
+
+class IdentityMap:
+    """
+    A request-scoped map of model instances already loaded during a request,
+    keyed by model and primary key, so that services can reuse an instance
+    rather than fetch the same row again. It is never shared between requests,
+    so instances in it are only as fresh as the request that loaded them.
+    """
+
+    def __init__(self) -> None:
+        self._instances: dict[tuple[type[models.Model], Any], models.Model] = {}
+
+    def get(self, model: type[ModelType], pk: Any) -> ModelType | None:
+        """
+        Get an instance that has already been loaded.
+
+        Args:
+            model (type[Model]): The model of the instance.
+            pk (Any): The primary key of the instance.
+
+        Returns:
+            The loaded instance, or None if it hasn't been loaded.
+        """
+        instance = self._instances.get((model, pk))
+        return instance if isinstance(instance, model) else None
+
+    def add(self, instance: models.Model) -> None:
+        """
+        Add a loaded instance, replacing any instance of the same row.
+
+        Args:
+            instance (Model): The instance to add.
+        """
+        self._instances[(type(instance), instance.pk)] = instance
+
+    def discard(self, model: type[models.Model], pk: Any) -> None:
+        """
+        Remove an instance, if it has been loaded.
+
+        Args:
+            model (type[Model]): The model of the instance.
+            pk (Any): The primary key of the instance.
+        """
+        self._instances.pop((model, pk), None)
+
+    def __len__(self) -> int:
+        return len(self._instances)
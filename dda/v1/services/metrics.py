@@ -0,0 +1,64 @@
+import os
+from prometheus_client import CONTENT_TYPE_LATEST
+from prometheus_client import REGISTRY
+from prometheus_client import CollectorRegistry
+from prometheus_client import Counter
+from prometheus_client import Gauge
+from prometheus_client import Histogram
+from prometheus_client import generate_latest
+from prometheus_client import multiprocess
+
+
+# Metrics are written to files shared between worker processes when
+# PROMETHEUS_MULTIPROC_DIR is set, and aggregated when they are collected.
+_MULTIPROCESS_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+
+REQUEST_LATENCY_SECONDS = Histogram(
+    "dda_request_duration_seconds",
+    "Time taken to respond to a request, by route.",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+RESPONSES_TOTAL = Counter(
+    "dda_responses_total",
+    "Responses returned, by route and status code.",
+    ["method", "route", "status"],
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "dda_requests_in_flight",
+    "Requests currently being handled.",
+    multiprocess_mode="livesum",
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "dda_db_queries_per_request",
+    "Database queries executed while handling a request, by route.",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21),
+)
+SESSION_CACHE_LOOKUPS_TOTAL = Counter(
+    "dda_session_cache_lookups_total",
+    "Session cache lookups, by whether they were served from the cache.",
+    ["result"],
+)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """
+    Render every metric in the Prometheus text format, aggregated across worker
+    processes if running with more than one.
+
+    Returns:
+        The rendered metrics and their content type.
+    """
+    if os.environ.get(_MULTIPROCESS_DIR_ENV):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)  # type: ignore[no-untyped-call]
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead() -> None:
+    """Drop this process's live gauges, when running with several worker processes."""
+    if os.environ.get(_MULTIPROCESS_DIR_ENV):
+        multiprocess.mark_process_dead(os.getpid())  # type: ignore[no-untyped-call]
@@ -0,0 +1,118 @@
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import Callable
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.backends.signals import connection_created
+
+
+@dataclass
+class RequestQueryStats:
+    """
+    Statistics on the database queries executed on behalf of a single request.
+    Queries are always counted, but are only timed and recorded when profiling.
+
+    Attributes:
+        count (int): Number of queries executed.
+        profile (bool): Whether to time and record each query.
+        duration_ns (int): Time spent executing queries, when profiling.
+        statements (Counter[str]): Times each SQL statement was executed, when profiling.
+    """
+
+    count: int = 0
+    profile: bool = False
+    duration_ns: int = 0
+    statements: Counter[str] = field(default_factory=Counter)
+
+    @property
+    def duration_ms(self) -> float:
+        return self.duration_ns / 1e6
+
+    def repeated_statements(self, threshold: int) -> list[tuple[str, int]]:
+        """
+        Get the statements executed at least `threshold` times, which usually
+        means rows are being fetched one at a time in a loop (an N+1 query).
+
+        Args:
+            threshold (int): The number of executions at which a statement is reported.
+
+        Returns:
+            Each repeated statement with the number of times it was executed, most repeated first.
+        """
+        return [
+            (sql, executions)
+            for sql, executions in self.statements.most_common()
+            if executions >= threshold
+        ]
+
+
+_request_query_stats: ContextVar[RequestQueryStats | None] = ContextVar(
+    "request_query_stats", default=None
+)
+
+
+def start_request_query_stats() -> RequestQueryStats:
+    """
+    Start counting queries for the current request. The ORM runs queries on other
+    threads, which get a copy of the current context, so the same stats object
+    is shared with them and sees every query made on behalf of the request.
+
+    Returns:
+        The stats for the current request, updated as queries are executed.
+    """
+    stats = RequestQueryStats()
+    _request_query_stats.set(stats)
+    return stats
+
+
+def profile_request_queries() -> RequestQueryStats:
+    """
+    Time and record every query for the rest of the current request, as well
+    as counting them. Continues the request's existing stats, if it has any.
+
+    Returns:
+        The stats for the current request, updated as queries are executed.
+    """
+    stats = _request_query_stats.get()
+    if stats is None:
+        stats = start_request_query_stats()
+    stats.profile = True
+    return stats
+
+
+def _record_query(
+    execute: Callable[..., Any],
+    sql: str,
+    params: Any,
+    many: bool,
+    context: dict[str, Any],
+) -> Any:
+    stats = _request_query_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    stats.count += 1
+    if not stats.profile:
+        return execute(sql, params, many, context)
+
+    stats.statements[sql] += 1
+    start_time_ns = time.perf_counter_ns()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.duration_ns += time.perf_counter_ns() - start_time_ns
+
+
+def _install_query_recorder(
+    sender: type[BaseDatabaseWrapper], connection: BaseDatabaseWrapper, **kwargs: Any
+) -> None:
+    # Installed once for the lifetime of each connection, rather than wrapping
+    # every request, which would need a thread hop to reach the ORM's connection.
+    # It goes first, as connection.execute_wrapper() pops the last wrapper on exit.
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _record_query)
+
+
+connection_created.connect(_install_query_recorder)
@@ -0,0 +1,205 @@
+import time
+from abc import ABC
+from abc import abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from dda.env import RateLimitMode
+from dda.v1.exceptions import RateLimitedError
+
+
+_RATE_LIMIT_KEY_PREFIX = "dda:rate-limit"
+_PERIOD_SECONDS = {"second": 1, "minute": 60, "hour": 3600}
+_PROCESS_LOCAL_CACHES = (LocMemCache, DummyCache)
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """
+    A token bucket limit, allowing bursts of up to `capacity` requests, with
+    tokens refilled evenly over time.
+
+    Attributes:
+        capacity (int): The most requests that can be made at once.
+        refill_per_second (float): How many requests are allowed again each second.
+    """
+
+    capacity: int
+    refill_per_second: float
+
+    @staticmethod
+    def parse(rate: str) -> "RateLimit":
+        """
+        Parse a limit of the form "<requests>/<second|minute|hour>", e.g. "10/minute".
+
+        Args:
+            rate (str): The limit to parse.
+
+        Returns:
+            A limit allowing that many requests at once, refilled over the period.
+        """
+        requests, _, period = rate.partition("/")
+        if period not in _PERIOD_SECONDS:
+            raise ValueError(f"Rate limit {rate} must be per second, minute or hour.")
+        capacity = int(requests)
+        return RateLimit(
+            capacity=capacity, refill_per_second=capacity / _PERIOD_SECONDS[period]
+        )
+
+    def take(self, tokens: float, updated_at: float, now: float) -> tuple[float, float]:
+        """
+        Take a token from a bucket, refilling it for the time since it was last updated.
+
+        Args:
+            tokens (float): Tokens left in the bucket when it was last updated.
+            updated_at (float): When the bucket was last updated, in seconds.
+            now (float): The current time, in seconds.
+
+        Returns:
+            The tokens left after taking one, or without taking one if none were left,
+            and how long until a token is next available, which is 0 if one was taken.
+        """
+        tokens = min(
+            self.capacity, tokens + (now - updated_at) * self.refill_per_second
+        )
+        if tokens >= 1:
+            return tokens - 1, 0.0
+        return tokens, (1 - tokens) / self.refill_per_second
+
+
+class RateLimitBackend(ABC):
+    """Holds the token bucket of every key that is being rate limited."""
+
+    @abstractmethod
+    async def take(self, key: str, limit: RateLimit) -> float:
+        """
+        Take a token from a key's bucket.
+
+        Args:
+            key (str): The key of the bucket.
+            limit (RateLimit): The limit the bucket is filled by.
+
+        Returns:
+            0 if a token was taken, otherwise how many seconds until one is available.
+        """
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """
+    Buckets kept per worker process, in an LRU bounded to `max_keys` buckets so
+    that requests from many addresses can't grow it without limit. A bucket that
+    is evicted starts again full.
+
+    Attributes:
+        max_keys (int): The most buckets that will be held.
+    """
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = Lock()
+
+    async def take(self, key: str, limit: RateLimit) -> float:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(key, (limit.capacity, now))
+            tokens, retry_after_seconds = limit.take(tokens, updated_at, now)
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return retry_after_seconds
+
+    def clear(self) -> None:
+        """Drop every bucket."""
+        with self._lock:
+            self._buckets.clear()
+
+
+class CacheRateLimitBackend(RateLimitBackend):
+    """
+    Buckets kept in a Django cache shared by every replica. Buckets are read and
+    written back without a lock, so concurrent requests for the same key may
+    occasionally both be let through, which is accepted to avoid a round trip
+    for locking.
+
+    Attributes:
+        cache_alias (str): The alias of the cache holding the buckets.
+    """
+
+    def __init__(self, cache_alias: str):
+        self.cache_alias = cache_alias
+
+    def is_cache_shared(self) -> bool:
+        """
+        Check whether buckets are kept in a cache shared by every worker and replica,
+        without which each process enforces its own limits.
+
+        Returns:
+            False if the cache is local to this process.
+        """
+        return not isinstance(caches[self.cache_alias], _PROCESS_LOCAL_CACHES)
+
+    async def take(self, key: str, limit: RateLimit) -> float:
+        cache = caches[self.cache_alias]
+        cache_key = f"{_RATE_LIMIT_KEY_PREFIX}:{key}"
+        # Wall clock time, as buckets are shared between hosts.
+        now = time.time()
+        tokens, updated_at = await cache.aget(cache_key, (limit.capacity, now))
+        tokens, retry_after_seconds = limit.take(tokens, updated_at, now)
+        # Kept only until the bucket would have refilled, after which it's full anyway.
+        await cache.aset(
+            cache_key,
+            (tokens, now),
+            timeout=(limit.capacity - tokens) / limit.refill_per_second + 1,
+        )
+        return retry_after_seconds
+
+
+class RateLimiter:
+    """
+    Limits how often each client may call a scope of routes, e.g. the Google
+    login route, with a token bucket for each client in each scope.
+
+    Attributes:
+        backend (RateLimitBackend): Where the buckets are kept.
+        limits (dict[str, RateLimit]): The limit of each scope.
+    """
+
+    def __init__(self, backend: RateLimitBackend, limits: dict[str, RateLimit]):
+        self.backend = backend
+        self.limits = limits
+
+    async def check(self, scope: str, client: str) -> None:
+        """
+        Count a request by a client against a scope's limit.
+
+        Args:
+            scope (str): The scope the request is limited by.
+            client (str): Identifies the client, e.g. by user ID or IP address.
+
+        Raises:
+            RateLimitedError: If the client has used up its limit.
+        """
+        retry_after_seconds = await self.backend.take(
+            f"{scope}:{client}", self.limits[scope]
+        )
+        if retry_after_seconds > 0:
+            raise RateLimitedError(retry_after_seconds)
+
+
+def _build_backend() -> RateLimitBackend:
+    if settings.RATE_LIMIT_MODE == RateLimitMode.CACHE:
+        return CacheRateLimitBackend(settings.RATE_LIMIT_CACHE)
+    return InMemoryRateLimitBackend(max_keys=settings.RATE_LIMIT_MAX_KEYS)
+
+
+rate_limiter = RateLimiter(
+    backend=_build_backend(),
+    limits={
+        scope: RateLimit.parse(rate) for scope, rate in settings.RATE_LIMITS.items()
+    },
+)
@@ -0,0 +1,113 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections
+from dda.v1.db_router import PRIMARY_DATABASE
+from dda.v1.services.authn.google_certs import google_certificate_store
+
+
+logger = logging.getLogger("dda")
+
+
+@dataclass(frozen=True)
+class ReadinessReport:
+    """
+    The result of checking each dependency needed to serve requests.
+
+    Attributes:
+        checks (dict[str, bool]): Whether each dependency, by name, is available.
+    """
+
+    checks: dict[str, bool]
+
+    @property
+    def is_ready(self) -> bool:
+        return all(self.checks.values())
+
+
+def _ping_database() -> None:
+    connection = connections[PRIMARY_DATABASE]
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+    finally:
+        # Returns the connection to the pool, if pooling is enabled.
+        connection.close()
+
+
+async def _check_database() -> bool:
+    try:
+        await sync_to_async(_ping_database, thread_sensitive=False)()
+    except Exception as e:
+        logger.warning(f"Readiness check could not reach the database: {e}")
+        return False
+    return True
+
+
+async def _check_google_certificates() -> bool:
+    if google_certificate_store.is_fresh:
+        return True
+    try:
+        await google_certificate_store.refresh()
+    except Exception as e:
+        logger.warning(f"Readiness check could not load Google certificates: {e}")
+        return False
+    return google_certificate_store.is_fresh
+
+
+class ReadinessChecker:
+    """
+    Checks that the database can be reached and Google's certificates are loaded,
+    holding the result for a few seconds so that frequent probes, from every
+    replica, don't each cost a database round trip. Concurrent checks share one
+    run of the checks.
+
+    Attributes:
+        cache_seconds (float): How long a result is reused for.
+    """
+
+    def __init__(self, cache_seconds: float):
+        self.cache_seconds = cache_seconds
+        self._report: ReadinessReport | None = None
+        self._checked_at = 0.0
+        self._check_task: asyncio.Task[ReadinessReport] | None = None
+
+    async def check(self) -> ReadinessReport:
+        """
+        Get whether the application is ready to serve requests.
+
+        Returns:
+            The most recent report, checking again if it is too old.
+        """
+        if (
+            self._report is not None
+            and time.monotonic() - self._checked_at < self.cache_seconds
+        ):
+            return self._report
+        if self._check_task is None or self._check_task.done():
+            self._check_task = asyncio.get_running_loop().create_task(self._run())
+        return await asyncio.shield(self._check_task)
+
+    def clear(self) -> None:
+        """Drop the cached report."""
+        self._report = None
+        self._checked_at = 0.0
+
+    async def _run(self) -> ReadinessReport:
+        database_ok, google_certificates_ok = await asyncio.gather(
+            _check_database(), _check_google_certificates()
+        )
+        self._report = ReadinessReport(
+            checks={
+                "database": database_ok,
+                "googleCertificates": google_certificates_ok,
+            }
+        )
+        self._checked_at = time.monotonic()
+        return self._report
+
+
+readiness_checker = ReadinessChecker(cache_seconds=settings.HEALTH_CHECK_CACHE_SECONDS)
@@ -0,0 +1,228 @@
+import copy
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from threading import Lock
+from django.conf import settings
+from dda.v1.models.user import SessionToken
+from dda.v1.models.user import User
+from dda.v1.models.user import UserId
+from dda.v1.services.metrics import SESSION_CACHE_LOOKUPS_TOTAL
+
+
+@dataclass(frozen=True)
+class SessionCacheStats:
+    """
+    A point-in-time snapshot of the counters kept by a SessionCache,
+    used to size the cache for a given workload.
+
+    Attributes:
+        hits (int): Lookups that were served from the cache.
+        misses (int): Lookups that had to fall through to the database.
+        evictions (int): Entries dropped to keep the cache within its size bound.
+        size (int): Number of entries currently held.
+        max_size (int): The maximum number of entries the cache will hold.
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    max_size: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total > 0 else 0.0
+
+
+@dataclass
+class _SessionCacheEntry:
+    user: User
+    session_expires_at: datetime
+    evict_at: datetime
+
+
+class SessionCache:
+    """
+    A bounded, TTL-aware LRU cache mapping a session token to a snapshot of
+    the user that owns it. This lives per worker process, and sits in front
+    of the session lookup so that authenticated requests don't need to hit the
+    database on every call.
+
+    Entries are evicted at the earlier of the session's expiry and the configured
+    TTL, the TTL bounding how long a session removed by another worker may still
+    be honored here.
+
+    When a user is invalidated, e.g. because they were just updated, the time is
+    kept for `replica_lag_seconds`, during which lookups of the user should read
+    from the primary, so that a read replica that hasn't caught up yet doesn't
+    refill the cache with the user as they were before.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: int, replica_lag_seconds: float = 0):
+        self.max_size = max_size
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.replica_lag = timedelta(seconds=replica_lag_seconds)
+        self._entries: OrderedDict[str, _SessionCacheEntry] = OrderedDict()
+        self._tokens_by_user: dict[UserId, str] = {}
+        # Oldest first, as users are moved to the end whenever they're invalidated.
+        self._invalidated_at: OrderedDict[UserId, datetime] = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def is_enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl.total_seconds() > 0
+
+    def get(self, token: str) -> SessionToken | None:
+        """
+        Get the cached session for a token, if it is present and not expired.
+
+        Args:
+            token (str): Token found in the Authorization header.
+
+        Returns:
+            An unsaved SessionToken with its user pre-populated from the cached
+            snapshot, or None if the token is not cached.
+        """
+        if not self.is_enabled:
+            return None
+
+        current_time = datetime.now(tz=timezone.utc)
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is not None and current_time >= entry.evict_at:
+                self._remove(token)
+                entry = None
+            if entry is None:
+                self._misses += 1
+                SESSION_CACHE_LOOKUPS_TOTAL.labels("miss").inc()
+                return None
+            self._entries.move_to_end(token)
+            self._hits += 1
+            SESSION_CACHE_LOOKUPS_TOTAL.labels("hit").inc()
+            # Hand out copies, so callers mutating the user can't corrupt the cache.
+            user = copy.copy(entry.user)
+        return SessionToken(token=token, expires_at=entry.session_expires_at, user=user)
+
+    def put(self, session: SessionToken) -> None:
+        """
+        Cache a session that was just resolved from the database.
+
+        Args:
+            session (SessionToken): A valid session, with its user loaded.
+        """
+        if not self.is_enabled or session.user is None:
+            return
+
+        evict_at = min(session.expires_at, datetime.now(tz=timezone.utc) + self.ttl)
+        entry = _SessionCacheEntry(
+            user=copy.copy(session.user),
+            session_expires_at=session.expires_at,
+            evict_at=evict_at,
+        )
+        with self._lock:
+            previous_token = self._tokens_by_user.get(session.user.id)
+            if previous_token is not None and previous_token != session.token:
+                self._remove(previous_token)
+            self._entries[session.token] = entry
+            self._entries.move_to_end(session.token)
+            self._tokens_by_user[session.user.id] = session.token
+            while len(self._entries) > self.max_size:
+                oldest_token = next(iter(self._entries))
+                self._remove(oldest_token)
+                self._evictions += 1
+
+    def invalidate_token(self, token: str) -> None:
+        """
+        Remove a token from the cache, if present.
+
+        Args:
+            token (str): The token to remove.
+        """
+        with self._lock:
+            self._remove(token)
+
+    def invalidate_user(self, user_id: UserId) -> None:
+        """
+        Remove any cached session belonging to a user, so that the next lookup
+        reflects the latest state of both the session and the user.
+
+        Args:
+            user_id (UserId): The user whose cached session should be removed.
+        """
+        current_time = datetime.now(tz=timezone.utc)
+        with self._lock:
+            token = self._tokens_by_user.get(user_id)
+            if token is not None:
+                self._remove(token)
+            if self.replica_lag.total_seconds() > 0:
+                self._invalidated_at[user_id] = current_time
+                self._invalidated_at.move_to_end(user_id)
+                self._forget_invalidations_before(current_time - self.replica_lag)
+
+    def is_recently_invalidated(self, user_id: UserId) -> bool:
+        """
+        Check whether a user was invalidated within the last `replica_lag_seconds`,
+        in which case a read replica may still hold the user as they were before.
+
+        Args:
+            user_id (UserId): The user to check.
+
+        Returns:
+            True if the user should be read from the primary.
+        """
+        current_time = datetime.now(tz=timezone.utc)
+        with self._lock:
+            self._forget_invalidations_before(current_time - self.replica_lag)
+            return user_id in self._invalidated_at
+
+    def clear(self) -> None:
+        """Remove all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._tokens_by_user.clear()
+            self._invalidated_at.clear()
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    def stats(self) -> SessionCacheStats:
+        """
+        Get the current hit/miss counters for the cache.
+
+        Returns:
+            A snapshot of the cache counters.
+        """
+        with self._lock:
+            return SessionCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=len(self._entries),
+                max_size=self.max_size,
+            )
+
+    def _forget_invalidations_before(self, cutoff: datetime) -> None:
+        while self._invalidated_at:
+            user_id, invalidated_at = next(iter(self._invalidated_at.items()))
+            if invalidated_at > cutoff:
+                return
+            del self._invalidated_at[user_id]
+
+    def _remove(self, token: str) -> None:
+        entry = self._entries.pop(token, None)
+        if entry is not None and self._tokens_by_user.get(entry.user.id) == token:
+            del self._tokens_by_user[entry.user.id]
+
+
+session_cache = SessionCache(
+    max_size=settings.SESSION_CACHE_MAX_SIZE,
+    ttl_seconds=settings.SESSION_CACHE_TTL_SECONDS,
+    replica_lag_seconds=settings.DB_REPLICA_MAX_LAG_SECONDS,
+)
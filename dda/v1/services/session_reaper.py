@@ -0,0 +1,82 @@
+import asyncio
+import logging
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from dda.v1.services.user import UserService
+
+
+logger = logging.getLogger("dda")
+
+
+class SessionReaper:
+    """
+    An optional in-process periodic task that removes expired sessions from
+    the database, keeping that write off of the request path.
+
+    Attributes:
+        interval_seconds (int): How often to sweep for expired sessions. The reaper
+                                is disabled if this is not positive.
+        batch_size (int): The maximum number of sessions to delete per statement.
+    """
+
+    def __init__(self, interval_seconds: int, batch_size: int):
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def is_enabled(self) -> bool:
+        return self.interval_seconds > 0
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def ensure_started(self) -> None:
+        """Start the reaper on the running event loop, if enabled and not already running."""
+        if not self.is_enabled or self.is_running:
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the reaper, waiting for any in-progress sweep to be cancelled."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def reap(self) -> int:
+        """
+        Run a single sweep of expired sessions.
+
+        Returns:
+            The number of sessions deleted.
+        """
+        try:
+            deleted = await UserService.delete_expired_sessions(self.batch_size)
+        finally:
+            # This runs outside of any request, so nothing else will
+            # recycle a broken or stale connection for us.
+            await sync_to_async(close_old_connections)()
+        if deleted > 0:
+            logger.info(f"Reaped {deleted} expired sessions.")
+        return deleted
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.reap()
+            except Exception as e:
+                logger.error(f"Failed to reap expired sessions: {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+
+session_reaper = SessionReaper(
+    interval_seconds=settings.SESSION_REAPER_INTERVAL_SECONDS,
+    batch_size=settings.SESSION_REAPER_BATCH_SIZE,
+)
@@ -0,0 +1,149 @@
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from datetime import timezone
+from django.conf import settings
+from django.core import signing
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from dda.v1.models.user import SessionToken
+from dda.v1.models.user import User
+from dda.v1.models.user import UserId
+
+
+_SIGNED_TOKEN_PREFIX = "st-"
+_SIGNED_TOKEN_SALT = "dda.v1.session"
+_REVOCATION_KEY_PREFIX = "dda:session:revoked-before"
+# Backends whose entries are only seen by the process that set them.
+_PROCESS_LOCAL_CACHES = (LocMemCache, DummyCache)
+
+
+@dataclass(frozen=True)
+class SignedSessionClaims:
+    """
+    The claims carried by a signed session token.
+
+    Attributes:
+        user_id (UserId): The user the session was issued to.
+        issued_at_ns (int): When the token was issued, in nanoseconds since the epoch.
+        expires_at (datetime): The time when this token expires.
+    """
+
+    user_id: UserId
+    issued_at_ns: int
+    expires_at: datetime
+
+    @property
+    def is_expired(self) -> bool:
+        return datetime.now(tz=timezone.utc) >= self.expires_at
+
+
+def _get_signer() -> signing.Signer:
+    # "." keeps the token within the characters allowed in a bearer token.
+    return signing.Signer(salt=_SIGNED_TOKEN_SALT, sep=".", algorithm="sha256")
+
+
+def _get_revocation_key(user_id: UserId) -> str:
+    return f"{_REVOCATION_KEY_PREFIX}:{user_id}"
+
+
+class SignedSessionService:
+    """
+    A service for issuing and validating stateless session tokens. Tokens
+    carry the user ID and expiry and are signed with the SECRET_KEY, so they can be
+    validated without a database lookup. Revocations are tracked per user as a
+    "revoked before" watermark in the configured revocation cache, meaning issuing
+    a new session or logging out invalidates every token issued before it.
+    """
+
+    @staticmethod
+    async def issue(user: User) -> SessionToken:
+        """
+        Issue a new signed session for a user, revoking any session issued before it.
+
+        Args:
+            user (User): The user to issue the session for.
+
+        Returns:
+            An unsaved SessionToken holding the signed token. Signed sessions
+            are never persisted.
+        """
+        issued_at_ns = time.time_ns()
+        session = SessionToken(user=user)
+        claims = {
+            "uid": str(user.id),
+            "iat": issued_at_ns,
+            "exp": int(session.expires_at.timestamp()),
+        }
+        session.token = f"{_SIGNED_TOKEN_PREFIX}{_get_signer().sign_object(claims)}"
+        await SignedSessionService._set_revoked_before(user.id, issued_at_ns)
+        return session
+
+    @staticmethod
+    async def verify(token: str) -> SignedSessionClaims | None:
+        """
+        Verify a signed session token's signature, expiry and revocation status.
+
+        Args:
+            token (str): Token found in the Authorization header.
+
+        Returns:
+            The claims of the token, or None if the token is invalid, expired or revoked.
+        """
+        if not token.startswith(_SIGNED_TOKEN_PREFIX):
+            return None
+        try:
+            raw_claims = _get_signer().unsign_object(
+                token.removeprefix(_SIGNED_TOKEN_PREFIX)
+            )
+            claims = SignedSessionClaims(
+                user_id=uuid.UUID(raw_claims["uid"]),
+                issued_at_ns=int(raw_claims["iat"]),
+                expires_at=datetime.fromtimestamp(raw_claims["exp"], tz=timezone.utc),
+            )
+        except (signing.BadSignature, KeyError, TypeError, ValueError):
+            return None
+        if claims.is_expired:
+            return None
+
+        revoked_before = await caches[settings.SESSION_REVOCATION_CACHE].aget(
+            _get_revocation_key(claims.user_id)
+        )
+        if revoked_before is not None and claims.issued_at_ns < revoked_before:
+            return None
+        return claims
+
+    @staticmethod
+    async def revoke(user_id: UserId) -> None:
+        """
+        Revoke every signed session issued to a user up until now.
+
+        Args:
+            user_id (UserId): The user whose sessions should be revoked.
+        """
+        await SignedSessionService._set_revoked_before(user_id, time.time_ns() + 1)
+
+    @staticmethod
+    def is_revocation_cache_shared() -> bool:
+        """
+        Check whether revocations are kept in a cache shared by every worker and
+        replica, without which a logout is only honored by the worker that handled it.
+
+        Returns:
+            False if SESSION_REVOCATION_CACHE is local to this process.
+        """
+        return not isinstance(
+            caches[settings.SESSION_REVOCATION_CACHE], _PROCESS_LOCAL_CACHES
+        )
+
+    @staticmethod
+    async def _set_revoked_before(user_id: UserId, revoked_before_ns: int) -> None:
+        # Tokens issued before the watermark expire within a session length,
+        # so the revocation doesn't need to outlive that.
+        await caches[settings.SESSION_REVOCATION_CACHE].aset(
+            _get_revocation_key(user_id),
+            revoked_before_ns,
+            timeout=settings.SESSION_LENGTH_MINUTES * 60,
+        )
@@ -0,0 +1,55 @@
+import asyncio
+from typing import Awaitable
+from typing import Callable
+from typing import Generic
+from typing import Hashable
+from typing import TypeVar
+
+
+K = TypeVar("K", bound=Hashable)
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[K, T]):
+    """
+    Coalesces concurrent calls for the same key within a worker, so that only the
+    first call runs and every other caller awaiting it shares its result or error.
+    Once the call completes, the next call for the key runs again, so results are
+    never reused past the calls that overlapped.
+
+    The call runs in its own task, in the context of the first caller, so that a
+    caller being cancelled doesn't cancel it for the others. Each caller gets its
+    own copy of the result, as callers may go on to mutate it.
+
+    Attributes:
+        copy_result (Callable[[T], T]): Copies a result for each caller.
+    """
+
+    def __init__(self, copy_result: Callable[[T], T]):
+        self.copy_result = copy_result
+        self._calls: dict[K, asyncio.Future[T]] = {}
+
+    async def do(self, key: K, call: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run a call, or join the call for the same key if one is already running.
+
+        Args:
+            key (K): Identifies the call, e.g. by what it's looking up.
+            call (Callable[[], Awaitable[T]]): Makes the call, if none is running.
+
+        Returns:
+            A copy of the call's result.
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._calls[key] = task
+            task.add_done_callback(lambda done_task: self._forget(key, done_task))
+        return self.copy_result(await asyncio.shield(task))
+
+    def _forget(self, key: K, task: asyncio.Future[T]) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Marks the error as retrieved, in case every caller was cancelled.
+        if not task.cancelled():
+            task.exception()
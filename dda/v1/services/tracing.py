@@ -0,0 +1,136 @@
+import functools
+import uuid
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import Coroutine
+from typing import ParamSpec
+from typing import TypeVar
+from django.conf import settings
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.backends.signals import connection_created
+from opentelemetry import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor
+from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+from opentelemetry.sdk.trace.export import SpanExporter
+from dda.env import TracingMode
+
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+# Spans are no-ops until configure_tracing installs a tracer provider.
+tracer = trace.get_tracer("dda")
+
+
+def _get_exporter(mode: TracingMode) -> SpanExporter | None:
+    if mode == TracingMode.OTLP:
+        # Only needed when exporting to a collector.
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+            OTLPSpanExporter,
+        )
+
+        return OTLPSpanExporter()
+    if mode == TracingMode.CONSOLE:
+        return ConsoleSpanExporter()
+    return None
+
+
+def configure_tracing(exporter: SpanExporter | None = None) -> None:
+    """
+    Install the tracer provider spans are recorded with. Finished spans are
+    queued and exported in batches from a background thread, so exporting
+    never blocks a request.
+
+    Args:
+        exporter (SpanExporter): Exporter to send spans to, rather than the one for settings.TRACING_MODE.
+    """
+    if exporter is None:
+        exporter = _get_exporter(settings.TRACING_MODE)
+        if exporter is None:
+            return
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": settings.TRACING_SERVICE_NAME})
+    )
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+
+
+def shutdown_tracing() -> None:
+    """Export every span still queued, and stop the exporting thread."""
+    provider = trace.get_tracer_provider()
+    if isinstance(provider, TracerProvider):
+        provider.shutdown()
+
+
+def get_current_trace_id() -> uuid.UUID | None:
+    """
+    Get the ID of the trace currently being recorded, or continued from a
+    traceparent header.
+
+    Returns:
+        The trace ID, as a UUID, or None if there is no current trace.
+    """
+    span_context = trace.get_current_span().get_span_context()
+    if not span_context.is_valid:
+        return None
+    return uuid.UUID(int=span_context.trace_id)
+
+
+def traced(
+    func: Callable[P, Awaitable[R]],
+) -> Callable[P, Coroutine[Any, Any, R]]:
+    """
+    Decorate an async function to record a span, named after it, for each call.
+
+    Args:
+        func (Callable): The async function to trace.
+
+    Returns:
+        The traced function.
+    """
+    span_name = func.__qualname__
+
+    @functools.wraps(func)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+        with tracer.start_as_current_span(span_name):
+            return await func(*args, **kwargs)
+
+    return wrapper
+
+
+def _trace_query(
+    execute: Callable[..., Any],
+    sql: str,
+    params: Any,
+    many: bool,
+    context: dict[str, Any],
+) -> Any:
+    # Queries made outside of a recorded span, or with tracing off, aren't traced.
+    if not trace.get_current_span().is_recording():
+        return execute(sql, params, many, context)
+    connection = context["connection"]
+    with tracer.start_as_current_span(
+        sql.split(" ", 1)[0],
+        kind=trace.SpanKind.CLIENT,
+        attributes={
+            "db.system": connection.vendor,
+            "dda.db.alias": connection.alias,
+            "db.statement": sql,
+        },
+    ):
+        return execute(sql, params, many, context)
+
+
+def _install_query_tracer(
+    sender: type[BaseDatabaseWrapper], connection: BaseDatabaseWrapper, **kwargs: Any
+) -> None:
+    # Like the query recorder, installed once per connection and kept first.
+    if _trace_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _trace_query)
+
+
+connection_created.connect(_install_query_tracer)
@@ -1,9 +1,198 @@
+import copy
+from datetime import datetime
+from datetime import timezone
+from typing import Any
 from typing import cast
+from typing import TypeVar
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import IntegrityError
+from django.db import connections
+from django.db import models
+from django.db import router
+from django.db import transaction
+from dda.env import SessionTokenMode
+from dda.v1.db_router import PRIMARY_DATABASE
+from dda.v1.db_router import is_pinned_to_primary
+from dda.v1.db_router import is_replica_configured
+from dda.v1.db_router import pin_to_primary
+from dda.v1.exceptions import ConflictError
+from dda.v1.exceptions import NotFoundError
+from dda.v1.exceptions import PreconditionFailedError
 from dda.v1.models.user import SessionToken, UserId
 from dda.v1.models.user import User
 from dda.v1.models.user import UserSource
 from dda.v1.schemas.user import UserCreateDto
 from dda.v1.schemas.user import UserUpdateDto
+from dda.v1.services.identity_map import IdentityMap
+from dda.v1.services.session_cache import session_cache
+from dda.v1.services.signed_session import SignedSessionService
+from dda.v1.services.single_flight import SingleFlight
+from dda.v1.services.tracing import traced
+
+
+ModelType = TypeVar("ModelType", bound=models.Model)
+
+
+def _upsert(
+    instance: ModelType, conflict_field: str, update_fields: list[str]
+) -> ModelType:
+    """
+    Insert a model instance, or update the conflicting row if one exists, in a
+    single INSERT ... ON CONFLICT statement. Unlike bulk_create, the full stored
+    row is returned, so existing rows come back as they are in the database.
+
+    Args:
+        instance (Model): An unsaved instance holding the values to insert.
+        conflict_field (str): A uniquely constrained field to detect conflicts on.
+        update_fields (list[str]): Fields to overwrite on conflict. At least one is
+                                   needed for the conflicting row to be returned.
+
+    Returns:
+        A new instance loaded from the inserted or updated row.
+    """
+    model = type(instance)
+    meta = model._meta
+    db = router.db_for_write(model)
+    connection = connections[db]
+    quote_name = connection.ops.quote_name
+
+    fields = meta.concrete_fields
+    columns_by_name = {field.name: cast(str, field.column) for field in fields}
+    columns = ", ".join(quote_name(column) for column in columns_by_name.values())
+    placeholders = ", ".join(["%s"] * len(fields))
+    params = [
+        field.get_db_prep_save(field.pre_save(instance, True), connection)
+        for field in fields
+    ]
+    updates = ", ".join(
+        f"{quote_name(columns_by_name[name])} = EXCLUDED.{quote_name(columns_by_name[name])}"
+        for name in update_fields
+    )
+    sql = (
+        f"INSERT INTO {quote_name(meta.db_table)} ({columns}) VALUES ({placeholders}) "
+        f"ON CONFLICT ({quote_name(columns_by_name[conflict_field])}) "
+        f"DO UPDATE SET {updates} RETURNING {columns}"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        row = cursor.fetchone()
+    return model.from_db(db, [field.attname for field in fields], row)
+
+
+def _update_user_profile(
+    user_id: UserId, values: dict[str, Any], expected_version: int | None
+) -> User | None:
+    """
+    Write the given fields of a user in a single UPDATE ... RETURNING statement, run
+    in a savepoint so that a failing write leaves any surrounding transaction usable.
+    Values are compared against the row as it is in the database, rather than against
+    a previously loaded user that may be stale: the user's version and updated_at only
+    change if a value differs, and a changed email or phone number is unverified.
+
+    Args:
+        user_id (UserId): The ID of the user to update.
+        values (dict[str, Any]): The new values of the fields to write, by field name.
+        expected_version (int): If given, the user is only written if its row is
+                                still at this version.
+
+    Returns:
+        The user as written, or None if its row doesn't exist or wasn't at the
+        expected version.
+    """
+    meta = User._meta
+    db = router.db_for_write(User)
+    connection = connections[db]
+    quote_name = connection.ops.quote_name
+
+    columns_by_name = {
+        field.name: quote_name(cast(str, field.column))
+        for field in meta.concrete_fields
+    }
+    changes = User(id=user_id, **values)
+    fields = [field for field in meta.concrete_fields if field.name in values]
+    values_by_name = {
+        field.name: field.get_db_prep_save(field.pre_save(changes, False), connection)
+        for field in fields
+    }
+    field_values = list(values_by_name.values())
+    assignments = [f"{columns_by_name[field.name]} = %s" for field in fields]
+    params = list(field_values)
+    for contact_field, verified_field in (
+        ("email", "is_email_verified"),
+        ("phone_number", "is_phone_verified"),
+    ):
+        if contact_field in values:
+            assignments.append(
+                f"{columns_by_name[verified_field]} = {columns_by_name[verified_field]} "
+                f"AND {columns_by_name[contact_field]} IS NOT DISTINCT FROM %s"
+            )
+            params.append(values_by_name[contact_field])
+
+    is_changed = (
+        " OR ".join(
+            f"{columns_by_name[field.name]} IS DISTINCT FROM %s" for field in fields
+        )
+        or "FALSE"
+    )
+    updated_at_field = meta.get_field("updated_at")
+    updated_at_column = columns_by_name["updated_at"]
+    version_column = columns_by_name["version"]
+    assignments.append(
+        f"{updated_at_column} = CASE WHEN {is_changed} THEN %s ELSE {updated_at_column} END"
+    )
+    params += [
+        *field_values,
+        updated_at_field.get_db_prep_save(
+            updated_at_field.pre_save(changes, False), connection
+        ),
+    ]
+    assignments.append(
+        f"{version_column} = {version_column} + CASE WHEN {is_changed} THEN 1 ELSE 0 END"
+    )
+    params += field_values
+
+    columns = ", ".join(columns_by_name.values())
+    sql = (
+        f"UPDATE {quote_name(meta.db_table)} SET {', '.join(assignments)} "
+        f"WHERE {columns_by_name[meta.pk.name]} = %s"
+    )
+    params.append(meta.pk.get_db_prep_value(user_id, connection))
+    if expected_version is not None:
+        sql += f" AND {version_column} = %s"
+        params.append(expected_version)
+    sql += f" RETURNING {columns}"
+
+    with transaction.atomic(using=db):
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            row = cursor.fetchone()
+    if row is None:
+        return None
+    return User.from_db(db, [field.attname for field in meta.concrete_fields], row)
+
+
+def _copy_session(session: SessionToken | None) -> SessionToken | None:
+    if session is None:
+        return None
+    session_copy = copy.copy(session)
+    session_copy.user = copy.copy(session.user)
+    return session_copy
+
+
+def _copy_user(user: User | None) -> User | None:
+    return copy.copy(user)
+
+
+# Concurrent lookups of the same session or user share one query. Lookups are also
+# keyed by whether the request is pinned to the primary, so that a request that has
+# written never shares a lookup that read from the replica.
+_session_lookups: SingleFlight[tuple[str, bool], SessionToken | None] = SingleFlight(
+    copy_result=_copy_session
+)
+_user_lookups: SingleFlight[tuple[UserId, bool], User | None] = SingleFlight(
+    copy_result=_copy_user
+)
 
 
 class UserService:
@@ -13,6 +202,7 @@ class UserService:
     """
 
     @staticmethod
+    @traced
     async def get_user_by_email(email: str) -> User | None:
         """
         Get a user by their email, which should be guaranteed to be
@@ -27,6 +217,7 @@ class UserService:
         return await User.objects.filter(email=email).afirst()
 
     @staticmethod
+    @traced
     async def get_user_by_phone(phone_number: str) -> User | None:
         """
         Get a user by their phone number, which should be guaranteed to be
@@ -41,24 +232,48 @@ class UserService:
         return await User.objects.filter(phone_number=phone_number).afirst()
 
     @staticmethod
-    async def get_user_by_id(user_id: UserId) -> User | None:
+    @traced
+    async def get_user_by_id(
+        user_id: UserId, identity_map: IdentityMap | None = None
+    ) -> User | None:
         """
-        Get a user by ID.
+        Get a user by ID, reusing the instance from the request's identity
+        map if the user has already been loaded.
 
         Args:
             user_id (UserId): User ID by which to fetch the user.
+            identity_map (IdentityMap): The current request's identity map, if any.
 
         Returns:
             The requested user, if it exists.
         """
-        return await User.objects.filter(id=user_id).afirst()
+        if identity_map is not None:
+            loaded_user = identity_map.get(User, user_id)
+            if loaded_user is not None:
+                return loaded_user
+
+        # A user updated too recently may not have been replicated yet.
+        read_from_primary = is_pinned_to_primary() or (
+            is_replica_configured() and session_cache.is_recently_invalidated(user_id)
+        )
+        users = User.objects.filter(id=user_id)
+        if read_from_primary:
+            users = users.using(PRIMARY_DATABASE)
+        user = await _user_lookups.do(
+            (user_id, read_from_primary), lambda: users.afirst()
+        )
+        if user is not None and identity_map is not None:
+            identity_map.add(user)
+        return user
 
     @staticmethod
+    @traced
     async def get_or_create_user(
         user_create_dto: UserCreateDto, source: UserSource
     ) -> User:
         """
-        Create a new user, or returns an existing one.
+        Create a new user, or returns an existing one, in a single statement that
+        is safe against concurrent logins for the same email.
 
         Args:
             user_create_dto (UserCreateDto): The creation DTO to feed into the user create.
@@ -67,11 +282,7 @@ class UserService:
         Return:
             The new user that was created, or the existing user if it already existed.
         """
-        existing_user = await UserService.get_user_by_email(user_create_dto.email)
-        if existing_user is not None:
-            return existing_user
-
-        return await User.objects.acreate(
+        new_user = User(
             email=user_create_dto.email,
             family_name=user_create_dto.family_name,
             given_name=user_create_dto.given_name,
@@ -79,64 +290,65 @@ class UserService:
             profile_picture=user_create_dto.profile_picture,
             source=source,
         )
+        # Setting the email to itself leaves an existing user untouched,
+        # while still returning its row.
+        user = await sync_to_async(_upsert)(
+            new_user, conflict_field="email", update_fields=["email"]
+        )
+        pin_to_primary()
+        return user
 
     @staticmethod
-    async def update_user_profile(user_update_dto: UserUpdateDto, user: User) -> User:
+    @traced
+    async def update_user_profile(
+        user_update_dto: UserUpdateDto,
+        user_id: UserId,
+        expected_version: int | None = None,
+    ) -> User:
         """
         Update a user's profile. If email or phone is updated, it will trigger the
-        verification flow for the contact information.
+        verification flow for the contact information. Fields are compared against
+        the user as it is in the database, and uniqueness of the email and phone
+        number is left to their unique constraints, rather than checked beforehand.
+        Every update that changes a field increments the user's version.
 
         Args:
             user_update_dto: DTO object containing user update info.
-            user: User object to update.
+            user_id: ID of the user to update.
+            expected_version: If given, the update is only made if the user is still at this version.
 
         Returns:
-            The updated user object.
+            The updated user, as written to the database.
+
+        Raises:
+            ConflictError: If the new email or phone number belongs to another user.
+            NotFoundError: If the user no longer exists.
+            PreconditionFailedError: If the user is no longer at the expected version.
         """
-        email_has_changed = (
-            user_update_dto.email is not None and user.email != user_update_dto.email
-        )
-        user.is_email_verified = (
-            user.is_email_verified if not email_has_changed else False
-        )
-        user.email = (
-            user.email if user_update_dto.email is None else user_update_dto.email
-        )
-        user.family_name = (
-            user.family_name
-            if user_update_dto.family_name is None
-            else user_update_dto.family_name
-        )
-        user.given_name = (
-            user.given_name
-            if user_update_dto.given_name is None
-            else user_update_dto.given_name
-        )
-        phone_has_changed = (
-            user_update_dto.phone_number is not None
-            and user.phone_number != user_update_dto.phone_number
-        )
-        user.is_phone_verified = (
-            user.is_phone_verified if not phone_has_changed else False
-        )
-        user.phone_number = (
-            user.phone_number
-            if user_update_dto.phone_number is None
-            else user_update_dto.phone_number
-        )
-        user.profile_picture = (
-            user.profile_picture
-            if user_update_dto.profile_picture is None
-            else user_update_dto.profile_picture
-        )
-        await user.asave()
+        try:
+            user = await sync_to_async(_update_user_profile)(
+                user_id, user_update_dto.model_dump(exclude_none=True), expected_version
+            )
+        except IntegrityError:
+            raise ConflictError(resource_name="User", resource_id=str(user_id))
+        finally:
+            pin_to_primary()
+        if user is None:
+            if expected_version is not None:
+                raise PreconditionFailedError(
+                    resource_name="User", resource_id=str(user_id)
+                )
+            raise NotFoundError(resource_name="User", resource_id=str(user_id))
+        session_cache.invalidate_user(user_id)
         return user
 
     @staticmethod
+    @traced
     async def refresh_session_token(user: User) -> SessionToken:
         """
-        Refreshes a user's session by doing the simplest thing possible:
-        removing the current token and creating a new one.
+        Refreshes a user's session by replacing the current token with a new one,
+        in a single statement that is safe against concurrent logins. When sessions
+        are signed, the new token is never persisted and previous tokens are revoked.
 
         Args:
             user (User): The user to which we refresh the session.
@@ -144,15 +356,53 @@ class UserService:
         Returns:
             The new SessionToken.
         """
-        user_session = await user.get_session()
-        if user_session is not None:
-            await user_session.adelete()
-        return await SessionToken.objects.acreate(user=user)
+        session_cache.invalidate_user(user.id)
+        if settings.SESSION_TOKEN_MODE == SessionTokenMode.SIGNED:
+            return await SignedSessionService.issue(user)
+
+        user_session = await sync_to_async(_upsert)(
+            SessionToken(user=user),
+            conflict_field="user",
+            update_fields=["token", "expires_at"],
+        )
+        pin_to_primary()
+        user_session.user = user
+        return user_session
 
     @staticmethod
+    @traced
     async def get_current_session_user(token: str) -> SessionToken | None:
         """
-        Get the session object tied to the current token, if there is any.
+        Get the session object tied to the current token, if there is any. The session's
+        user is always loaded alongside it, either from the per-worker session cache or
+        from a single joined query, so reading `session.user` never hits the database.
+        Sessions are read from the replica, falling back to the primary if not found,
+        or if the session's user was updated too recently to have been replicated.
+
+        Args:
+            token (str): Token found in the Authorization header.
+
+        Returns:
+            The current SessionToken object, or None if no session exists
+            or the active session has expired. Expired sessions are only rejected
+            here, removing them is left to the expired session reaper.
+        """
+        if settings.SESSION_TOKEN_MODE == SessionTokenMode.SIGNED:
+            return await UserService._get_signed_session_user(token)
+
+        cached_session = session_cache.get(token)
+        if cached_session is not None:
+            return cached_session
+
+        return await _session_lookups.do(
+            (token, is_pinned_to_primary()),
+            lambda: UserService._load_session(token),
+        )
+
+    @staticmethod
+    async def _load_session(token: str) -> SessionToken | None:
+        """
+        Load the session for a token from the database, caching it if it's current.
 
         Args:
             token (str): Token found in the Authorization header.
@@ -161,14 +411,89 @@ class UserService:
             The current SessionToken object, or None if no session exists
             or the active session has expired.
         """
-        current_session = await SessionToken.objects.filter(token=token).afirst()
-        if current_session is not None and current_session.is_expired:
-            await current_session.adelete()
+        sessions = SessionToken.objects.select_related("user").filter(token=token)
+        current_session = await sessions.afirst()
+        if (
+            is_replica_configured()
+            and not is_pinned_to_primary()
+            and (
+                current_session is None
+                or session_cache.is_recently_invalidated(current_session.user.id)
+            )
+        ):
+            # The session may have been created, or its user updated, too
+            # recently to have been replicated yet, so check with the primary.
+            current_session = await sessions.using(PRIMARY_DATABASE).afirst()
+        if current_session is None or current_session.is_expired:
+            return None
+        session_cache.put(current_session)
+        return current_session
+
+    @staticmethod
+    @traced
+    async def delete_expired_sessions(batch_size: int) -> int:
+        """
+        Bulk delete every session that has expired, in batches, so that no single
+        statement holds locks on a large part of the session table.
+
+        Args:
+            batch_size (int): The maximum number of sessions to delete per statement.
+
+        Returns:
+            The total number of sessions deleted.
+
+        Raises:
+            ValueError: If the batch size is less than 1.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1.")
+        current_time = datetime.now(tz=timezone.utc)
+        total_deleted = 0
+        while True:
+            expired_tokens = SessionToken.objects.filter(
+                expires_at__lte=current_time
+            ).values_list("token", flat=True)[:batch_size]
+            deleted, _ = await SessionToken.objects.filter(
+                token__in=expired_tokens
+            ).adelete()
+            total_deleted += deleted
+            if deleted < batch_size:
+                return total_deleted
+
+    @staticmethod
+    @traced
+    async def _get_signed_session_user(token: str) -> SessionToken | None:
+        """
+        Get the session for a signed token. The token itself is validated without
+        touching the database, and the user is only loaded on a session cache miss.
+
+        Args:
+            token (str): Signed token found in the Authorization header.
+
+        Returns:
+            An unsaved SessionToken for the token, or None if the token is invalid,
+            expired, revoked, or its user no longer exists.
+        """
+        claims = await SignedSessionService.verify(token)
+        if claims is None:
+            return None
+
+        cached_session = session_cache.get(token)
+        if cached_session is not None:
+            return cached_session
+
+        user = await UserService.get_user_by_id(claims.user_id)
+        if user is None:
             return None
+        current_session = SessionToken(
+            token=token, expires_at=claims.expires_at, user=user
+        )
+        session_cache.put(current_session)
         return current_session
 
     @staticmethod
-    async def destroy_current_session(user: User) -> SessionToken | None:
+    @traced
+    async def destroy_current_session(user: User) -> bool:
         """
         Destroys the user's session, if there is one. If there isn't,
         then fail silently since there's nothing to destroy.
@@ -177,9 +502,16 @@ class UserService:
             user: The user whose session we should be destroying.
 
         Returns:
-            The removed session, if there was one.
+            True if a session was removed, False otherwise.
         """
+        session_cache.invalidate_user(user.id)
+        if settings.SESSION_TOKEN_MODE == SessionTokenMode.SIGNED:
+            await SignedSessionService.revoke(user.id)
+            return True
+
+        pin_to_primary()
         current_session = cast(SessionToken | None, await user.get_session())
-        if current_session is not None:
-            await current_session.adelete()
-        return current_session
+        if current_session is None:
+            return False
+        await current_session.adelete()
+        return True
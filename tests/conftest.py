@@ -1,16 +1,147 @@
 from http import HTTPStatus
 
 import pytest
+from asgiref.sync import sync_to_async
+from collections import Counter
+from contextlib import asynccontextmanager
 from functools import partial
 from typing import Any
 from typing import Callable
+from typing import AsyncIterator
+from typing import Iterator
+from typing import cast
+from django.db import connection
 from django.test import AsyncClient
+from opentelemetry import trace
+from opentelemetry.sdk.trace import ReadableSpan
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from dda.v1.services.rate_limit import InMemoryRateLimitBackend
+from dda.v1.services.rate_limit import rate_limiter
+from dda.v1.services.session_cache import session_cache
+from dda.v1.services.tracing import configure_tracing
+from tests.stub_server import StubServer
 from tests.types import APICaller
 from tests.types import APIResponse
 from tests.types import HeaderDict
 from tests.types import QueryParamDict
 
 
+_span_exporter = InMemorySpanExporter()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def configure_test_tracing() -> None:
+    """Record every span in memory, so that tests can assert on them."""
+    configure_tracing(_span_exporter)
+
+
+@pytest.fixture
+def finished_spans() -> Callable[[], tuple[ReadableSpan, ...]]:
+    """Gets a callable returning every span finished since the start of the test."""
+    # Spans are exported in batches, so any still queued must be flushed first.
+    tracer_provider = cast(TracerProvider, trace.get_tracer_provider())
+    tracer_provider.force_flush()
+    _span_exporter.clear()
+
+    def _finished_spans() -> tuple[ReadableSpan, ...]:
+        tracer_provider.force_flush()
+        return _span_exporter.get_finished_spans()
+
+    return _finished_spans
+
+
+@pytest.fixture(autouse=True)
+def clear_session_cache() -> None:
+    """Sessions are rolled back between tests, so cached sessions must be too."""
+    session_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_rate_limits() -> None:
+    """Every test client shares an address, so limits are reset between tests."""
+    cast(InMemoryRateLimitBackend, rate_limiter.backend).clear()
+
+
+@asynccontextmanager
+async def _record_queries() -> AsyncIterator[list[str]]:
+    """
+    Record the SQL of every query executed within the block. Database connections
+    are thread-bound, so the wrapper is installed on the connection used by the
+    async ORM rather than the test's own thread.
+    """
+    executed_queries: list[str] = []
+
+    def _record_query(
+        execute: Callable[..., Any], sql: str, *args: Any, **kwargs: Any
+    ) -> Any:
+        executed_queries.append(sql)
+        return execute(sql, *args, **kwargs)
+
+    query_wrapper = await sync_to_async(
+        lambda: connection.execute_wrapper(_record_query)
+    )()
+    await sync_to_async(query_wrapper.__enter__)()
+    try:
+        yield executed_queries
+    finally:
+        await sync_to_async(query_wrapper.__exit__)(None, None, None)
+
+
+@asynccontextmanager
+async def _assert_num_queries(expected_count: int) -> AsyncIterator[None]:
+    """
+    Assert that exactly the expected number of queries are executed within the block.
+
+    Args:
+        expected_count (int): The number of queries expected to be executed.
+    """
+    async with _record_queries() as executed_queries:
+        yield
+    assert len(executed_queries) == expected_count, "\n".join(executed_queries)
+
+
+@asynccontextmanager
+async def _assert_query_budget(
+    max_count: int, max_repeats: int | None = None
+) -> AsyncIterator[None]:
+    """
+    Assert that no more than a budget of queries are executed within the block,
+    and optionally that no one statement is repeated more than a number of times.
+
+    Args:
+        max_count (int): The most queries that may be executed.
+        max_repeats (int): The most times any one statement may be executed, if limited.
+    """
+    async with _record_queries() as executed_queries:
+        yield
+    assert len(executed_queries) <= max_count, "\n".join(executed_queries)
+    if max_repeats is not None:
+        for sql, executions in Counter(executed_queries).items():
+            assert executions <= max_repeats, f"Executed {executions} times: {sql}"
+
+
+@pytest.fixture
+def assert_num_queries() -> Callable[[int], Any]:
+    """Gets an async context manager asserting the number of queries executed within it."""
+    return _assert_num_queries
+
+
+@pytest.fixture
+def assert_query_budget() -> Callable[..., Any]:
+    """Gets an async context manager asserting the queries executed within it stay within a budget."""
+    return _assert_query_budget
+
+
+@pytest.fixture
+def stub_server() -> Iterator[StubServer]:
+    """Get a running local HTTP server to stand in for external services."""
+    server = StubServer()
+    server.start()
+    yield server
+    server.stop()
+
+
 @pytest.fixture(scope="session")
 def api_test_client() -> AsyncClient:
     """Get a Django async test client for use by the entire test suite"""
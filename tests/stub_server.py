@@ -0,0 +1,111 @@
+import threading
+from dataclasses import dataclass
+from dataclasses import field
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from typing import Callable
+from typing import TypeAlias
+
+
+@dataclass
+class StubResponse:
+    """
+    A canned response returned by the stub server.
+
+    Attributes:
+        status (int): HTTP status code of the response.
+        body (bytes): Raw body of the response.
+        headers (dict[str, str]): Any headers to include in the response.
+    """
+
+    status: int = 200
+    body: bytes = b""
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class StubRequest:
+    """
+    A request received by the stub server.
+
+    Attributes:
+        method (str): HTTP method of the request.
+        path (str): Path of the request.
+        body (bytes): Raw body of the request.
+        client_port (int): The client's port, identifying the connection it came in on.
+    """
+
+    method: str
+    path: str
+    body: bytes
+    client_port: int
+
+
+StubRoute: TypeAlias = Callable[[StubRequest], StubResponse]
+
+
+class StubServer:
+    """
+    A small HTTP server, run on a background thread, standing in for external
+    services such as Google's OAuth APIs in tests.
+
+    Attributes:
+        routes (dict[str, StubRoute]): Handlers for each path, producing a response.
+        requests (list[StubRequest]): All requests received, in order.
+    """
+
+    def __init__(self) -> None:
+        self.routes: dict[str, StubRoute] = {}
+        self.requests: list[StubRequest] = []
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._build_handler())
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, args=(0.01,), daemon=True
+        )
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    def url(self, path: str) -> str:
+        return f"{self.base_url}{path}"
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _build_handler(self) -> type[BaseHTTPRequestHandler]:
+        stub_server = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep connections alive between requests.
+
+            def _handle(self) -> None:
+                content_length = int(self.headers.get("Content-Length", 0))
+                request = StubRequest(
+                    method=self.command,
+                    path=self.path,
+                    body=self.rfile.read(content_length),
+                    client_port=self.client_address[1],
+                )
+                stub_server.requests.append(request)
+                route = stub_server.routes.get(self.path)
+                response = route(request) if route is not None else StubResponse(404)
+
+                self.send_response(response.status)
+                for name, value in response.headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(response.body)))
+                self.end_headers()
+                self.wfile.write(response.body)
+
+            do_GET = _handle
+            do_POST = _handle
+
+            def log_message(self, *args: object) -> None:
+                pass
+
+        return _Handler
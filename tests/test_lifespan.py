@@ -0,0 +1,212 @@
+import pytest
+from typing import Any
+from django.core.exceptions import ImproperlyConfigured
+from unittest.mock import AsyncMock
+from unittest.mock import patch
+from django.test import override_settings
+from dda.env import Env
+from dda.env import RateLimitMode
+from dda.env import SessionTokenMode
+from dda.lifespan import LifespanApplication
+from dda.lifespan import Message
+from dda.lifespan import Scope
+from dda.v1 import lifespan
+from dda.v1.routes.api import dda_api
+
+
+async def _run_lifespan(
+    application: LifespanApplication, *event_types: str
+) -> list[Message]:
+    events = iter([{"type": event_type} for event_type in event_types])
+    sent: list[Message] = []
+
+    async def receive() -> Message:
+        return next(events)
+
+    async def send(message: Message) -> None:
+        sent.append(message)
+
+    await application({"type": "lifespan"}, receive, send)
+    return sent
+
+
+@pytest.mark.asyncio
+async def test_lifespan_runs_startup_hooks_in_order_and_shutdown_in_reverse() -> None:
+    calls: list[str] = []
+
+    def _hook(name: str) -> Any:
+        async def hook() -> None:
+            calls.append(name)
+
+        return hook
+
+    application = LifespanApplication(AsyncMock())
+    application.on_startup(_hook("start_first"))
+    application.on_startup(_hook("start_second"))
+    application.on_shutdown(_hook("stop_first"))
+    application.on_shutdown(_hook("stop_second"))
+
+    sent = await _run_lifespan(application, "lifespan.startup", "lifespan.shutdown")
+
+    assert [message["type"] for message in sent] == [
+        "lifespan.startup.complete",
+        "lifespan.shutdown.complete",
+    ]
+    assert calls == ["start_first", "start_second", "stop_second", "stop_first"]
+
+
+@pytest.mark.asyncio
+async def test_lifespan_reports_failed_startup() -> None:
+    application = LifespanApplication(AsyncMock())
+    application.on_startup(AsyncMock(side_effect=RuntimeError("no database")))
+
+    sent = await _run_lifespan(application, "lifespan.startup")
+
+    assert sent == [{"type": "lifespan.startup.failed", "message": "no database"}]
+
+
+@pytest.mark.asyncio
+async def test_lifespan_runs_every_shutdown_hook_even_if_one_fails() -> None:
+    last_hook = AsyncMock()
+    application = LifespanApplication(AsyncMock())
+    application.on_shutdown(last_hook)
+    application.on_shutdown(AsyncMock(side_effect=RuntimeError("already closed")))
+
+    sent = await _run_lifespan(application, "lifespan.startup", "lifespan.shutdown")
+
+    assert sent[-1] == {"type": "lifespan.shutdown.complete"}
+    last_hook.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_lifespan_passes_other_scopes_to_the_app() -> None:
+    app = AsyncMock()
+    application = LifespanApplication(app)
+    application.on_startup(AsyncMock())
+    scope: Scope = {"type": "http", "path": "/v1/glb/health"}
+
+    await application(scope, AsyncMock(), AsyncMock())
+
+    app.assert_awaited_once()
+    assert app.await_args is not None
+    assert app.await_args.args[0] is scope
+
+
+_SHARED_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "shared": {"BACKEND": "django.core.cache.backends.redis.RedisCache"},
+}
+
+
+@pytest.mark.asyncio
+async def test_check_session_revocation_cache_refuses_local_cache_for_signed_tokens() -> (
+    None
+):
+    with (
+        override_settings(
+            SESSION_TOKEN_MODE=SessionTokenMode.SIGNED, ENVIRONMENT=Env.PRODUCTION
+        ),
+        pytest.raises(ImproperlyConfigured),
+    ):
+        await lifespan.check_session_revocation_cache()
+
+
+@pytest.mark.asyncio
+async def test_check_session_revocation_cache_only_logs_locally() -> None:
+    with (
+        override_settings(
+            SESSION_TOKEN_MODE=SessionTokenMode.SIGNED, ENVIRONMENT=Env.LOCAL
+        ),
+        patch("dda.v1.lifespan.logger") as mock_logger,
+    ):
+        await lifespan.check_session_revocation_cache()
+    mock_logger.error.assert_called_once()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "token_mode, revocation_cache",
+    [(SessionTokenMode.DATABASE, "default"), (SessionTokenMode.SIGNED, "shared")],
+)
+async def test_check_session_revocation_cache_allows_shared_cache_or_database_tokens(
+    token_mode: SessionTokenMode, revocation_cache: str
+) -> None:
+    with override_settings(
+        SESSION_TOKEN_MODE=token_mode,
+        SESSION_REVOCATION_CACHE=revocation_cache,
+        ENVIRONMENT=Env.PRODUCTION,
+        CACHES=_SHARED_CACHES,
+    ):
+        await lifespan.check_session_revocation_cache()
+
+
+@pytest.mark.asyncio
+async def test_check_rate_limit_cache_refuses_local_cache_in_cache_mode() -> None:
+    with (
+        override_settings(
+            RATE_LIMIT_MODE=RateLimitMode.CACHE, ENVIRONMENT=Env.PRODUCTION
+        ),
+        pytest.raises(ImproperlyConfigured),
+    ):
+        await lifespan.check_rate_limit_cache()
+
+
+@pytest.mark.asyncio
+async def test_check_rate_limit_cache_only_logs_locally() -> None:
+    with (
+        override_settings(RATE_LIMIT_MODE=RateLimitMode.CACHE, ENVIRONMENT=Env.LOCAL),
+        patch("dda.v1.lifespan.logger") as mock_logger,
+    ):
+        await lifespan.check_rate_limit_cache()
+    mock_logger.error.assert_called_once()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "rate_limit_mode, rate_limit_cache",
+    [(RateLimitMode.MEMORY, "default"), (RateLimitMode.CACHE, "shared")],
+)
+async def test_check_rate_limit_cache_allows_shared_cache_or_memory_buckets(
+    rate_limit_mode: RateLimitMode, rate_limit_cache: str
+) -> None:
+    with override_settings(
+        RATE_LIMIT_MODE=rate_limit_mode,
+        RATE_LIMIT_CACHE=rate_limit_cache,
+        ENVIRONMENT=Env.PRODUCTION,
+        CACHES=_SHARED_CACHES,
+    ):
+        await lifespan.check_rate_limit_cache()
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_warm_database_connections() -> None:
+    with (
+        override_settings(
+            DB_WARMUP_CONNECTIONS=3, DATABASE_POOL_OPTIONS={"min_size": 3}
+        ),
+        patch("dda.v1.lifespan.logger") as mock_logger,
+    ):
+        await lifespan.warm_database_connections()
+    mock_logger.info.assert_called_once_with("Warmed 3 database connections.")
+
+
+@pytest.mark.asyncio
+async def test_warm_database_connections_is_skipped_without_pooling() -> None:
+    with (
+        override_settings(DB_WARMUP_CONNECTIONS=3, DATABASE_POOL_OPTIONS=None),
+        patch("dda.v1.lifespan.sync_to_async") as mock_sync_to_async,
+    ):
+        await lifespan.warm_database_connections()
+    mock_sync_to_async.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_compile_api_builds_the_openapi_schema() -> None:
+    with patch.object(
+        dda_api,
+        "get_openapi_schema",
+        wraps=dda_api.get_openapi_schema,
+    ) as mock_get_schema:
+        await lifespan.compile_api()
+    mock_get_schema.assert_called_once()
@@ -0,0 +1,102 @@
+import copy
+import io
+import json
+import logging
+import logging.config
+from contextvars import copy_context
+from typing import Any
+from django.conf import settings
+from pythonjsonlogger.json import JsonFormatter
+from dda.log import LogContextFilter
+from dda.log import QueueingStreamHandler
+from dda.log import bind_log_user
+from dda.log import get_log_context
+from dda.log import start_log_context
+
+
+def _build_logger(handler: logging.Handler) -> logging.Logger:
+    handler.setFormatter(
+        JsonFormatter("{levelname} {tid} {user_id} {message}", style="{")
+    )
+    handler.addFilter(LogContextFilter())
+    logger = logging.getLogger("dda.test_log")
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    return logger
+
+
+def _read_records(stream: io.StringIO) -> list[dict[str, str]]:
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_log_context_is_added_to_records() -> None:
+    stream = io.StringIO()
+    logger = _build_logger(logging.StreamHandler(stream))
+
+    def _log_request() -> None:
+        start_log_context("test-tid")
+        logger.info("Before auth")
+        bind_log_user("test-user")
+        logger.info("After auth")
+        logger.info("Overridden", extra={"tid": "other-tid"})
+
+    copy_context().run(_log_request)
+
+    records = _read_records(stream)
+    assert [(record["tid"], record["user_id"]) for record in records] == [
+        ("test-tid", None),
+        ("test-tid", "test-user"),
+        ("other-tid", "test-user"),
+    ]
+    # The context doesn't leak out of the request it was started in.
+    assert get_log_context().tid is None
+
+
+def test_queueing_handler_writes_formatted_records_on_close() -> None:
+    stream = io.StringIO()
+    handler = QueueingStreamHandler(stream)
+    logger = _build_logger(handler)
+
+    def _log_request() -> None:
+        start_log_context("test-tid")
+        logger.info("Retrieved %s", "profile")
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.exception("Request failed")
+
+    copy_context().run(_log_request)
+    handler.close()
+
+    records = _read_records(stream)
+    assert records[0]["message"] == "Retrieved profile"
+    assert records[0]["tid"] == "test-tid"
+    assert records[1]["message"] == "Request failed"
+    assert "ValueError: boom" in records[1]["exc_info"]
+
+
+# Where the logging config under test writes, referenced from it by import path.
+CONFIGURED_STREAM = io.StringIO()
+
+
+def test_logging_config_writes_records_through_queueing_handler() -> None:
+    logging_config: dict[str, Any] = copy.deepcopy(settings.LOGGING)
+    console_config = logging_config["handlers"]["console"]
+    assert console_config["class"] == "dda.log.QueueingStreamHandler"
+    console_config["stream"] = "ext://tests.test_log.CONFIGURED_STREAM"
+
+    def _log_request() -> None:
+        start_log_context("test-tid")
+        logging.getLogger("dda").info("Configured")
+
+    logging.config.dictConfig(logging_config)
+    try:
+        copy_context().run(_log_request)
+    finally:
+        # Closes the handler, which drains its queue, and restores the config.
+        logging.config.dictConfig(settings.LOGGING)
+
+    records = _read_records(CONFIGURED_STREAM)
+    assert records[-1]["message"] == "Configured"
+    assert records[-1]["tid"] == "test-tid"
@@ -0,0 +1,68 @@
+import pytest
+from http import HTTPStatus
+from typing import Any
+from unittest.mock import AsyncMock
+from dda.lifespan import Message
+from dda.lifespan import Scope
+from dda.probes import ProbeApplication
+
+
+async def _probe() -> tuple[HTTPStatus, dict[str, Any]]:
+    return HTTPStatus.OK, {"data": {"status": "up"}}
+
+
+async def _call(application: ProbeApplication, scope: Scope) -> list[Message]:
+    sent: list[Message] = []
+
+    async def send(message: Message) -> None:
+        sent.append(message)
+
+    await application(scope, AsyncMock(), send)
+    return sent
+
+
+@pytest.mark.asyncio
+async def test_probe_is_answered_without_calling_the_app() -> None:
+    app = AsyncMock()
+    application = ProbeApplication(app)
+    application.add_probe("/health/live", _probe)
+
+    sent = await _call(
+        application, {"type": "http", "method": "GET", "path": "/health/live"}
+    )
+
+    app.assert_not_awaited()
+    assert sent[0]["status"] == HTTPStatus.OK
+    assert sent[1]["body"] == b'{"data": {"status": "up"}}'
+
+
+@pytest.mark.asyncio
+async def test_head_probe_has_no_body() -> None:
+    application = ProbeApplication(AsyncMock())
+    application.add_probe("/health/live", _probe)
+
+    sent = await _call(
+        application, {"type": "http", "method": "HEAD", "path": "/health/live"}
+    )
+
+    assert sent[0]["status"] == HTTPStatus.OK
+    assert sent[1]["body"] == b""
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "scope",
+    [
+        {"type": "http", "method": "GET", "path": "/v1/glb/health/full"},
+        {"type": "http", "method": "POST", "path": "/health/live"},
+        {"type": "websocket", "path": "/health/live"},
+    ],
+)
+async def test_other_requests_are_passed_to_the_app(scope: Scope) -> None:
+    app = AsyncMock()
+    application = ProbeApplication(app)
+    application.add_probe("/health/live", _probe)
+
+    await _call(application, scope)
+
+    app.assert_awaited_once()
@@ -0,0 +1,94 @@
+import pytest
+import uuid
+from contextvars import copy_context
+from typing import Any
+from typing import Callable
+from unittest.mock import patch
+from django.conf import settings
+from dda.v1.db_router import PRIMARY_DATABASE
+from dda.v1.db_router import REPLICA_DATABASE
+from dda.v1.db_router import ReplicaRouter
+from dda.v1.db_router import pin_to_primary
+from dda.v1.models.user import SessionToken
+from dda.v1.models.user import User
+from dda.v1.models.user import UserSource
+from dda.v1.services.session_cache import session_cache
+from dda.v1.services.user import UserService
+
+
+def _with_replica() -> Any:
+    return patch.dict(settings.DATABASES, {REPLICA_DATABASE: {}})
+
+
+def test_reads_go_to_primary_without_a_replica() -> None:
+    assert ReplicaRouter().db_for_read(User) == PRIMARY_DATABASE
+
+
+def test_reads_go_to_replica_and_writes_to_primary() -> None:
+    router = ReplicaRouter()
+    with _with_replica():
+        assert router.db_for_read(User) == REPLICA_DATABASE
+        assert router.db_for_write(User) == PRIMARY_DATABASE
+        assert router.allow_migrate(REPLICA_DATABASE, "v1") is False
+        assert router.allow_migrate(PRIMARY_DATABASE, "v1") is True
+
+
+def test_reads_go_to_primary_once_pinned() -> None:
+    router = ReplicaRouter()
+
+    def _read_after_write() -> str:
+        pin_to_primary()
+        return router.db_for_read(User)
+
+    with _with_replica():
+        # Pinning is scoped to the context it happens in, like a single request.
+        assert copy_context().run(_read_after_write) == PRIMARY_DATABASE
+        assert router.db_for_read(User) == REPLICA_DATABASE
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_session_miss_falls_back_to_primary_with_a_replica(
+    assert_num_queries: Callable[[int], Any],
+) -> None:
+    # Reads aren't actually routed away from the primary here, so only
+    # the fallback lookup is observable.
+    with patch("dda.v1.services.user.is_replica_configured", return_value=True):
+        async with assert_num_queries(2):
+            assert await UserService.get_current_session_user("unknown") is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_session_hit_does_not_fall_back_to_primary(
+    assert_num_queries: Callable[[int], Any],
+) -> None:
+    user = await User.objects.acreate(
+        email=f"router_test_{uuid.uuid4()}@email.com",
+        family_name="Test",
+        given_name="Router",
+        source=UserSource.GOOGLE,
+    )
+    session = await SessionToken.objects.acreate(user=user)
+    with patch("dda.v1.services.user.is_replica_configured", return_value=True):
+        async with assert_num_queries(1):
+            assert await UserService.get_current_session_user(session.token)
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_session_of_recently_updated_user_is_reloaded_from_primary(
+    assert_num_queries: Callable[[int], Any],
+) -> None:
+    user = await User.objects.acreate(
+        email=f"router_test_{uuid.uuid4()}@email.com",
+        family_name="Test",
+        given_name="Router",
+        source=UserSource.GOOGLE,
+    )
+    session = await SessionToken.objects.acreate(user=user)
+    # As done when the user is updated, by another request.
+    session_cache.invalidate_user(user.id)
+    with patch("dda.v1.services.user.is_replica_configured", return_value=True):
+        async with assert_num_queries(2):
+            assert await UserService.get_current_session_user(session.token)
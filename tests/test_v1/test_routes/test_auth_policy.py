@@ -0,0 +1,33 @@
+import pytest
+from dda.v1.routes.auth_policy import AuthPolicy
+from dda.v1.routes.auth_policy import auth_policy
+from dda.v1.routes.auth_policy import RouteAuthPolicies
+
+
+TEST_SCHEMA = {
+    "paths": {
+        "/v1/glb/auth/google": {"post": auth_policy(AuthPolicy.NONE)},
+        "/v1/user/{user_id}": {
+            "get": auth_policy(AuthPolicy.REQUIRED),
+            "patch": {},
+        },
+    }
+}
+
+
+@pytest.mark.parametrize(
+    "method,path,expected_policy",
+    [
+        ("POST", "/v1/glb/auth/google", AuthPolicy.NONE),
+        ("GET", "/v1/user/c0ffee", AuthPolicy.REQUIRED),
+        ("PATCH", "/v1/user/c0ffee", AuthPolicy.OPTIONAL),
+        ("GET", "/v1/user/c0ffee/friends", AuthPolicy.OPTIONAL),
+        ("GET", "/v1/glb/auth/google", AuthPolicy.OPTIONAL),
+    ],
+)
+def test_route_auth_policies_are_read_from_openapi_schema(
+    method: str, path: str, expected_policy: AuthPolicy
+) -> None:
+    policies = RouteAuthPolicies.from_openapi_schema(TEST_SCHEMA, AuthPolicy.OPTIONAL)
+
+    assert policies.get(method, path) == expected_policy
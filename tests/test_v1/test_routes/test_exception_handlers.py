@@ -0,0 +1,42 @@
+import json
+from http import HTTPStatus
+from typing import cast
+from django.test import RequestFactory
+from dda.v1.exceptions import NotFoundError
+from dda.v1.exceptions import UnauthenticatedError
+from dda.v1.routes.api import dda_api
+from dda.v1.routes.exception_handlers import handle_resource_error
+from dda.v1.routes.exception_handlers import handle_unauthenticated_error
+from dda.v1.routes.http import APIRequest
+
+
+def test_static_error_body_is_reused_between_responses() -> None:
+    request = cast(APIRequest, RequestFactory().get("/v1/glb/auth/me"))
+
+    first_response = handle_unauthenticated_error(
+        request, UnauthenticatedError(), dda_api
+    )
+    second_response = handle_unauthenticated_error(
+        request, UnauthenticatedError(), dda_api
+    )
+
+    assert first_response is not second_response
+    assert first_response.status_code == HTTPStatus.UNAUTHORIZED
+    assert first_response["Content-Type"] == dda_api.get_content_type()
+    assert first_response.content == second_response.content
+    assert json.loads(first_response.content) == {
+        "data": None,
+        "errorCode": "UserUnauthenticated",
+        "errorMessage": "Unauthenticated users cannot make this request.",
+    }
+
+
+def test_resource_error_body_is_rendered_per_request() -> None:
+    response = handle_resource_error(
+        cast(APIRequest, RequestFactory().get("/v1/user/1")),
+        NotFoundError(resource_name="User", resource_id="1"),
+        dda_api,
+    )
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert json.loads(response.content)["errorCode"] == "ResourceNotFound"
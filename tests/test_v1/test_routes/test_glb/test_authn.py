@@ -1,16 +1,25 @@
+import asyncio
 import pytest
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from http import HTTPStatus
 from typing import Any
 from typing import Callable
 from typing import Coroutine
 from typing import TypeAlias
 from unittest.mock import patch
+from asgiref.sync import async_to_sync
+from asgiref.sync import sync_to_async
+from django.db import connection
 from dda.v1.models.user import SessionToken
+from dda.v1.models.user import User
 from dda.v1.schemas.authn import GoogleTokenExchangeDto
 from dda.v1.schemas.user import UserCreateDto
 from dda.v1.services.authn import AuthNService
 from dda.v1.services.authn.google import ExternalGoogleService
 from dda.v1.services.authn.google import IGoogleService
+from dda.v1.services.rate_limit import RateLimit
+from dda.v1.services.rate_limit import rate_limiter
 from tests.types import APICaller
 
 
@@ -182,3 +191,83 @@ async def test_google_login_should_return_201_with_replaced_session_when_session
 
         assert first_token != second_token
         assert await SessionToken.objects.filter(token=first_token).afirst() is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_google_login_should_persist_user_and_session_in_two_queries(
+    api_post: APICaller,
+    mocked_google_oauth: MockedLoginCallable,
+    assert_num_queries: Callable[[int], Any],
+) -> None:
+    with patch.object(AuthNService, "login_with_google", new=mocked_google_oauth):
+        for _ in range(2):
+            async with assert_num_queries(2):
+                await api_post(
+                    "/v1/glb/auth/google",
+                    body=TEST_CODE_BODY,
+                    expected_status_code=HTTPStatus.CREATED,
+                )
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
+async def test_google_login_should_leave_one_user_and_session_on_concurrent_logins(
+    mocked_google_oauth: MockedLoginCallable,
+) -> None:
+    login_count = 5
+    # Every login waits for the others, so that their upserts race each other.
+    barrier = threading.Barrier(login_count)
+
+    def login_on_own_connection() -> SessionToken:
+        # Runs on its own thread, so it gets its own database connection.
+        try:
+            barrier.wait()
+            return async_to_sync(mocked_google_oauth)(
+                GoogleTokenExchangeDto(**TEST_CODE_BODY)
+            )
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(max_workers=login_count) as executor:
+        sessions = await asyncio.gather(
+            *[
+                sync_to_async(
+                    login_on_own_connection, thread_sensitive=False, executor=executor
+                )()
+                for _ in range(login_count)
+            ]
+        )
+
+    assert len({session.user.id for session in sessions}) == 1
+    user = await User.objects.aget(email=TEST_OAUTH_RESPONSE_USER.email)
+    assert await SessionToken.objects.filter(user=user).acount() == 1
+    current_session = await SessionToken.objects.aget(user=user)
+    assert current_session.token in {session.token for session in sessions}
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_google_login_should_return_429_when_rate_limited(
+    api_post: APICaller,
+) -> None:
+    with (
+        patch.dict(rate_limiter.limits, {"google_login": RateLimit.parse("1/minute")}),
+        patch.object(
+            AuthNService,
+            "login_with_google",
+            side_effect=ExternalGoogleService.TokenValidationException(),
+        ),
+    ):
+        await api_post(
+            "/v1/glb/auth/google",
+            body=TEST_CODE_BODY,
+            expected_status_code=HTTPStatus.BAD_REQUEST,
+        )
+        limited_response = await api_post(
+            "/v1/glb/auth/google",
+            body=TEST_CODE_BODY,
+            expected_status_code=HTTPStatus.TOO_MANY_REQUESTS,
+        )
+
+    assert limited_response.error_code == "TooManyRequests"
@@ -1,5 +1,10 @@
+import httpx
 import pytest
 from http import HTTPStatus
+from typing import AsyncIterator
+from unittest.mock import patch
+from dda.asgi import application
+from dda.v1.services.readiness import readiness_checker
 from tests.types import APICaller
 
 
@@ -9,3 +14,58 @@ async def test_should_return_200_when_app_is_up(api_get: APICaller) -> None:
         "/v1/glb/health/full", expected_status_code=HTTPStatus.OK
     )
     assert health_response.response["status"] == "up"
+
+
+@pytest.fixture
+async def asgi_client() -> AsyncIterator[httpx.AsyncClient]:
+    """A client for the full ASGI application, including the probes answered ahead of Django."""
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=application), base_url="http://testserver"
+    ) as client:
+        yield client
+
+
+@pytest.mark.asyncio
+async def test_live_probe_bypasses_the_middleware(
+    asgi_client: httpx.AsyncClient,
+) -> None:
+    with patch("dda.v1.routes.middleware.transaction.logger") as mock_logger:
+        response = await asgi_client.get("/v1/glb/health/live")
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()["data"] == {"status": "up"}
+    assert "X-DDA-TID" not in response.headers
+    mock_logger.info.assert_not_called()
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_ready_probe_reports_each_dependency(
+    asgi_client: httpx.AsyncClient,
+) -> None:
+    readiness_checker.clear()
+    with patch("dda.v1.services.readiness.google_certificate_store", is_fresh=True):
+        response = await asgi_client.get("/v1/glb/health/ready")
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()["data"] == {
+        "status": "up",
+        "checks": {"database": "up", "googleCertificates": "up"},
+    }
+
+
+@pytest.mark.asyncio
+async def test_ready_probe_returns_503_when_a_dependency_is_down(
+    asgi_client: httpx.AsyncClient,
+) -> None:
+    readiness_checker.clear()
+    with (
+        patch("dda.v1.services.readiness._check_database", return_value=False),
+        patch("dda.v1.services.readiness.google_certificate_store", is_fresh=True),
+    ):
+        response = await asgi_client.get("/v1/glb/health/ready")
+    readiness_checker.clear()
+
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert response.json()["data"] is None
+    assert response.json()["errorCode"] == "ServiceNotReady"
@@ -1,7 +1,12 @@
+import asyncio
 import pytest
 from datetime import timedelta
+from typing import Any
+from typing import Callable
 from http import HTTPStatus
+from django.test import AsyncClient
 from dda.v1.models.user import SessionToken
+from dda.v1.models.user import User
 from dda.v1.schemas.user import UserSessionDto
 from tests.types import APICaller
 from tests.wrapper import authed_request
@@ -78,3 +83,75 @@ async def test_get_authed_user_returns_200_with_correct_user_if_authenticated(
         response.response["profilePicture"]
         == authed_api_get.session.user.profile_picture
     )
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_get_authed_user_resolves_session_and_user_in_one_query(
+    api_get: APICaller, assert_num_queries: Callable[[int], Any]
+) -> None:
+    authed_api_get = await authed_request(api_get)
+    async with assert_num_queries(1):
+        await authed_api_get.caller("/v1/glb/auth/me")
+    # Subsequent requests are served from the session cache.
+    async with assert_num_queries(0):
+        await authed_api_get.caller("/v1/glb/auth/me")
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_concurrent_requests_with_same_token_share_one_session_query(
+    api_get: APICaller, assert_num_queries: Callable[[int], Any]
+) -> None:
+    authed_api_get = await authed_request(api_get)
+    async with assert_num_queries(1):
+        await asyncio.gather(
+            *(authed_api_get.caller("/v1/glb/auth/me") for _ in range(3))
+        )
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_get_authed_user_returns_304_if_etag_matches_without_a_query(
+    api_get: APICaller,
+    api_test_client: AsyncClient,
+    assert_num_queries: Callable[[int], Any],
+) -> None:
+    authed_api_get = await authed_request(api_get)
+    headers = {"Authorization": f"Bearer {authed_api_get.session.token}"}
+    response = await api_test_client.get("/v1/glb/auth/me", headers=headers)
+
+    async with assert_num_queries(0):
+        not_modified_response = await api_test_client.get(
+            "/v1/glb/auth/me", headers={**headers, "If-None-Match": response["ETag"]}
+        )
+
+    assert not_modified_response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_get_authed_user_etag_of_stale_cached_user_is_refused_by_if_match(
+    api_get: APICaller, api_test_client: AsyncClient
+) -> None:
+    authed_api_get = await authed_request(api_get)
+    session = authed_api_get.session
+    headers = {"Authorization": f"Bearer {session.token}"}
+    await api_test_client.get("/v1/glb/auth/me", headers=headers)
+    # Updated by another worker, so this worker's session cache isn't invalidated.
+    await User.objects.filter(id=session.user.id).aupdate(
+        given_name="Elsewhere", version=2
+    )
+
+    response = await api_test_client.get("/v1/glb/auth/me", headers=headers)
+    update_response = await api_test_client.patch(
+        f"/v1/user/{session.user.id}",
+        data={},
+        content_type="application/json",
+        headers={**headers, "If-Match": response["ETag"]},
+    )
+
+    # The cached profile is served with the ETag of that same profile.
+    assert response.json()["data"]["givenName"] == session.user.given_name
+    assert response["ETag"] == f'"{session.user.id}.1"'
+    assert update_response.status_code == HTTPStatus.PRECONDITION_FAILED
@@ -0,0 +1,85 @@
+import pytest
+from http import HTTPStatus
+from django.test import AsyncClient
+from django.test import override_settings
+from prometheus_client import REGISTRY
+from tests.types import APICaller
+from tests.wrapper import authed_request
+
+
+_METRICS_TOKEN = "test-metrics-token"
+
+
+def _sample(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("configured_token", [None, _METRICS_TOKEN])
+async def test_get_metrics_returns_404_without_the_metrics_token(
+    api_get: APICaller, configured_token: str | None
+) -> None:
+    with override_settings(METRICS_TOKEN=configured_token):
+        await api_get(
+            "/v1/glb/metrics",
+            headers={"X-DDA-Metrics-Token": "wrong-token"},
+            expected_status_code=HTTPStatus.NOT_FOUND,
+        )
+
+
+@pytest.mark.asyncio
+async def test_get_metrics_returns_prometheus_metrics_with_the_metrics_token(
+    api_get: APICaller, api_test_client: AsyncClient
+) -> None:
+    await api_get("/v1/glb/health/full")
+    with override_settings(METRICS_TOKEN=_METRICS_TOKEN):
+        response = await api_test_client.get(
+            "/v1/glb/metrics", headers={"X-DDA-Metrics-Token": _METRICS_TOKEN}
+        )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response["Content-Type"].startswith("text/plain")
+    assert (
+        'dda_responses_total{method="GET",route="v1/glb/health/full",status="200"}'
+        in response.content.decode()
+    )
+
+
+@pytest.mark.asyncio
+async def test_metrics_are_recorded_per_route_pattern(api_get: APICaller) -> None:
+    labels = {"method": "GET", "route": "v1/glb/health/full"}
+    responses_before = _sample("dda_responses_total", status="200", **labels)
+    latencies_before = _sample("dda_request_duration_seconds_count", **labels)
+
+    await api_get("/v1/glb/health/full")
+
+    assert _sample("dda_responses_total", status="200", **labels) == (
+        responses_before + 1
+    )
+    assert _sample("dda_request_duration_seconds_count", **labels) == (
+        latencies_before + 1
+    )
+    assert _sample("dda_requests_in_flight") == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_db_queries_and_session_cache_lookups_are_recorded(
+    api_get: APICaller,
+) -> None:
+    authed_api_get = await authed_request(api_get)
+    user_id = authed_api_get.session.user.id
+    labels = {"method": "GET", "route": "v1/user/<user_id>"}
+    queries_before = _sample("dda_db_queries_per_request_sum", **labels)
+    misses_before = _sample("dda_session_cache_lookups_total", result="miss")
+    hits_before = _sample("dda_session_cache_lookups_total", result="hit")
+
+    await authed_api_get.caller(f"/v1/user/{user_id}")
+    await authed_api_get.caller(f"/v1/user/{user_id}")
+
+    # Only the first request looks up the session, the second is served from cache.
+    assert _sample("dda_db_queries_per_request_sum", **labels) == queries_before + 1
+    assert _sample("dda_session_cache_lookups_total", result="miss") == (
+        misses_before + 1
+    )
+    assert _sample("dda_session_cache_lookups_total", result="hit") == hits_before + 1
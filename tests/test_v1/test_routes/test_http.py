@@ -0,0 +1,25 @@
+import uuid
+import pytest
+from unittest.mock import AsyncMock
+from dda.v1.models.user import User
+from dda.v1.routes.http import APIRequestState
+
+
+@pytest.mark.asyncio
+async def test_request_state_loads_deferred_user_once() -> None:
+    user = User(id=uuid.uuid4())
+    load_user = AsyncMock(return_value=user)
+    state = APIRequestState(tid=uuid.uuid4())
+    state.defer_user(load_user)
+
+    assert await state.auser() is user
+    assert await state.auser() is user
+    load_user.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_request_state_without_deferred_user_is_unauthenticated() -> None:
+    state = APIRequestState(tid=uuid.uuid4())
+
+    assert await state.auser() is None
+    assert not hasattr(state, "user")
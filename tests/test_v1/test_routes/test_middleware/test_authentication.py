@@ -0,0 +1,36 @@
+import pytest
+from http import HTTPStatus
+from unittest.mock import patch
+from dda.v1.services.user import UserService
+from tests.types import APICaller
+from tests.wrapper import authed_request
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_public_route_does_not_look_up_session(api_get: APICaller) -> None:
+    authed_api_get = await authed_request(api_get)
+    with patch.object(UserService, "get_current_session_user") as get_session:
+        await authed_api_get.caller("/v1/glb/health/full")
+
+    get_session.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_public_route_does_not_warn_without_authorization_header(
+    api_get: APICaller,
+) -> None:
+    with patch("dda.v1.routes.middleware.authentication.logger") as mock_logger:
+        await api_get("/v1/glb/health/full")
+
+    mock_logger.warning.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_authenticated_route_warns_without_authorization_header(
+    api_get: APICaller,
+) -> None:
+    with patch("dda.v1.routes.middleware.authentication.logger") as mock_logger:
+        await api_get("/v1/glb/auth/me", expected_status_code=HTTPStatus.UNAUTHORIZED)
+
+    mock_logger.warning.assert_called_once()
@@ -0,0 +1,159 @@
+import gzip
+import brotli
+import pytest
+from http import HTTPStatus
+from typing import AsyncIterator
+from django.http import HttpRequest
+from django.http import HttpResponse
+from django.http import StreamingHttpResponse
+from django.test import RequestFactory
+from django.test import override_settings
+from dda.v1.routes.content_encoding import strip_etag_encoding
+from dda.v1.routes.middleware.compression import compression_middleware
+from dda.v1.routes.middleware.compression import negotiate_encoding
+
+
+_LARGE_BODY = b'{"data": "' + b"a" * 4096 + b'"}'
+
+
+async def _compress_response(
+    response: HttpResponse | StreamingHttpResponse, accept_encoding: str = "gzip, br"
+) -> HttpResponse:
+    async def get_response(request: HttpRequest) -> HttpResponse:
+        return response  # type: ignore[return-value]
+
+    middleware = compression_middleware(get_response)
+    request = RequestFactory().get("/", headers={"Accept-Encoding": accept_encoding})
+    return await middleware(request)
+
+
+def _decompress(encoding: str, content: bytes) -> bytes:
+    if encoding == "br":
+        return bytes(brotli.decompress(content))
+    return gzip.decompress(content)
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected_encoding",
+    [
+        ("gzip, deflate, br", "br"),
+        ("gzip", "gzip"),
+        ("br;q=0.5, gzip;q=0.8", "gzip"),
+        ("br;q=0, gzip", "gzip"),
+        ("*", "br"),
+        ("*, br;q=0", "gzip"),
+        ("identity", None),
+        ("", None),
+    ],
+)
+def test_negotiate_encoding_picks_preferred_supported_encoding(
+    accept_encoding: str, expected_encoding: str | None
+) -> None:
+    assert negotiate_encoding(accept_encoding) == expected_encoding
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("encoding", ["br", "gzip"])
+async def test_compression_middleware_compresses_large_response(encoding: str) -> None:
+    response = await _compress_response(
+        HttpResponse(_LARGE_BODY, content_type="application/json"),
+        accept_encoding=encoding,
+    )
+
+    assert response["Content-Encoding"] == encoding
+    assert response["Vary"] == "Accept-Encoding"
+    assert response["Content-Length"] == str(len(response.content))
+    assert _decompress(encoding, response.content) == _LARGE_BODY
+
+
+@pytest.mark.asyncio
+@override_settings(COMPRESSION_THREAD_MIN_BYTES=0)
+async def test_compression_middleware_compresses_large_response_off_loop() -> None:
+    response = await _compress_response(HttpResponse(_LARGE_BODY))
+
+    assert _decompress(response["Content-Encoding"], response.content) == _LARGE_BODY
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "etag, expected_etag", [('"1.1"', '"1.1-br"'), ('W/"1.1"', 'W/"1.1"')]
+)
+async def test_compression_middleware_makes_etag_specific_to_encoding(
+    etag: str, expected_etag: str
+) -> None:
+    original_response = HttpResponse(_LARGE_BODY)
+    original_response["ETag"] = etag
+
+    response = await _compress_response(original_response, accept_encoding="br")
+
+    assert response["ETag"] == expected_etag
+    assert strip_etag_encoding(response["ETag"]) == etag
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "response",
+    [
+        HttpResponse(b"{}"),
+        HttpResponse(_LARGE_BODY, status=HTTPStatus.BAD_REQUEST),
+        HttpResponse(_LARGE_BODY, headers={"Content-Encoding": "br"}),
+    ],
+)
+async def test_compression_middleware_skips_small_error_and_encoded_responses(
+    response: HttpResponse,
+) -> None:
+    original_content = response.content
+
+    compressed_response = await _compress_response(response)
+
+    assert compressed_response.content == original_content
+    assert compressed_response.get("Content-Encoding") == response.get(
+        "Content-Encoding"
+    )
+
+
+@pytest.mark.asyncio
+async def test_compression_middleware_skips_client_without_supported_encoding() -> None:
+    response = await _compress_response(
+        HttpResponse(_LARGE_BODY), accept_encoding="identity"
+    )
+
+    assert not response.has_header("Content-Encoding")
+    assert response["Vary"] == "Accept-Encoding"
+    assert response.content == _LARGE_BODY
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("encoding", ["br", "gzip"])
+async def test_compression_middleware_compresses_async_stream_per_chunk(
+    encoding: str,
+) -> None:
+    chunks = [b"first chunk,", b"second chunk,", b"last chunk"]
+
+    async def stream() -> AsyncIterator[bytes]:
+        for chunk in chunks:
+            yield chunk
+
+    response = await _compress_response(
+        StreamingHttpResponse(stream()), accept_encoding=encoding
+    )
+    assert isinstance(response, StreamingHttpResponse)
+    compressed_chunks = [chunk async for chunk in response]
+
+    assert response["Content-Encoding"] == encoding
+    assert not response.has_header("Content-Length")
+    # Every chunk is flushed as it's streamed, followed by the end of the stream.
+    assert len(compressed_chunks) == len(chunks) + 1
+    assert _decompress(encoding, b"".join(compressed_chunks)) == b"".join(chunks)
+
+
+@pytest.mark.asyncio
+async def test_compression_middleware_compresses_sync_stream() -> None:
+    chunks = [b"first chunk,", b"last chunk"]
+
+    response = await _compress_response(
+        StreamingHttpResponse(iter(chunks)), accept_encoding="gzip"
+    )
+    assert isinstance(response, StreamingHttpResponse)
+
+    assert gzip.decompress(b"".join(response.streaming_content)) == b"".join(chunks)
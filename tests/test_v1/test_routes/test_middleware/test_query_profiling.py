@@ -0,0 +1,81 @@
+import pytest
+from http import HTTPStatus
+from typing import Any
+from typing import Callable
+from unittest.mock import patch
+from django.conf import settings
+from django.http import HttpRequest
+from django.http import HttpResponse
+from django.test import AsyncClient
+from django.test import override_settings
+from dda.v1.models.user import User
+from dda.v1.routes.middleware.query_profiling import query_profiling_middleware
+from tests.types import APICaller
+from tests.wrapper import authed_request
+
+
+_QUERY_PROFILING_MIDDLEWARE = (
+    "dda.v1.routes.middleware.query_profiling.query_profiling_middleware"
+)
+_UNPROFILED_MIDDLEWARE = [
+    middleware
+    for middleware in settings.MIDDLEWARE
+    if middleware != _QUERY_PROFILING_MIDDLEWARE
+]
+_PROFILED_MIDDLEWARE = [
+    *_UNPROFILED_MIDDLEWARE[:-1],
+    _QUERY_PROFILING_MIDDLEWARE,
+    _UNPROFILED_MIDDLEWARE[-1],
+]
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_query_profiling_reports_queries_in_headers_and_logs(
+    api_get: APICaller, assert_num_queries: Callable[[int], Any]
+) -> None:
+    authed_api_get = await authed_request(api_get)
+    with (
+        override_settings(MIDDLEWARE=_PROFILED_MIDDLEWARE),
+        patch("dda.v1.routes.middleware.query_profiling.logger") as mock_logger,
+    ):
+        async with assert_num_queries(1):
+            response = await AsyncClient().get(
+                f"/v1/user/{authed_api_get.session.user.id}",
+                headers={"Authorization": f"Bearer {authed_api_get.session.token}"},
+            )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response["X-DDA-DB-Queries"] == "1"
+    assert float(response["X-DDA-DB-Ms"]) > 0
+    mock_logger.info.assert_called_once()
+    assert mock_logger.info.call_args.kwargs["extra"] == {
+        "db_queries": 1,
+        "db_ms": float(response["X-DDA-DB-Ms"]),
+    }
+    mock_logger.warning.assert_not_called()
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_query_profiling_warns_on_repeated_statements(
+    api_get: APICaller,
+) -> None:
+    authed_api_get = await authed_request(api_get)
+    user_id = authed_api_get.session.user.id
+
+    async def get_response(request: HttpRequest) -> HttpResponse:
+        for _ in range(3):
+            await User.objects.aget(id=user_id)
+        return HttpResponse()
+
+    with (
+        override_settings(DB_QUERY_REPEAT_THRESHOLD=3),
+        patch("dda.v1.routes.middleware.query_profiling.logger") as mock_logger,
+    ):
+        response = await query_profiling_middleware(get_response)(HttpRequest())
+
+    assert response["X-DDA-DB-Queries"] == "3"
+    mock_logger.warning.assert_called_once()
+    assert mock_logger.warning.call_args.kwargs["extra"]["executions"] == 3
+    assert User._meta.db_table in mock_logger.warning.call_args.kwargs["extra"]["sql"]
@@ -0,0 +1,69 @@
+import uuid
+import pytest
+from typing import Callable
+from django.test import AsyncClient
+from opentelemetry.sdk.trace import ReadableSpan
+from tests.types import APICaller
+from tests.wrapper import authed_request
+
+
+_TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+_PARENT_SPAN_ID = "00f067aa0ba902b7"
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_request_records_spans_for_middleware_services_and_queries(
+    api_get: APICaller,
+    api_test_client: AsyncClient,
+    finished_spans: Callable[[], tuple[ReadableSpan, ...]],
+) -> None:
+    authed_api_get = await authed_request(api_get)
+
+    response = await api_test_client.get(
+        f"/v1/user/{authed_api_get.session.user.id}",
+        headers={"Authorization": f"Bearer {authed_api_get.session.token}"},
+    )
+
+    spans = finished_spans()
+    spans_by_name = {span.name: span for span in spans}
+    server_span = spans_by_name["GET v1/user/<user_id>"]
+    assert server_span.context is not None
+    trace_id = server_span.context.trace_id
+    assert {
+        "metrics_middleware",
+        "transaction_middleware",
+        "authentication_middleware",
+        "UserService.get_current_session_user",
+        "UserService.get_user_by_id",
+        "SELECT",
+    } <= spans_by_name.keys()
+    assert all(
+        span.context is not None and span.context.trace_id == trace_id for span in spans
+    )
+    assert spans_by_name["SELECT"].parent is not None
+    assert (
+        spans_by_name["SELECT"].parent.span_id
+        == spans_by_name["UserService.get_current_session_user"].context.span_id
+    )
+    assert response["X-DDA-TID"] == str(uuid.UUID(int=trace_id))
+
+
+@pytest.mark.asyncio
+async def test_request_continues_the_trace_of_an_incoming_traceparent(
+    api_test_client: AsyncClient,
+    finished_spans: Callable[[], tuple[ReadableSpan, ...]],
+) -> None:
+    response = await api_test_client.get(
+        "/v1/glb/health/full",
+        headers={"traceparent": f"00-{_TRACE_ID}-{_PARENT_SPAN_ID}-01"},
+    )
+
+    server_span = next(
+        span for span in finished_spans() if span.name == "GET v1/glb/health/full"
+    )
+    assert server_span.context is not None
+    assert server_span.context.trace_id == int(_TRACE_ID, 16)
+    assert server_span.parent is not None
+    assert server_span.parent.span_id == int(_PARENT_SPAN_ID, 16)
+    assert response["X-DDA-TID"] == str(uuid.UUID(_TRACE_ID))
@@ -0,0 +1,77 @@
+import json
+import uuid
+from datetime import datetime
+from datetime import timezone
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+from django.test import RequestFactory
+from dda.v1.routes.http import APIResponse
+from dda.v1.routes.renderers import ORJSONParser
+from dda.v1.routes.renderers import ORJSONRenderer
+from dda.v1.routes.renderers import render_response
+from dda.v1.schemas.user import UserDto
+from dda.v1.schemas.user import UserUpdateDto
+
+
+def test_schema_is_rendered_with_camel_case_aliases() -> None:
+    content = ORJSONRenderer().render(
+        RequestFactory().get("/"),
+        APIResponse(error_code="UnknownError", error_message="Oops"),
+        response_status=500,
+    )
+
+    assert json.loads(content) == {
+        "data": None,
+        "errorCode": "UnknownError",
+        "errorMessage": "Oops",
+    }
+
+
+def test_nested_schema_is_rendered_with_camel_case_aliases() -> None:
+    content = ORJSONRenderer().render(
+        RequestFactory().get("/"),
+        {"data": UserUpdateDto(given_name="Austin")},
+        response_status=200,
+    )
+
+    assert json.loads(content)["data"]["givenName"] == "Austin"
+
+
+def test_datetimes_are_rendered_as_django_renders_them() -> None:
+    expires_at = datetime(2025, 1, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+
+    content = ORJSONRenderer().render(
+        RequestFactory().get("/"), {"expiresAt": expires_at}, response_status=200
+    )
+
+    assert json.loads(content) == json.loads(
+        json.dumps({"expiresAt": expires_at}, cls=DjangoJSONEncoder)
+    )
+
+
+def test_route_result_is_rendered_into_its_response_as_ninja_would() -> None:
+    user = UserDto(
+        email="test@email.com",
+        family_name="Graham",
+        given_name="Austin",
+        id=uuid.uuid4(),
+    )
+    result = APIResponse(data=user)
+    response = HttpResponse(content_type="application/json; charset=utf-8")
+    response["ETag"] = '"1.1"'
+
+    rendered_response = render_response(RequestFactory().get("/"), response, result)
+
+    assert rendered_response is response
+    assert rendered_response["ETag"] == '"1.1"'
+    assert json.loads(rendered_response.content) == json.loads(
+        json.dumps(result.model_dump(mode="json", by_alias=True))
+    )
+
+
+def test_body_is_parsed() -> None:
+    request = RequestFactory().post(
+        "/", data=b'{"givenName": "Austin"}', content_type="application/json"
+    )
+
+    assert ORJSONParser().parse_body(request) == {"givenName": "Austin"}
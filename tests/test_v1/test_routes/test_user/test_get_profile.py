@@ -1,6 +1,9 @@
 import uuid
 import pytest
 from http import HTTPStatus
+from typing import Any
+from typing import Callable
+from django.test import AsyncClient
 from tests.types import APICaller
 from tests.wrapper import authed_request
 
@@ -51,7 +54,63 @@ async def test_get_user_profile_returns_200_with_correct_user(
     )
 
 
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_get_user_profile_reuses_the_authenticated_user(
+    api_get: APICaller, assert_num_queries: Callable[[int], Any]
+) -> None:
+    authed_api_get = await authed_request(api_get)
+    # Only the session lookup, which loads the user alongside it.
+    async with assert_num_queries(1):
+        await authed_api_get.caller(f"/v1/user/{authed_api_get.session.user.id}")
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_get_user_profile_of_another_user_stays_within_query_budget(
+    api_get: APICaller, assert_query_budget: Callable[..., Any]
+) -> None:
+    authed_api_get = await authed_request(api_get)
+    async with assert_query_budget(1, max_repeats=1):
+        await authed_api_get.caller(
+            f"/v1/user/{uuid.uuid4()}", expected_status_code=HTTPStatus.FORBIDDEN
+        )
+
+
 @pytest.mark.skip("Skipped until proper team/campaign logic is implemented.")
 async def test_get_user_profile_returns_200_if_different_user_but_authorized(
     api_get: APICaller,
 ) -> None: ...
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "client_etag_format", ['"{}.1"', 'W/"{}.1"', '"{}.1-br"', 'W/"{}.1-gzip"']
+)
+async def test_get_user_profile_returns_304_if_etag_matches(
+    api_get: APICaller,
+    api_test_client: AsyncClient,
+    assert_num_queries: Callable[[int], Any],
+    client_etag_format: str,
+) -> None:
+    authed_api_get = await authed_request(api_get)
+    session = authed_api_get.session
+    headers = {"Authorization": f"Bearer {session.token}"}
+    response = await api_test_client.get(f"/v1/user/{session.user.id}", headers=headers)
+    etag = response["ETag"]
+    assert etag == f'"{session.user.id}.1"'
+
+    # The authenticated user is now cached, so no query is needed.
+    async with assert_num_queries(0):
+        not_modified_response = await api_test_client.get(
+            f"/v1/user/{session.user.id}",
+            headers={
+                **headers,
+                "If-None-Match": client_etag_format.format(session.user.id),
+            },
+        )
+
+    assert not_modified_response.status_code == HTTPStatus.NOT_MODIFIED
+    assert not_modified_response["ETag"] == etag
+    assert not_modified_response.content == b""
@@ -2,9 +2,12 @@ import random
 import uuid
 import pytest
 from http import HTTPStatus
+from typing import Any
+from typing import Callable
 
 from typing_extensions import no_type_check
 
+from django.test import AsyncClient
 from dda.v1.models.user import User
 from tests.types import APICaller
 from tests.wrapper import authed_request
@@ -174,6 +177,8 @@ async def test_update_user_profile_returns_200_and_doesnt_update_when_not_necess
     assert (
         pre_call_db_user.profile_picture == update_response.response["profilePicture"]
     )
+    db_user = await User.objects.aget(id=user_id)
+    assert db_user.version == pre_call_db_user.version
 
 
 @pytest.mark.asyncio
@@ -218,3 +223,179 @@ async def test_update_user_profile_returns_200_and_doesnt_unverify_when_contact_
 
     assert db_user.is_email_verified
     assert db_user.is_phone_verified
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_update_user_profile_returns_200_when_email_is_unchanged(
+    api_patch: APICaller,
+) -> None:
+    authed_api_patch = await authed_request(api_patch)
+    user = authed_api_patch.session.user
+    test_body = _get_test_update_user_body(email=user.email)
+
+    update_response = await authed_api_patch.caller(
+        f"/v1/user/{user.id}", body=test_body
+    )
+
+    assert update_response.response["email"] == user.email
+    db_user = await User.objects.aget(id=user.id)
+    assert db_user.is_email_verified
+    assert not db_user.is_phone_verified
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_update_user_profile_writes_changed_fields_in_one_update(
+    api_patch: APICaller, assert_num_queries: Callable[[int], Any]
+) -> None:
+    authed_api_patch = await authed_request(api_patch)
+    user_id = authed_api_patch.session.user.id
+    test_body = _get_test_update_user_body()
+
+    # The session lookup loads the user, then a single UPDATE with no uniqueness checks.
+    async with assert_num_queries(2):
+        await authed_api_patch.caller(f"/v1/user/{user_id}", body=test_body)
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_update_user_profile_returns_new_etag_when_if_match_is_current(
+    api_patch: APICaller, api_test_client: AsyncClient
+) -> None:
+    authed_api_patch = await authed_request(api_patch)
+    session = authed_api_patch.session
+
+    response = await api_test_client.patch(
+        f"/v1/user/{session.user.id}",
+        data=_get_test_update_user_body(),
+        content_type="application/json",
+        headers={
+            "Authorization": f"Bearer {session.token}",
+            "If-Match": f'"{session.user.id}.1"',
+        },
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response["ETag"] == f'"{session.user.id}.2"'
+    db_user = await User.objects.aget(id=session.user.id)
+    assert db_user.version == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_update_user_profile_accepts_if_match_of_compressed_profile(
+    api_patch: APICaller,
+) -> None:
+    authed_api_patch = await authed_request(api_patch)
+    user_id = authed_api_patch.session.user.id
+
+    await authed_api_patch.caller(
+        f"/v1/user/{user_id}",
+        body=_get_test_update_user_body(),
+        headers={"If-Match": f'"{user_id}.1-br"'},
+    )
+
+    db_user = await User.objects.aget(id=user_id)
+    assert db_user.version == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_update_user_profile_returns_412_when_if_match_is_weak(
+    api_patch: APICaller,
+) -> None:
+    authed_api_patch = await authed_request(api_patch)
+    user_id = authed_api_patch.session.user.id
+
+    response = await authed_api_patch.caller(
+        f"/v1/user/{user_id}",
+        body=_get_test_update_user_body(),
+        headers={"If-Match": f'W/"{user_id}.1"'},
+        expected_status_code=HTTPStatus.PRECONDITION_FAILED,
+    )
+
+    assert response.error_code == "ResourcePreconditionFailed"
+    db_user = await User.objects.aget(id=user_id)
+    assert db_user.version == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+@pytest.mark.parametrize("etag_user_id", [None, uuid.uuid4()])
+async def test_update_user_profile_returns_412_when_if_match_is_stale(
+    api_patch: APICaller, etag_user_id: uuid.UUID | None
+) -> None:
+    authed_api_patch = await authed_request(api_patch)
+    user_id = authed_api_patch.session.user.id
+    # The user has changed since the client last read it.
+    await User.objects.filter(id=user_id).aupdate(version=2)
+
+    response = await authed_api_patch.caller(
+        f"/v1/user/{user_id}",
+        body=_get_test_update_user_body(),
+        headers={"If-Match": f'"{etag_user_id or user_id}.1"'},
+        expected_status_code=HTTPStatus.PRECONDITION_FAILED,
+    )
+
+    assert response.error_code == "ResourcePreconditionFailed"
+    db_user = await User.objects.aget(id=user_id)
+    assert db_user.given_name == "Dev"
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_update_user_profile_compares_against_user_as_stored(
+    api_patch: APICaller,
+) -> None:
+    authed_api_patch = await authed_request(api_patch)
+    user = authed_api_patch.session.user
+    # The user has changed since the session loaded it.
+    await User.objects.filter(id=user.id).aupdate(
+        given_name="Changed", family_name="Elsewhere", version=2
+    )
+
+    update_response = await authed_api_patch.caller(
+        f"/v1/user/{user.id}", body={"givenName": user.given_name}
+    )
+
+    assert update_response.response["givenName"] == user.given_name
+    assert update_response.response["familyName"] == "Elsewhere"
+    db_user = await User.objects.aget(id=user.id)
+    assert db_user.given_name == user.given_name
+    assert db_user.family_name == "Elsewhere"
+    assert db_user.version == 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "if_match_version, expected_status_code",
+    [(2, HTTPStatus.OK), (1, HTTPStatus.PRECONDITION_FAILED)],
+)
+async def test_update_user_profile_without_changes_checks_if_match_against_database(
+    api_patch: APICaller,
+    api_test_client: AsyncClient,
+    if_match_version: int,
+    expected_status_code: HTTPStatus,
+) -> None:
+    authed_api_patch = await authed_request(api_patch)
+    session = authed_api_patch.session
+    # The session's cached user is still at version 1.
+    await User.objects.filter(id=session.user.id).aupdate(version=2)
+
+    response = await api_test_client.patch(
+        f"/v1/user/{session.user.id}",
+        data={},
+        content_type="application/json",
+        headers={
+            "Authorization": f"Bearer {session.token}",
+            "If-Match": f'"{session.user.id}.{if_match_version}"',
+        },
+    )
+
+    assert response.status_code == expected_status_code
+    if expected_status_code == HTTPStatus.OK:
+        assert response["ETag"] == f'"{session.user.id}.2"'
+    db_user = await User.objects.aget(id=session.user.id)
+    assert db_user.version == 2
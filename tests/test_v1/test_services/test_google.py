@@ -0,0 +1,166 @@
+import httpx
+import json
+import pytest
+from typing import Callable
+from typing import Iterator
+from unittest.mock import patch
+from urllib.parse import parse_qs
+from django.test import override_settings
+from opentelemetry.sdk.trace import ReadableSpan
+from dda.v1.services.authn.google import ExternalGoogleService
+from dda.v1.services.http_client import http_client
+from tests.stub_server import StubRequest
+from tests.stub_server import StubResponse
+from tests.stub_server import StubServer
+
+
+_TOKEN_PATH = "/token"
+
+
+@pytest.fixture
+def stub_google_oauth(stub_server: StubServer) -> Iterator[StubServer]:
+    with override_settings(GOOGLE_TOKEN_EXCHANGE_URL=stub_server.url(_TOKEN_PATH)):
+        yield stub_server
+
+
+def _token_response(request: StubRequest) -> StubResponse:
+    return StubResponse(body=json.dumps({"id_token": "stub-id-token"}).encode())
+
+
+async def _exchange() -> str:
+    return await ExternalGoogleService.exchange_auth_token_for_id_token(
+        authorization_code="code", code_verifier="verifier", redirect_uri="uri"
+    )
+
+
+@pytest.mark.asyncio
+async def test_exchange_auth_token_returns_id_token(
+    stub_google_oauth: StubServer,
+) -> None:
+    stub_google_oauth.routes[_TOKEN_PATH] = _token_response
+    assert await _exchange() == "stub-id-token"
+
+    form = parse_qs(stub_google_oauth.requests[0].body.decode())
+    assert form["code"] == ["code"]
+    assert form["code_verifier"] == ["verifier"]
+    assert form["grant_type"] == ["authorization_code"]
+
+
+@pytest.mark.asyncio
+async def test_exchange_auth_token_reuses_pooled_connection(
+    stub_google_oauth: StubServer,
+) -> None:
+    stub_google_oauth.routes[_TOKEN_PATH] = _token_response
+    for _ in range(3):
+        await _exchange()
+
+    assert len(stub_google_oauth.requests) == 3
+    assert len({request.client_port for request in stub_google_oauth.requests}) == 1
+
+
+@pytest.mark.asyncio
+async def test_exchange_auth_token_raises_on_client_error(
+    stub_google_oauth: StubServer,
+) -> None:
+    stub_google_oauth.routes[_TOKEN_PATH] = lambda _: StubResponse(status=400)
+    with pytest.raises(ExternalGoogleService.TokenExchangeException):
+        await _exchange()
+    # Client errors are not retried.
+    assert len(stub_google_oauth.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_exchange_auth_token_does_not_retry_server_errors(
+    stub_google_oauth: StubServer,
+) -> None:
+    stub_google_oauth.routes[_TOKEN_PATH] = lambda _: StubResponse(status=503)
+    with patch.object(http_client, "backoff_seconds", 0):
+        with pytest.raises(ExternalGoogleService.TokenExchangeException):
+            await _exchange()
+    # Google may have already used up the authorization code.
+    assert len(stub_google_oauth.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_exchange_auth_token_does_not_retry_read_timeouts() -> None:
+    with patch.object(
+        http_client.get_client(),
+        "request",
+        side_effect=httpx.ReadTimeout("timed out"),
+    ) as mock_request:
+        with pytest.raises(ExternalGoogleService.TokenExchangeException):
+            await _exchange()
+    mock_request.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_exchange_auth_token_retries_unsent_requests() -> None:
+    token_response = httpx.Response(200, json={"id_token": "stub-id-token"})
+    with (
+        patch.object(http_client, "backoff_seconds", 0),
+        patch.object(
+            http_client.get_client(),
+            "request",
+            side_effect=[httpx.ConnectError("refused"), token_response],
+        ) as mock_request,
+    ):
+        assert await _exchange() == "stub-id-token"
+    assert mock_request.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_exchange_auth_token_raises_when_every_attempt_fails() -> None:
+    with (
+        patch.object(http_client, "backoff_seconds", 0),
+        patch.object(
+            http_client.get_client(),
+            "request",
+            side_effect=httpx.ConnectError("refused"),
+        ) as mock_request,
+    ):
+        with pytest.raises(ExternalGoogleService.TokenExchangeException):
+            await _exchange()
+    assert mock_request.await_count == http_client.max_retries + 1
+
+
+@pytest.mark.asyncio
+async def test_pooled_client_retries_server_errors_for_idempotent_requests(
+    stub_google_oauth: StubServer,
+) -> None:
+    responses = iter([StubResponse(status=503)])
+    stub_google_oauth.routes[_TOKEN_PATH] = lambda request: next(
+        responses, _token_response(request)
+    )
+    with patch.object(http_client, "backoff_seconds", 0):
+        response = await http_client.request("GET", stub_google_oauth.url(_TOKEN_PATH))
+    assert response.status_code == 200
+    assert len(stub_google_oauth.requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_pooled_client_is_recreated_after_close(
+    stub_google_oauth: StubServer,
+) -> None:
+    stub_google_oauth.routes[_TOKEN_PATH] = _token_response
+    first_client = http_client.get_client()
+    await http_client.aclose()
+    assert first_client.is_closed
+    assert await _exchange() == "stub-id-token"
+    assert http_client.get_client() is not first_client
+
+
+@pytest.mark.asyncio
+async def test_exchange_auth_token_records_spans_for_the_call_and_request(
+    stub_google_oauth: StubServer,
+    finished_spans: Callable[[], tuple[ReadableSpan, ...]],
+) -> None:
+    stub_google_oauth.routes[_TOKEN_PATH] = _token_response
+    await _exchange()
+
+    spans = {span.name: span for span in finished_spans()}
+    exchange_span = spans["ExternalGoogleService.exchange_auth_token_for_id_token"]
+    request_span = spans["HTTP POST"]
+    assert request_span.parent is not None
+    assert request_span.parent.span_id == exchange_span.context.span_id
+    assert request_span.attributes is not None
+    assert request_span.attributes["http.response.status_code"] == 200
@@ -0,0 +1,201 @@
+import asyncio
+import json
+import time
+import pytest
+import rsa
+from typing import Any
+from typing import Iterator
+from unittest.mock import patch
+from django.test import override_settings
+from google.auth import crypt
+from google.auth import jwt
+from dda.v1.services.authn.google import ExternalGoogleService
+from dda.v1.services.authn.google_certs import GoogleCertificateStore
+from dda.v1.services.authn.google_certs import google_certificate_store
+from tests.stub_server import StubRequest
+from tests.stub_server import StubResponse
+from tests.stub_server import StubServer
+
+
+_CERTS_PATH = "/certs"
+_CLIENT_ID = "test-client-id"
+
+
+class _SigningKey:
+    def __init__(self, key_id: str):
+        public_key, private_key = rsa.newkeys(1024)
+        self.key_id = key_id
+        self.public_pem = public_key.save_pkcs1().decode()
+        self._signer = crypt.RSASigner.from_string(  # type: ignore[no-untyped-call]
+            private_key.save_pkcs1().decode(), key_id=key_id
+        )
+
+    def sign(self, **overrides: Any) -> str:
+        now = int(time.time())
+        payload = {
+            "iss": "https://accounts.google.com",
+            "aud": _CLIENT_ID,
+            "iat": now,
+            "exp": now + 300,
+            "email": "certs_test@email.com",
+            "email_verified": True,
+            "family_name": "Test",
+            "given_name": "Certs",
+        }
+        payload.update(overrides)
+        token: bytes = jwt.encode(self._signer, payload)  # type: ignore[no-untyped-call]
+        return token.decode()
+
+
+@pytest.fixture(scope="module")
+def signing_keys() -> list[_SigningKey]:
+    return [_SigningKey("first-key"), _SigningKey("second-key")]
+
+
+def _serve_certs(
+    stub_server: StubServer, keys: list[_SigningKey], max_age: int | None = 3600
+) -> None:
+    headers = {"Cache-Control": f"public, max-age={max_age}"} if max_age else {}
+
+    def _certs_response(request: StubRequest) -> StubResponse:
+        body = json.dumps({key.key_id: key.public_pem for key in keys})
+        return StubResponse(body=body.encode(), headers=headers)
+
+    stub_server.routes[_CERTS_PATH] = _certs_response
+
+
+def _build_store(stub_server: StubServer) -> GoogleCertificateStore:
+    return GoogleCertificateStore(
+        certs_url=stub_server.url(_CERTS_PATH),
+        refresh_margin_seconds=60,
+        min_refresh_interval_seconds=0,
+        default_max_age_seconds=120,
+    )
+
+
+@pytest.fixture
+def stub_google_certs(stub_server: StubServer) -> Iterator[StubServer]:
+    google_certificate_store.clear()
+    with (
+        patch.object(
+            google_certificate_store, "certs_url", stub_server.url(_CERTS_PATH)
+        ),
+        override_settings(GOOGLE_CLIENT_ID=_CLIENT_ID),
+    ):
+        yield stub_server
+    google_certificate_store.clear()
+
+
+@pytest.mark.asyncio
+async def test_get_user_profile_verifies_against_cached_certs(
+    stub_google_certs: StubServer, signing_keys: list[_SigningKey]
+) -> None:
+    _serve_certs(stub_google_certs, signing_keys)
+    for _ in range(3):
+        profile = await ExternalGoogleService.get_user_profile(signing_keys[0].sign())
+        assert profile.email == "certs_test@email.com"
+    assert len(stub_google_certs.requests) == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        {"iss": "https://evil.example.com"},
+        {"aud": "another-client-id"},
+        {"exp": int(time.time()) - 600},
+    ],
+)
+async def test_get_user_profile_rejects_invalid_claims(
+    stub_google_certs: StubServer,
+    signing_keys: list[_SigningKey],
+    overrides: dict[str, Any],
+) -> None:
+    _serve_certs(stub_google_certs, signing_keys)
+    with pytest.raises(ExternalGoogleService.TokenValidationException):
+        await ExternalGoogleService.get_user_profile(signing_keys[0].sign(**overrides))
+
+
+@pytest.mark.asyncio
+async def test_get_user_profile_rejects_unknown_signing_key(
+    stub_google_certs: StubServer, signing_keys: list[_SigningKey]
+) -> None:
+    _serve_certs(stub_google_certs, signing_keys[:1])
+    with pytest.raises(ExternalGoogleService.TokenValidationException):
+        await ExternalGoogleService.get_user_profile(signing_keys[1].sign())
+
+
+@pytest.mark.asyncio
+async def test_store_honors_max_age(
+    stub_server: StubServer, signing_keys: list[_SigningKey]
+) -> None:
+    _serve_certs(stub_server, signing_keys, max_age=1000)
+    store = _build_store(stub_server)
+    await store.get_certs("first-key")
+    await store.get_certs("first-key")
+
+    assert store.is_fresh
+    assert len(stub_server.requests) == 1
+    assert store._expires_at - time.monotonic() == pytest.approx(1000, abs=5)
+
+
+@pytest.mark.asyncio
+async def test_store_falls_back_to_default_max_age(
+    stub_server: StubServer, signing_keys: list[_SigningKey]
+) -> None:
+    _serve_certs(stub_server, signing_keys, max_age=None)
+    store = _build_store(stub_server)
+    await store.get_certs("first-key")
+    assert store._expires_at - time.monotonic() == pytest.approx(120, abs=5)
+
+
+@pytest.mark.asyncio
+async def test_store_refreshes_on_unknown_key_id(
+    stub_server: StubServer, signing_keys: list[_SigningKey]
+) -> None:
+    served_keys = signing_keys[:1]
+    _serve_certs(stub_server, served_keys)
+    store = _build_store(stub_server)
+    assert "second-key" not in await store.get_certs("first-key")
+
+    served_keys.append(signing_keys[1])  # Google rotates in a new key.
+    assert "second-key" in await store.get_certs("second-key")
+    assert len(stub_server.requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_store_rate_limits_refreshes_on_unknown_key_id(
+    stub_server: StubServer, signing_keys: list[_SigningKey]
+) -> None:
+    _serve_certs(stub_server, signing_keys)
+    store = _build_store(stub_server)
+    store.min_refresh_interval_seconds = 60
+    for _ in range(3):
+        await store.get_certs("unknown-key")
+    assert len(stub_server.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_store_shares_concurrent_fetches(
+    stub_server: StubServer, signing_keys: list[_SigningKey]
+) -> None:
+    _serve_certs(stub_server, signing_keys)
+    store = _build_store(stub_server)
+    await asyncio.gather(*(store.get_certs("first-key") for _ in range(5)))
+    assert len(stub_server.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_store_refreshes_in_background_near_expiry(
+    stub_server: StubServer, signing_keys: list[_SigningKey]
+) -> None:
+    # A max-age inside the refresh margin means every read is near expiry.
+    _serve_certs(stub_server, signing_keys, max_age=30)
+    store = _build_store(stub_server)
+    await store.get_certs("first-key")
+
+    certs = await store.get_certs("first-key")
+    assert "first-key" in certs  # Served from cache without waiting.
+    assert store._refresh_task is not None
+    await store._refresh_task
+    assert len(stub_server.requests) == 2
@@ -0,0 +1,24 @@
+import uuid
+from dda.v1.models.user import SessionToken
+from dda.v1.models.user import User
+from dda.v1.services.identity_map import IdentityMap
+
+
+def test_identity_map_returns_added_instances_by_model_and_key() -> None:
+    identity_map = IdentityMap()
+    user = User(id=uuid.uuid4())
+    identity_map.add(user)
+
+    assert identity_map.get(User, user.id) is user
+    assert identity_map.get(User, uuid.uuid4()) is None
+    assert identity_map.get(SessionToken, user.id) is None
+
+
+def test_identity_map_discards_instances() -> None:
+    identity_map = IdentityMap()
+    user = User(id=uuid.uuid4())
+    identity_map.add(user)
+    identity_map.discard(User, user.id)
+
+    assert identity_map.get(User, user.id) is None
+    assert len(identity_map) == 0
@@ -0,0 +1,59 @@
+import pytest
+from unittest.mock import patch
+from django.core.cache import caches
+from dda.v1.exceptions import RateLimitedError
+from dda.v1.services.rate_limit import CacheRateLimitBackend
+from dda.v1.services.rate_limit import InMemoryRateLimitBackend
+from dda.v1.services.rate_limit import RateLimit
+from dda.v1.services.rate_limit import RateLimitBackend
+from dda.v1.services.rate_limit import RateLimiter
+
+
+TEST_LIMIT = RateLimit.parse("2/minute")
+
+
+def test_rate_limit_is_parsed() -> None:
+    assert TEST_LIMIT == RateLimit(capacity=2, refill_per_second=2 / 60)
+    with pytest.raises(ValueError):
+        RateLimit.parse("2/fortnight")
+
+
+def test_bucket_refills_over_time() -> None:
+    tokens, retry_after_seconds = TEST_LIMIT.take(0, updated_at=0, now=15)
+    assert retry_after_seconds == pytest.approx(15)
+
+    tokens, retry_after_seconds = TEST_LIMIT.take(tokens, updated_at=15, now=30)
+    assert retry_after_seconds == 0
+    assert tokens == pytest.approx(0)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "backend",
+    [InMemoryRateLimitBackend(max_keys=10), CacheRateLimitBackend("default")],
+)
+async def test_client_is_limited_once_burst_is_used(backend: RateLimitBackend) -> None:
+    caches["default"].clear()
+    rate_limiter = RateLimiter(backend, {"login": TEST_LIMIT})
+
+    await rate_limiter.check("login", "ip:1.1.1.1")
+    await rate_limiter.check("login", "ip:1.1.1.1")
+    with pytest.raises(RateLimitedError) as exc_info:
+        await rate_limiter.check("login", "ip:1.1.1.1")
+    # Other clients have their own bucket.
+    await rate_limiter.check("login", "ip:2.2.2.2")
+
+    assert exc_info.value.retry_after_seconds == pytest.approx(30, abs=1)
+
+
+@pytest.mark.asyncio
+async def test_in_memory_buckets_are_bounded() -> None:
+    backend = InMemoryRateLimitBackend(max_keys=1)
+    rate_limiter = RateLimiter(backend, {"login": TEST_LIMIT})
+
+    with patch("dda.v1.services.rate_limit.time.monotonic", return_value=0):
+        for _ in range(2):
+            await rate_limiter.check("login", "ip:1.1.1.1")
+        await rate_limiter.check("login", "ip:2.2.2.2")
+        # The first client's bucket was evicted, so it starts again full.
+        await rate_limiter.check("login", "ip:1.1.1.1")
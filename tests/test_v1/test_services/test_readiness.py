@@ -0,0 +1,63 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+from unittest.mock import patch
+from dda.v1.services.readiness import ReadinessChecker
+
+
+@pytest.mark.asyncio
+async def test_readiness_is_cached_between_checks() -> None:
+    checker = ReadinessChecker(cache_seconds=60)
+    with (
+        patch("dda.v1.services.readiness._check_database", return_value=True) as db,
+        patch(
+            "dda.v1.services.readiness._check_google_certificates", return_value=True
+        ),
+    ):
+        first_report = await checker.check()
+        second_report = await checker.check()
+
+    assert first_report.is_ready
+    assert second_report is first_report
+    db.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_readiness_checks_share_one_run() -> None:
+    checker = ReadinessChecker(cache_seconds=0)
+    with (
+        patch("dda.v1.services.readiness._check_database", return_value=True) as db,
+        patch(
+            "dda.v1.services.readiness._check_google_certificates", return_value=True
+        ),
+    ):
+        await asyncio.gather(*(checker.check() for _ in range(5)))
+
+    db.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_readiness_fails_if_google_certificates_cannot_be_loaded() -> None:
+    checker = ReadinessChecker(cache_seconds=0)
+    with (
+        patch("dda.v1.services.readiness._check_database", return_value=True),
+        patch(
+            "dda.v1.services.readiness.google_certificate_store",
+            is_fresh=False,
+            refresh=AsyncMock(side_effect=RuntimeError("unreachable")),
+        ),
+    ):
+        report = await checker.check()
+
+    assert not report.is_ready
+    assert report.checks == {"database": True, "googleCertificates": False}
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_readiness_reaches_the_database() -> None:
+    checker = ReadinessChecker(cache_seconds=0)
+    with patch("dda.v1.services.readiness.google_certificate_store", is_fresh=True):
+        report = await checker.check()
+
+    assert report.checks == {"database": True, "googleCertificates": True}
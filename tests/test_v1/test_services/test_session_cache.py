@@ -0,0 +1,140 @@
+import time
+import uuid
+import pytest
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from http import HTTPStatus
+from dda.v1.models.user import SessionToken
+from dda.v1.models.user import User
+from dda.v1.models.user import UserSource
+from dda.v1.services.session_cache import SessionCache
+from dda.v1.services.session_cache import session_cache
+from tests.types import APICaller
+from tests.wrapper import authed_request
+
+
+def _build_session(expires_in: timedelta = timedelta(minutes=15)) -> SessionToken:
+    user = User(
+        email=f"cache_test_{uuid.uuid4()}@email.com",
+        family_name="Test",
+        given_name="Cache",
+        source=UserSource.GOOGLE,
+    )
+    return SessionToken(
+        token=f"tk-{uuid.uuid4().hex}",
+        expires_at=datetime.now(tz=timezone.utc) + expires_in,
+        user=user,
+    )
+
+
+def test_session_cache_returns_copy_of_cached_user() -> None:
+    cache = SessionCache(max_size=10, ttl_seconds=60)
+    session = _build_session()
+    cache.put(session)
+
+    cached_session = cache.get(session.token)
+    assert cached_session is not None
+    assert cached_session.user.id == session.user.id
+    assert cached_session.expires_at == session.expires_at
+
+    cached_session.user.given_name = "Mutated"
+    assert cache.get(session.token).user.given_name == "Cache"  # type: ignore[union-attr]
+
+
+def test_session_cache_counts_hits_and_misses() -> None:
+    cache = SessionCache(max_size=10, ttl_seconds=60)
+    session = _build_session()
+    assert cache.get(session.token) is None
+    cache.put(session)
+    assert cache.get(session.token) is not None
+
+    stats = cache.stats()
+    assert stats.hits == 1
+    assert stats.misses == 1
+    assert stats.size == 1
+    assert stats.hit_rate == 0.5
+
+
+def test_session_cache_evicts_least_recently_used() -> None:
+    cache = SessionCache(max_size=2, ttl_seconds=60)
+    first, second, third = _build_session(), _build_session(), _build_session()
+    cache.put(first)
+    cache.put(second)
+    cache.get(first.token)
+    cache.put(third)
+
+    assert cache.get(second.token) is None
+    assert cache.get(first.token) is not None
+    assert cache.get(third.token) is not None
+    assert cache.stats().evictions == 1
+
+
+def test_session_cache_does_not_return_expired_sessions() -> None:
+    cache = SessionCache(max_size=10, ttl_seconds=60)
+    session = _build_session(expires_in=timedelta(seconds=-1))
+    cache.put(session)
+    assert cache.get(session.token) is None
+    assert cache.stats().size == 0
+
+
+def test_session_cache_invalidates_by_user() -> None:
+    cache = SessionCache(max_size=10, ttl_seconds=60)
+    session = _build_session()
+    cache.put(session)
+    cache.invalidate_user(session.user.id)
+    assert cache.get(session.token) is None
+
+
+def test_session_cache_remembers_invalidated_users_for_replica_lag() -> None:
+    cache = SessionCache(max_size=10, ttl_seconds=60, replica_lag_seconds=0.05)
+    session = _build_session()
+    cache.invalidate_user(session.user.id)
+
+    assert cache.is_recently_invalidated(session.user.id)
+    assert not cache.is_recently_invalidated(uuid.uuid4())
+    time.sleep(0.06)
+    assert not cache.is_recently_invalidated(session.user.id)
+
+
+def test_session_cache_does_not_remember_invalidations_without_replica_lag() -> None:
+    cache = SessionCache(max_size=10, ttl_seconds=60)
+    session = _build_session()
+    cache.invalidate_user(session.user.id)
+
+    assert not cache.is_recently_invalidated(session.user.id)
+
+
+def test_session_cache_replaces_previous_token_for_user() -> None:
+    cache = SessionCache(max_size=10, ttl_seconds=60)
+    session = _build_session()
+    cache.put(session)
+    new_session = SessionToken(
+        token=f"tk-{uuid.uuid4().hex}",
+        expires_at=session.expires_at,
+        user=session.user,
+    )
+    cache.put(new_session)
+    assert cache.get(session.token) is None
+    assert cache.get(new_session.token) is not None
+
+
+def test_session_cache_is_disabled_with_zero_size() -> None:
+    cache = SessionCache(max_size=0, ttl_seconds=60)
+    session = _build_session()
+    cache.put(session)
+    assert cache.get(session.token) is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_authenticated_requests_are_served_from_session_cache(
+    api_get: APICaller,
+) -> None:
+    authed_api_get = await authed_request(api_get)
+    await authed_api_get.caller("/v1/glb/auth/me", expected_status_code=HTTPStatus.OK)
+    await authed_api_get.caller("/v1/glb/auth/me", expected_status_code=HTTPStatus.OK)
+
+    stats = session_cache.stats()
+    assert stats.misses == 1
+    assert stats.hits == 1
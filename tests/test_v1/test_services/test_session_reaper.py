@@ -0,0 +1,114 @@
+import asyncio
+import uuid
+import pytest
+from datetime import timedelta
+from io import StringIO
+from http import HTTPStatus
+from unittest.mock import AsyncMock
+from unittest.mock import patch
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from dda.v1.models.user import SessionToken
+from dda.v1.models.user import User
+from dda.v1.models.user import UserSource
+from dda.v1.services.session_reaper import SessionReaper
+from dda.v1.services.user import UserService
+from tests.types import APICaller
+
+
+def _create_session(expires_in: timedelta) -> SessionToken:
+    user = User.objects.create(
+        email=f"reaper_test_{uuid.uuid4()}@email.com",
+        family_name="Test",
+        given_name="Reaper",
+        source=UserSource.GOOGLE,
+    )
+    session = SessionToken.objects.create(user=user)
+    session.expires_at = session.expires_at + expires_in
+    session.save()
+    return session
+
+
+async def _create_expired_session() -> SessionToken:
+    user = await User.objects.acreate(
+        email=f"reaper_test_{uuid.uuid4()}@email.com",
+        family_name="Test",
+        given_name="Reaper",
+        source=UserSource.GOOGLE,
+    )
+    session = await SessionToken.objects.acreate(user=user)
+    session.expires_at = session.expires_at - timedelta(minutes=30)
+    await session.asave()
+    return session
+
+
+@pytest.mark.django_db
+def test_reap_expired_sessions_command_deletes_only_expired_sessions() -> None:
+    expired_sessions = [_create_session(timedelta(minutes=-30)) for _ in range(3)]
+    valid_session = _create_session(timedelta())
+
+    output = StringIO()
+    call_command("reap_expired_sessions", batch_size=2, stdout=output)
+
+    assert "expired sessions." in output.getvalue()
+    assert not SessionToken.objects.filter(
+        token__in=[session.token for session in expired_sessions]
+    ).exists()
+    assert SessionToken.objects.filter(token=valid_session.token).exists()
+
+
+@pytest.mark.parametrize("batch_size", ["0", "-1"])
+def test_reap_expired_sessions_command_refuses_batch_size_below_1(
+    batch_size: str,
+) -> None:
+    with pytest.raises(CommandError):
+        call_command("reap_expired_sessions", "--batch-size", batch_size)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("batch_size", [0, -1])
+async def test_delete_expired_sessions_refuses_batch_size_below_1(
+    batch_size: int,
+) -> None:
+    with pytest.raises(ValueError):
+        await UserService.delete_expired_sessions(batch_size)
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_expired_session_is_rejected_without_being_deleted(
+    api_get: APICaller,
+) -> None:
+    session = await _create_expired_session()
+    await api_get(
+        "/v1/glb/auth/me",
+        headers={"Authorization": f"Bearer {session.token}"},
+        expected_status_code=HTTPStatus.UNAUTHORIZED,
+    )
+    assert await SessionToken.objects.filter(token=session.token).aexists()
+
+
+@pytest.mark.asyncio
+async def test_session_reaper_sweeps_periodically_until_stopped() -> None:
+    reaper = SessionReaper(interval_seconds=1, batch_size=10)
+    with (
+        patch.object(
+            UserService, "delete_expired_sessions", new=AsyncMock(return_value=0)
+        ) as mock_delete,
+        patch("dda.v1.services.session_reaper.close_old_connections"),
+    ):
+        reaper.ensure_started()
+        reaper.ensure_started()
+        await asyncio.sleep(0.01)
+        assert reaper.is_running
+        await reaper.stop()
+
+    assert not reaper.is_running
+    mock_delete.assert_awaited_once_with(10)
+
+
+@pytest.mark.asyncio
+async def test_session_reaper_does_not_start_when_disabled() -> None:
+    reaper = SessionReaper(interval_seconds=0, batch_size=10)
+    reaper.ensure_started()
+    assert not reaper.is_running
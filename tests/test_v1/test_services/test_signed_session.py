@@ -0,0 +1,125 @@
+import uuid
+import pytest
+from http import HTTPStatus
+from typing import Any
+from typing import Callable
+from django.core.cache import cache
+from django.test import override_settings
+from dda.env import SessionTokenMode
+from dda.v1.models.user import SessionToken
+from dda.v1.models.user import User
+from dda.v1.models.user import UserSource
+from dda.v1.services.signed_session import SignedSessionService
+from dda.v1.services.user import UserService
+from tests.types import APICaller
+
+
+async def _create_user() -> User:
+    return await User.objects.acreate(
+        email=f"signed_session_{uuid.uuid4()}@email.com",
+        family_name="Test",
+        given_name="Signed",
+        source=UserSource.GOOGLE,
+    )
+
+
+@pytest.fixture(autouse=True)
+def signed_session_mode() -> Any:
+    cache.clear()
+    with override_settings(SESSION_TOKEN_MODE=SessionTokenMode.SIGNED):
+        yield
+
+
+@pytest.mark.asyncio
+async def test_signed_session_verifies_issued_token() -> None:
+    user = User(id=uuid.uuid4())
+    session = await SignedSessionService.issue(user)
+    claims = await SignedSessionService.verify(session.token)
+
+    assert claims is not None
+    assert claims.user_id == user.id
+    assert claims.expires_at == session.expires_at.replace(microsecond=0)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "tamper",
+    [
+        lambda token: token + "a",
+        lambda token: token.replace("st-", "tk-"),
+        lambda token: "st-" + token.split(".")[0] + ".bad-signature",
+    ],
+)
+async def test_signed_session_rejects_tampered_token(
+    tamper: Callable[[str], str],
+) -> None:
+    session = await SignedSessionService.issue(User(id=uuid.uuid4()))
+    assert await SignedSessionService.verify(tamper(session.token)) is None
+
+
+@pytest.mark.asyncio
+async def test_signed_session_rejects_expired_token() -> None:
+    with override_settings(SESSION_LENGTH_MINUTES=-1):
+        session = await SignedSessionService.issue(User(id=uuid.uuid4()))
+    assert await SignedSessionService.verify(session.token) is None
+
+
+@pytest.mark.asyncio
+async def test_signed_session_rejects_revoked_token() -> None:
+    user = User(id=uuid.uuid4())
+    session = await SignedSessionService.issue(user)
+    await SignedSessionService.revoke(user.id)
+    assert await SignedSessionService.verify(session.token) is None
+
+
+@pytest.mark.asyncio
+async def test_signed_session_issue_revokes_previous_tokens() -> None:
+    user = User(id=uuid.uuid4())
+    first_session = await SignedSessionService.issue(user)
+    second_session = await SignedSessionService.issue(user)
+    assert await SignedSessionService.verify(first_session.token) is None
+    assert await SignedSessionService.verify(second_session.token) is not None
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_signed_session_is_not_persisted() -> None:
+    user = await _create_user()
+    session = await UserService.refresh_session_token(user)
+    assert session.token.startswith("st-")
+    assert await SessionToken.objects.filter(user=user).aexists() is False
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_signed_session_authenticates_without_session_query(
+    api_get: APICaller,
+    api_delete: APICaller,
+    assert_num_queries: Callable[[int], Any],
+) -> None:
+    user = await _create_user()
+    session = await UserService.refresh_session_token(user)
+    headers = {"Authorization": f"Bearer {session.token}"}
+
+    # Only the user is loaded on the first request, and not at all after.
+    async with assert_num_queries(1):
+        response = await api_get("/v1/glb/auth/me", headers=headers)
+    assert response.response["id"] == str(user.id)
+    async with assert_num_queries(0):
+        await api_get("/v1/glb/auth/me", headers=headers)
+
+    await api_delete(
+        "/v1/glb/auth/logout", headers=headers, expected_status_code=HTTPStatus.ACCEPTED
+    )
+    await api_get(
+        "/v1/glb/auth/me", headers=headers, expected_status_code=HTTPStatus.UNAUTHORIZED
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.django_db
+async def test_signed_session_is_rejected_if_user_no_longer_exists() -> None:
+    user = await _create_user()
+    session = await UserService.refresh_session_token(user)
+    await user.adelete()
+    assert await UserService.get_current_session_user(session.token) is None
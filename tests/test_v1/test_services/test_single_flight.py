@@ -0,0 +1,80 @@
+import asyncio
+import pytest
+from dda.v1.services.single_flight import SingleFlight
+
+
+class _Lookup:
+    def __init__(self, result: list[str] | Exception):
+        self.result = result
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self) -> list[str]:
+        self.calls += 1
+        await self.release.wait()
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+def _single_flight() -> SingleFlight[str, list[str]]:
+    return SingleFlight(copy_result=list)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_call() -> None:
+    single_flight = _single_flight()
+    lookup = _Lookup(["result"])
+
+    callers = [asyncio.create_task(single_flight.do("key", lookup)) for _ in range(3)]
+    await asyncio.sleep(0)
+    lookup.release.set()
+    results = await asyncio.gather(*callers)
+
+    assert lookup.calls == 1
+    assert results == [["result"]] * 3
+    # Each caller has its own copy.
+    assert results[0] is not results[1]
+
+
+@pytest.mark.asyncio
+async def test_call_runs_again_once_complete() -> None:
+    single_flight = _single_flight()
+    lookup = _Lookup(["result"])
+    lookup.release.set()
+
+    await single_flight.do("key", lookup)
+    await single_flight.do("key", lookup)
+
+    assert lookup.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_error_is_raised_to_every_caller() -> None:
+    single_flight = _single_flight()
+    lookup = _Lookup(RuntimeError("lookup failed"))
+
+    callers = [asyncio.create_task(single_flight.do("key", lookup)) for _ in range(2)]
+    await asyncio.sleep(0)
+    lookup.release.set()
+    results = await asyncio.gather(*callers, return_exceptions=True)
+
+    assert lookup.calls == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_call_for_others() -> None:
+    single_flight = _single_flight()
+    lookup = _Lookup(["result"])
+
+    cancelled_caller = asyncio.create_task(single_flight.do("key", lookup))
+    other_caller = asyncio.create_task(single_flight.do("key", lookup))
+    await asyncio.sleep(0)
+    cancelled_caller.cancel()
+    await asyncio.sleep(0)
+    lookup.release.set()
+
+    assert await other_caller == ["result"]
+    assert cancelled_caller.cancelled()
+    assert lookup.calls == 1